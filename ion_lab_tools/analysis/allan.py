@@ -1,6 +1,7 @@
 """Allan deviation utilities for frequency noise analysis."""
 
-from typing import Iterable, Tuple
+from dataclasses import dataclass
+from typing import Iterable, Tuple, Union
 
 import numpy as np
 
@@ -54,3 +55,190 @@ def allan_deviation(y: np.ndarray, sample_period: float, cluster_sizes: Iterable
         raise ValueError("Failed to compute Allan deviation for the given data/cluster sizes")
 
     return np.asarray(taus), np.asarray(adevs)
+
+
+class AllanAccumulator:
+    """
+    Incremental non-overlapping Allan deviation over octave cluster sizes.
+
+    Samples are folded into a pyramid of cluster averages (m = 1, 2, 4, ...), so
+    memory stays O(log n) and each chunk costs O(len(chunk)). At any point
+    `result()` matches `allan_deviation(y_so_far, sample_period, 2**k)`.
+    """
+
+    def __init__(self, sample_period: float):
+        self.sample_period = float(sample_period)
+        self.n_samples = 0
+        self._offset = None
+        self._prev = []  # last completed cluster mean per level
+        self._pending = []  # unpaired cluster waiting to form the next level
+        self._sumsq = []
+        self._count = []
+
+    def update(self, chunk: np.ndarray) -> "AllanAccumulator":
+        """Fold a chunk of new samples into the running cluster state."""
+
+        values = np.asarray(chunk, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        if self._offset is None:
+            self._offset = float(values[0])
+        self.n_samples += values.size
+        values = values - self._offset
+
+        level = 0
+        while values.size:
+            if level == len(self._prev):
+                self._prev.append(None)
+                self._pending.append(None)
+                self._sumsq.append(0.0)
+                self._count.append(0)
+
+            prev = self._prev[level]
+            joined = values if prev is None else np.concatenate(([prev], values))
+            diffs = np.diff(joined)
+            self._sumsq[level] += float(np.dot(diffs, diffs))
+            self._count[level] += diffs.size
+            self._prev[level] = float(values[-1])
+
+            pending = self._pending[level]
+            if pending is not None:
+                values = np.concatenate(([pending], values))
+            pairs = values.size // 2
+            self._pending[level] = float(values[-1]) if values.size % 2 else None
+            values = 0.5 * (values[0:2 * pairs:2] + values[1:2 * pairs:2])
+            level += 1
+        return self
+
+    def counts(self) -> np.ndarray:
+        """Number of cluster differences accumulated per octave."""
+
+        return np.asarray(self._count, dtype=int)
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the current (taus, adevs) curve for octaves with at least one difference."""
+
+        counts = self.counts()
+        levels = np.flatnonzero(counts > 0)
+        if levels.size == 0:
+            raise ValueError("Need at least 2 samples to compute Allan deviation")
+        sumsq = np.asarray(self._sumsq)[levels]
+        taus = (2.0**levels) * self.sample_period
+        return taus, np.sqrt(0.5 * sumsq / counts[levels])
+
+
+@dataclass
+class StabilityResult:
+    """Overlapping Allan, modified Allan and Hadamard deviations on a shared tau grid.
+
+    Deviation arrays have the input's leading shape plus one trailing tau axis;
+    taus where an estimator has no terms are NaN with a zero count.
+    """
+
+    taus: np.ndarray
+    cluster_sizes: np.ndarray
+    adev: np.ndarray
+    mdev: np.ndarray
+    hdev: np.ndarray
+    n_adev: np.ndarray
+    n_mdev: np.ndarray
+    n_hdev: np.ndarray
+
+
+def _cluster_grid(n: int, cluster_sizes: Union[str, Iterable[int]]) -> np.ndarray:
+    max_m = (n - 1) // 2
+    if isinstance(cluster_sizes, str):
+        if cluster_sizes == "octave":
+            grid = 2 ** np.arange(int(np.log2(max_m)) + 1) if max_m >= 1 else np.array([], dtype=int)
+        elif cluster_sizes == "all":
+            grid = np.arange(1, max_m + 1)
+        else:
+            raise ValueError("cluster_sizes must be 'octave', 'all' or an iterable of ints")
+    else:
+        grid = np.unique(np.asarray(list(cluster_sizes), dtype=int))
+        grid = grid[(grid >= 1) & (grid <= max_m)]
+    return grid.astype(int)
+
+
+def phase_sums(y: np.ndarray) -> np.ndarray:
+    """Cumulative sums of the mean-removed signal along the last axis, with a leading zero.
+
+    Every overlapping estimator below is a finite difference of these sums, so one
+    pass over the data serves all cluster sizes.
+    """
+
+    y = np.asarray(y, dtype=float)
+    centred = y - y.mean(axis=-1, keepdims=True)
+    sums = np.zeros(y.shape[:-1] + (y.shape[-1] + 1,))
+    np.cumsum(centred, axis=-1, out=sums[..., 1:])
+    return sums
+
+
+def _second_difference(sums: np.ndarray, m: int) -> np.ndarray:
+    # m * (mean of cluster i+m - mean of cluster i) for every overlapping start i
+    k = sums.shape[-1]
+    return sums[..., 2 * m:] - 2.0 * sums[..., m:k - m] + sums[..., :k - 2 * m]
+
+
+def stability_deviations(
+    y: np.ndarray, sample_period: float, cluster_sizes: Union[str, Iterable[int]] = "octave"
+) -> StabilityResult:
+    """
+    Compute overlapping ADEV, MDEV and HDEV from a single cumulative-sum pass.
+
+    Parameters
+    ----------
+    y : array-like
+        Evenly sampled signal; 2-D input is treated as one series per row.
+    sample_period : float
+        Sampling period in seconds.
+    cluster_sizes : {"octave", "all"} or iterable of int
+        Averaging factors: powers of two, every admissible m, or an explicit list.
+
+    Returns
+    -------
+    StabilityResult with deviations and the number of terms behind each tau.
+    """
+
+    y = np.asarray(y, dtype=float)
+    n = y.shape[-1]
+    if n < 5:
+        raise ValueError("Need at least 5 samples to compute Allan deviation")
+    grid = _cluster_grid(n, cluster_sizes)
+    if grid.size == 0:
+        raise ValueError("Failed to compute Allan deviation for the given data/cluster sizes")
+
+    sums = phase_sums(y)
+    shape = y.shape[:-1] + (grid.size,)
+    adev = np.full(shape, np.nan)
+    mdev = np.full(shape, np.nan)
+    hdev = np.full(shape, np.nan)
+    counts = np.zeros((3, grid.size), dtype=int)
+    k = sums.shape[-1]
+    for idx, m in enumerate(grid):
+        d = _second_difference(sums, m)
+        adev[..., idx] = np.sqrt(0.5 * np.mean(d**2, axis=-1)) / m
+        counts[0, idx] = d.shape[-1]
+
+        if d.shape[-1] >= m:
+            inner = np.zeros(d.shape[:-1] + (d.shape[-1] + 1,))
+            np.cumsum(d, axis=-1, out=inner[..., 1:])
+            inner = inner[..., m:] - inner[..., :-m]
+            mdev[..., idx] = np.sqrt(0.5 * np.mean(inner**2, axis=-1)) / m**2
+            counts[1, idx] = inner.shape[-1]
+
+        if k > 3 * m:
+            t = sums[..., 3 * m:] - 3.0 * sums[..., 2 * m:k - m] + 3.0 * sums[..., m:k - 2 * m] - sums[..., :k - 3 * m]
+            hdev[..., idx] = np.sqrt(np.mean(t**2, axis=-1) / 6.0) / m
+            counts[2, idx] = t.shape[-1]
+
+    return StabilityResult(
+        taus=grid * sample_period,
+        cluster_sizes=grid,
+        adev=adev,
+        mdev=mdev,
+        hdev=hdev,
+        n_adev=counts[0],
+        n_mdev=counts[1],
+        n_hdev=counts[2],
+    )
@@ -1,7 +1,7 @@
 """Bayesian optimisation vs baselines diagnostics."""
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Iterable, Optional
 
 import numpy as np
 import pandas as pd
@@ -74,3 +74,149 @@ def compare_methods(df: pd.DataFrame, target: float = None) -> BOComparison:
 
     terminal_gain = bo_terminal - float(baseline.groupby("method")["best"].apply(lambda s: s.iloc[-1]).mean())
     return BOComparison(step_reduction=step_reduction, terminal_gain=terminal_gain)
+
+
+@dataclass
+class BOTargetSweep:
+    """Steps-to-target curves over a grid of targets plus bootstrap distributions.
+
+    Step counts are means over runs (inf if any run never reaches the target);
+    as in `compare_methods`, an unreachable target counts as zero step reduction.
+    """
+
+    targets: np.ndarray
+    bo_steps: np.ndarray
+    baseline_steps: np.ndarray
+    step_reduction: np.ndarray
+    reference_target: float
+    terminal_gain: float
+    step_reduction_samples: np.ndarray
+    terminal_gain_samples: np.ndarray
+    confidence: float = 0.95
+
+    def as_dict(self) -> Dict[str, float]:
+        alpha = 0.5 * (1.0 - self.confidence)
+        red_lo, red_hi = np.quantile(self.step_reduction_samples, [alpha, 1.0 - alpha])
+        gain_lo, gain_hi = np.quantile(self.terminal_gain_samples, [alpha, 1.0 - alpha])
+        ref = int(np.argmin(np.abs(self.targets - self.reference_target)))
+        return {
+            "bo_step_reduction_pct": float(self.step_reduction[ref]),
+            "bo_terminal_gain": float(self.terminal_gain),
+            "bo_step_reduction_ci_low": float(red_lo),
+            "bo_step_reduction_ci_high": float(red_hi),
+            "bo_terminal_gain_ci_low": float(gain_lo),
+            "bo_terminal_gain_ci_high": float(gain_hi),
+        }
+
+
+def _reduction(baseline_steps: np.ndarray, bo_steps: np.ndarray) -> np.ndarray:
+    ok = np.isfinite(baseline_steps) & np.isfinite(bo_steps) & (baseline_steps != 0)
+    base = np.where(ok, baseline_steps, 1.0)
+    return np.where(ok, (base - np.where(ok, bo_steps, 0.0)) / base * 100.0, 0.0)
+
+
+def compare_methods_sweep(
+    df: pd.DataFrame,
+    targets: Optional[Iterable[float]] = None,
+    run_col: Optional[str] = None,
+    reference_target: Optional[float] = None,
+    n_boot: int = 1000,
+    seed: int = 0,
+    confidence: float = 0.95,
+) -> BOTargetSweep:
+    """
+    Vectorised BO vs baseline comparison over many runs and a grid of targets.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Columns: method, step, score, plus an optional run identifier.
+    targets : iterable of float, optional
+        Target scores. Defaults to 80-100% of the mean BO terminal best.
+    run_col : str, optional
+        Column identifying independent runs; defaults to "run" or "seed" when present,
+        otherwise each method is a single run.
+    reference_target : float, optional
+        Target used for the headline step reduction and its bootstrap; defaults to
+        95% of the mean BO terminal best (as in `compare_methods`).
+    n_boot : int
+        Bootstrap resamples of runs (within each method).
+
+    Cumulative bests for every run come from a single `np.maximum.accumulate` over
+    runs laid end to end with per-run offsets, which keeps the whole array sorted so
+    that steps-to-target for every run and target is one `searchsorted`.
+    """
+
+    required = {"method", "step", "score"}
+    if not required <= set(df.columns):
+        raise ValueError("BO data must contain 'method', 'step', 'score'")
+    if run_col is None:
+        run_col = next((c for c in ("run", "seed") if c in df.columns), None)
+
+    method_codes, methods = pd.factorize(df["method"], sort=True)
+    run_codes = pd.factorize(df[run_col])[0] if run_col else np.zeros(len(df), dtype=np.int64)
+    steps = df["step"].to_numpy(dtype=float)
+    order = np.lexsort((steps, run_codes, method_codes))
+    seg_key = method_codes[order].astype(np.int64) * (run_codes.max() + 1) + run_codes[order]
+    starts = np.flatnonzero(np.r_[True, seg_key[1:] != seg_key[:-1]])
+    ends = np.r_[starts[1:], order.size]
+    seg = np.repeat(np.arange(starts.size), ends - starts)
+    run_method = method_codes[order][starts]
+
+    scores = df["score"].to_numpy(dtype=float)[order]
+    lo = scores.min()
+    span = scores.max() - lo + 1.0
+    offsets = np.arange(starts.size) * span
+    running = np.maximum.accumulate(scores - lo + offsets[seg])
+    terminal = running[ends - 1] - offsets + lo
+
+    bo_code = np.flatnonzero(methods == "bo")
+    is_bo = run_method == (bo_code[0] if bo_code.size else -1)
+    if not is_bo.any() or is_bo.all():
+        raise ValueError("Need at least one BO trajectory and one baseline")
+    bo_terminal = float(terminal[is_bo].mean())
+
+    if reference_target is None:
+        reference_target = 0.95 * bo_terminal
+    targets = bo_terminal * np.linspace(0.8, 1.0, 21) if targets is None else np.asarray(list(targets), dtype=float)
+    targets = np.unique(np.r_[targets, reference_target])
+
+    query = offsets[:, None] + np.clip(targets[None, :] - lo, 0.0, None)
+    hit = np.searchsorted(running, query, side="left")
+    step_sorted = steps[order]
+    run_steps = np.where(hit < ends[:, None], step_sorted[np.minimum(hit, order.size - 1)], np.inf)
+
+    # Runs are contiguous per method, so per-method sums are a reduceat over run rows.
+    method_starts = np.flatnonzero(np.r_[True, run_method[1:] != run_method[:-1]])
+    n_runs = np.diff(np.r_[method_starts, run_method.size])
+    method_steps = np.add.reduceat(run_steps, method_starts, axis=0) / n_runs[:, None]
+    method_terminal = np.add.reduceat(terminal, method_starts) / n_runs
+    bo_row = run_method[method_starts] == bo_code[0]
+    bo_steps = method_steps[bo_row][0]
+    baseline_steps = method_steps[~bo_row].mean(axis=0)
+    terminal_gain = float(method_terminal[bo_row][0] - method_terminal[~bo_row].mean())
+
+    # Bootstrap: resample runs with replacement inside each method.
+    rng = np.random.default_rng(seed)
+    ref_idx = int(np.searchsorted(targets, reference_target))
+    ref_steps = run_steps[:, ref_idx]
+    boot_steps = np.empty((method_starts.size, n_boot))
+    boot_terminal = np.empty((method_starts.size, n_boot))
+    for i, (start, count) in enumerate(zip(method_starts, n_runs)):
+        pick = start + rng.integers(0, count, size=(n_boot, count))
+        boot_steps[i] = ref_steps[pick].mean(axis=1)
+        boot_terminal[i] = terminal[pick].mean(axis=1)
+    reduction_samples = _reduction(boot_steps[~bo_row].mean(axis=0), boot_steps[bo_row][0])
+    gain_samples = boot_terminal[bo_row][0] - boot_terminal[~bo_row].mean(axis=0)
+
+    return BOTargetSweep(
+        targets=targets,
+        bo_steps=bo_steps,
+        baseline_steps=baseline_steps,
+        step_reduction=_reduction(baseline_steps, bo_steps),
+        reference_target=float(reference_target),
+        terminal_gain=terminal_gain,
+        step_reduction_samples=reduction_samples,
+        terminal_gain_samples=gain_samples,
+        confidence=confidence,
+    )
@@ -1,7 +1,9 @@
 """Simple forecasting utilities for drift/lead-time analysis."""
 
+import math
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -14,6 +16,11 @@ class ForecastResult:
     mae: float
     mape: float
     lead_time_seconds: float
+    order: int = 1
+
+    @property
+    def label(self) -> str:
+        return f"AR({self.order})"
 
     def as_dict(self) -> Dict[str, float]:
         return {
@@ -23,6 +30,82 @@ class ForecastResult:
         }
 
 
+def _ar1_horizon(c: float, phi: float, last: float, steps_ahead: int) -> np.ndarray:
+    """Closed-form k-step AR(1) predictions: mu + phi**k * (last - mu)."""
+
+    k = np.arange(1, steps_ahead + 1, dtype=float)
+    if abs(1.0 - phi) < 1e-12:
+        return last + k * c
+    mu = c / (1.0 - phi)
+    return mu + phi**k * (last - mu)
+
+
+def _first_true(pred: Callable[[int], bool], lo: int, hi: int, guess: float) -> Optional[int]:
+    """First integer in [lo, hi] where a monotone predicate holds, refined from `guess`."""
+
+    if lo > hi:
+        return None
+    if pred(lo):
+        return lo
+    if not pred(hi):
+        return None
+    k = int(min(max(math.ceil(guess), lo + 1), hi)) if np.isfinite(guess) else hi
+    while k > lo + 1 and pred(k - 1):
+        k -= 1
+    while not pred(k):
+        k += 1
+    return k
+
+
+def _geometric_crossing(level: float, offset: float, ratio: float, threshold: float, lo: int, hi: int) -> Optional[int]:
+    """First j in [lo, hi] with |level + offset * ratio**j| >= threshold, for ratio >= 0."""
+
+    hits = []
+    for bound, sign in ((threshold, 1.0), (-threshold, -1.0)):
+        def pred(j, bound=bound, sign=sign):
+            return sign * (level + offset * ratio**j) >= sign * bound
+
+        arg = (bound - level) / offset if offset else -1.0
+        guess = math.log(arg) / math.log(ratio) if arg > 0 and ratio > 0 and ratio != 1.0 else lo
+        hit = _first_true(pred, lo, hi, guess)
+        if hit is not None:
+            hits.append(hit)
+    return min(hits) if hits else None
+
+
+def _lead_steps(c: float, phi: float, last: float, threshold: float, steps_ahead: int) -> Optional[int]:
+    """Solve for the first forecast step whose magnitude reaches `threshold`.
+
+    The AR(1) path is geometric, so each sign/parity branch is monotone and the
+    crossing follows from a logarithm rather than a scan over the horizon.
+    """
+
+    if threshold <= 0 or steps_ahead < 1:
+        return None
+    if abs(1.0 - phi) < 1e-12:
+        hits = []
+        for bound, sign in ((threshold, 1.0), (-threshold, -1.0)):
+            guess = (bound - last) / c if c else np.inf
+            hit = _first_true(lambda k, b=bound, s=sign: s * (last + k * c) >= s * b, 1, steps_ahead, guess)
+            if hit is not None:
+                hits.append(hit)
+        return min(hits) if hits else None
+
+    mu = c / (1.0 - phi)
+    dev = last - mu
+    if phi >= 0:
+        return _geometric_crossing(mu, dev, phi, threshold, 1, steps_ahead)
+    # Negative phi alternates sign: even and odd steps are separate geometric paths in phi**2.
+    hits = []
+    even = _geometric_crossing(mu, dev, phi * phi, threshold, 1, steps_ahead // 2)
+    if even is not None:
+        hits.append(2 * even)
+    odd = _geometric_crossing(mu, dev * phi, phi * phi, threshold, 0, (steps_ahead - 1) // 2)
+    if odd is not None:
+        hits.append(2 * odd + 1)
+    return min(hits) if hits else None
+
+
 def ar1_forecast(series: pd.Series, sample_period: float, steps_ahead: int, alert_threshold: float) -> ForecastResult:
     """
     Fit a simple AR(1)+bias model and forecast forward.
@@ -51,13 +134,7 @@ def ar1_forecast(series: pd.Series, sample_period: float, steps_ahead: int, aler
     phi_vec, *_ = np.linalg.lstsq(A, y1, rcond=None)
     c, phi = phi_vec
 
-    history = y.copy()
-    forecast = []
-    current = history[-1]
-    for _ in range(steps_ahead):
-        current = c + phi * current
-        forecast.append(current)
-    forecast = np.asarray(forecast)
+    forecast = _ar1_horizon(c, phi, y[-1], steps_ahead)
 
     horizon_seconds = steps_ahead * sample_period
 
@@ -69,12 +146,8 @@ def ar1_forecast(series: pd.Series, sample_period: float, steps_ahead: int, aler
     mape = float(np.mean(np.abs((truth - preds) / np.maximum(np.abs(truth), 1e-6))) * 100.0)
 
     # Lead time estimation
-    lead_time_seconds = np.nan
-    if alert_threshold > 0:
-        for idx, val in enumerate(np.abs(forecast), start=1):
-            if val >= alert_threshold:
-                lead_time_seconds = idx * sample_period
-                break
+    lead_steps = _lead_steps(c, phi, y[-1], alert_threshold, steps_ahead)
+    lead_time_seconds = lead_steps * sample_period if lead_steps is not None else np.nan
 
     return ForecastResult(
         forecast=forecast,
@@ -83,3 +156,443 @@ def ar1_forecast(series: pd.Series, sample_period: float, steps_ahead: int, aler
         mape=mape,
         lead_time_seconds=float(lead_time_seconds) if not np.isnan(lead_time_seconds) else np.nan,
     )
+
+
+@dataclass
+class ARModel:
+    """AR(p) model around a mean: y[t] - mean = sum_i coeffs[i] * (y[t-1-i] - mean) + e[t]."""
+
+    coeffs: np.ndarray
+    mean: float
+    sigma2: float
+    criterion: Optional[str]
+    scores: np.ndarray
+
+    @property
+    def order(self) -> int:
+        return int(self.coeffs.size)
+
+
+def autocovariance(y: np.ndarray, max_lag: int) -> np.ndarray:
+    """Biased autocovariance for lags 0..max_lag from one zero-padded FFT."""
+
+    z = np.asarray(y, dtype=float)
+    z = z - z.mean()
+    n = z.size
+    nfft = 1 << int(np.ceil(np.log2(2 * n - 1))) if n > 1 else 1
+    spec = np.fft.rfft(z, nfft)
+    acov = np.fft.irfft(spec.real**2 + spec.imag**2, nfft)[: max_lag + 1]
+    return acov / n
+
+
+def _levinson_path(acov: np.ndarray, order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Levinson-Durbin recursion keeping every order: row k of the table holds AR(k)'s coefficients."""
+
+    table = np.zeros((order + 1, order))
+    sigma2 = np.empty(order + 1)
+    sigma2[0] = acov[0]
+    for k in range(1, order + 1):
+        if sigma2[k - 1] <= 0:
+            table[k:] = table[k - 1]
+            sigma2[k:] = sigma2[k - 1]
+            break
+        prev = table[k - 1, : k - 1]
+        kappa = (acov[k] - np.dot(prev, acov[k - 1:0:-1])) / sigma2[k - 1]
+        table[k, : k - 1] = prev - kappa * prev[::-1]
+        table[k, k - 1] = kappa
+        sigma2[k] = sigma2[k - 1] * (1.0 - kappa * kappa)
+    return table, sigma2
+
+
+def levinson_durbin(acov: np.ndarray, order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve the Yule-Walker equations for AR orders 1..order in O(order^2).
+
+    Returns
+    -------
+    coeffs : np.ndarray
+        AR coefficients of the final order.
+    sigma2 : np.ndarray
+        Innovation variance for every order 0..order.
+    """
+
+    table, sigma2 = _levinson_path(acov, order)
+    return table[order], sigma2
+
+
+def _order_scores(n, sigma2: np.ndarray, criterion: Optional[str]) -> np.ndarray:
+    """AIC/BIC for orders 0..p from innovation variances (last axis); NaN for ``criterion=None``."""
+
+    orders = np.arange(sigma2.shape[-1])
+    n = np.asarray(n, dtype=float)[..., None] if np.ndim(n) else float(n)
+    log_var = np.log(np.maximum(sigma2, 1e-300))
+    if criterion is None:
+        return np.full(sigma2.shape, np.nan)
+    if criterion == "aic":
+        return n * log_var + 2.0 * orders
+    if criterion == "bic":
+        return n * log_var + orders * np.log(n)
+    raise ValueError("criterion must be 'aic', 'bic' or None")
+
+
+def fit_ar(series: pd.Series, max_order: int = 20, criterion: str = "aic") -> ARModel:
+    """
+    Fit AR(p) by Levinson-Durbin, choosing p <= max_order by AIC or BIC.
+
+    One FFT autocovariance and one recursion give the coefficients and innovation
+    variance of every order, so selecting p needs no second fit; pass
+    ``criterion=None`` to use `max_order` as the fixed order.
+    """
+
+    y = np.asarray(series, dtype=float)
+    n = y.size
+    if n < 10:
+        raise ValueError("Need at least 10 samples for an AR fit")
+    max_order = int(min(max_order, n - 1))
+    acov = autocovariance(y, max_order)
+    table, sigma2 = _levinson_path(acov, max_order)
+    scores = _order_scores(n, sigma2, criterion)
+    order = max_order if criterion is None else int(np.argmin(scores))
+    return ARModel(coeffs=table[order, :order].copy(), mean=float(y.mean()), sigma2=float(sigma2[order]), criterion=criterion, scores=scores)
+
+
+def arp_forecast(
+    series: pd.Series,
+    sample_period: float,
+    steps_ahead: int,
+    alert_threshold: float,
+    max_order: int = 20,
+    criterion: str = "aic",
+    model: Optional[ARModel] = None,
+) -> ForecastResult:
+    """
+    Fit an AR(p) model with `fit_ar` and forecast forward.
+
+    Parameters match `ar1_forecast`, plus `max_order`/`criterion` for `fit_ar`;
+    a `model` already fitted to `series` is used as is.
+    MAE/MAPE come from one-step predictions over the last `steps_ahead` points.
+    """
+
+    y = np.asarray(series, dtype=float)
+    if model is None:
+        model = fit_ar(y, max_order, criterion)
+    p = model.order
+    z = y - model.mean
+
+    history = list(z[len(z) - p:]) if p else []
+    forecast = np.empty(steps_ahead)
+    rev = model.coeffs[::-1]
+    for i in range(steps_ahead):
+        nxt = float(np.dot(rev, history[len(history) - p:])) if p else 0.0
+        history.append(nxt)
+        forecast[i] = nxt
+    forecast += model.mean
+
+    backtest_steps = min(steps_ahead, y.size - p)
+    if p:
+        lagged = np.lib.stride_tricks.sliding_window_view(z[:-1], p)[-backtest_steps:]
+        preds = lagged @ rev + model.mean
+    else:
+        preds = np.full(backtest_steps, model.mean)
+    truth = y[-backtest_steps:]
+    mae = float(np.mean(np.abs(truth - preds)))
+    mape = float(np.mean(np.abs((truth - preds) / np.maximum(np.abs(truth), 1e-6))) * 100.0)
+
+    lead_time_seconds = np.nan
+    if alert_threshold > 0:
+        crossing = np.flatnonzero(np.abs(forecast) >= alert_threshold)
+        if crossing.size:
+            lead_time_seconds = float((crossing[0] + 1) * sample_period)
+
+    return ForecastResult(
+        forecast=forecast,
+        horizon_seconds=steps_ahead * sample_period,
+        mae=mae,
+        mape=mape,
+        lead_time_seconds=lead_time_seconds,
+        order=p,
+    )
+
+
+@dataclass
+class BacktestResult:
+    """Out-of-sample forecast errors versus horizon from a rolling-origin backtest."""
+
+    horizon_steps: np.ndarray
+    horizon_seconds: np.ndarray
+    mae: np.ndarray
+    mape: np.ndarray
+    n_origins: int
+    label: str = "AR(1)"
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "forecast_backtest_mae_step1": float(self.mae[0]),
+            "forecast_backtest_mae_horizon": float(self.mae[-1]),
+            "forecast_backtest_mape_horizon": float(self.mape[-1]),
+            "forecast_backtest_origins": float(self.n_origins),
+        }
+
+
+def _ar1_fit_sums(n: np.ndarray, sx: np.ndarray, sy: np.ndarray, sxx: np.ndarray, sxy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Batched closed-form AR(1)+bias least squares from pair sums."""
+
+    den = n * sxx - sx * sx
+    safe = np.abs(den) > 1e-12 * np.maximum(n * sxx, 1e-300)
+    phi = np.where(safe, (n * sxy - sx * sy) / np.where(safe, den, 1.0), 0.0)
+    c = (sy - phi * sx) / n
+    return c, phi
+
+
+def _ar1_horizon_batch(c: np.ndarray, phi: np.ndarray, last: np.ndarray, steps_ahead: int) -> np.ndarray:
+    """Vectorised `_ar1_horizon`: one row of k-step predictions per (c, phi, last)."""
+
+    k = np.arange(1, steps_ahead + 1, dtype=float)
+    unit = np.abs(1.0 - phi) < 1e-12
+    mu = c / np.where(unit, 1.0, 1.0 - phi)
+    geometric = mu[:, None] + np.power(phi[:, None], k) * (last - mu)[:, None]
+    return np.where(unit[:, None], last[:, None] + k * c[:, None], geometric)
+
+
+def _window_acov(z: np.ndarray, starts: np.ndarray, ends: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Means and biased autocovariances (lags 0..max_lag) of z[start:end] for every window.
+
+    One prefix sum of the lag-k products per lag serves all windows, so the cost is
+    O(n * max_lag) however many windows there are.
+    """
+
+    csum = np.concatenate(([0.0], np.cumsum(z)))
+    count = (ends - starts).astype(float)
+    mean = (csum[ends] - csum[starts]) / count
+    acov = np.empty((starts.size, max_lag + 1))
+    for k in range(max_lag + 1):
+        cprod = np.concatenate(([0.0], np.cumsum(z[: z.size - k] * z[k:])))
+        hi = np.maximum(ends - k, starts)  # pairs (z[i], z[i+k]) with start <= i < end - k
+        lead = csum[hi] - csum[starts]
+        lag = csum[hi + k] - csum[starts + k]
+        acov[:, k] = (cprod[hi] - cprod[starts] - mean * (lead + lag) + (hi - starts) * mean * mean) / count
+    return mean, acov
+
+
+def _levinson_batch(acov: np.ndarray, order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """`_levinson_path` for every row of `acov` at once: (rows, order+1, order) table and (rows, order+1) variances."""
+
+    rows = acov.shape[0]
+    table = np.zeros((rows, order + 1, order))
+    sigma2 = np.empty((rows, order + 1))
+    sigma2[:, 0] = acov[:, 0]
+    for k in range(1, order + 1):
+        prev = table[:, k - 1, : k - 1]
+        ok = sigma2[:, k - 1] > 0
+        # A degenerate row keeps its previous coefficients (kappa = 0), as the scalar recursion stops
+        kappa = np.where(ok, (acov[:, k] - np.einsum("ij,ij->i", prev, acov[:, k - 1:0:-1])) / np.where(ok, sigma2[:, k - 1], 1.0), 0.0)
+        table[:, k, : k - 1] = prev - kappa[:, None] * prev[:, ::-1]
+        table[:, k, k - 1] = kappa
+        sigma2[:, k] = np.where(ok, sigma2[:, k - 1] * (1.0 - kappa * kappa), sigma2[:, k - 1])
+    return table, sigma2
+
+
+def _arp_horizon_batch(coeffs: np.ndarray, lags: np.ndarray, steps_ahead: int) -> np.ndarray:
+    """k-step AR(p) predictions (mean removed), one row of `coeffs` per row of `lags` (last p values in time order)."""
+
+    preds = np.zeros((lags.shape[0], steps_ahead))
+    if not coeffs.shape[1]:
+        return preds
+    state = np.array(lags, dtype=float)
+    rev = coeffs[:, ::-1]
+    for i in range(steps_ahead):
+        preds[:, i] = np.einsum("ij,ij->i", state, rev)
+        state = np.concatenate([state[:, 1:], preds[:, i:i + 1]], axis=1)
+    return preds
+
+
+def rolling_origin_backtest(
+    series: pd.Series,
+    sample_period: float,
+    steps_ahead: int,
+    window: Optional[int] = None,
+    max_origins: Optional[int] = None,
+    min_train: int = 10,
+    chunk_origins: int = 4096,
+    max_order: Optional[int] = None,
+    criterion: Optional[str] = "aic",
+) -> BacktestResult:
+    """
+    Refit AR(1)+bias at many forecast origins and score every horizon out of sample.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Measurements of a metric (e.g., lock error).
+    sample_period : float
+        Sampling period (seconds).
+    steps_ahead : int
+        Longest horizon to evaluate.
+    window : int, optional
+        Fit on the last `window` samples before each origin; expanding history if None.
+    max_origins : int, optional
+        Evenly thin the origins to at most this many.
+    min_train : int
+        Smallest history used for a fit.
+    max_order, criterion : int, str, optional
+        Backtest AR(p) as `arp_forecast` fits it instead: mean, coefficients and
+        (unless `criterion` is None) the order are refitted at every origin from
+        the data before it only.
+
+    Fits for all origins come from prefix sums of the lagged pairs (lagged products
+    for AR(p), solved by a batched Levinson-Durbin recursion), and the forecasts are
+    one (origins x horizon) array, so no per-origin model is ever built.
+    """
+
+    y = np.asarray(series, dtype=float)
+    n = y.size
+    min_train = max(int(min_train), 3, int(max_order or 0) + 1)
+    if window is not None and max_order:
+        window = max(int(window), int(max_order) + 1)
+    origins = np.arange(min_train, n - steps_ahead + 1)  # samples observed at each origin
+    if steps_ahead < 1 or origins.size == 0:
+        raise ValueError("Series too short for the requested backtest horizon")
+    if max_origins and origins.size > max_origins:
+        origins = np.unique(np.linspace(origins[0], origins[-1], int(max_origins)).astype(int))
+
+    offset = y.mean()
+    z = y - offset
+    if max_order:
+        p = int(max_order)
+        starts = np.zeros_like(origins) if window is None else np.maximum(origins - int(window), 0)
+        means, acovs = _window_acov(z, starts, origins, p)
+    else:
+        x0, x1 = z[:-1], z[1:]
+        prefix = np.zeros((4, n))
+        np.cumsum(np.vstack([x0, x1, x0 * x0, x0 * x1]), axis=1, out=prefix[:, 1:])
+
+    k = np.arange(1, steps_ahead + 1)
+    abs_sum = np.zeros(steps_ahead)
+    pct_sum = np.zeros(steps_ahead)
+    for lo in range(0, origins.size, chunk_origins):
+        t = origins[lo:lo + chunk_origins]
+        if max_order:
+            table, sigma2 = _levinson_batch(acovs[lo:lo + chunk_origins], p)
+            rows = np.arange(t.size)
+            if criterion is None:
+                orders = np.full(t.size, p)
+            else:
+                orders = np.argmin(_order_scores(t - starts[lo:lo + chunk_origins], sigma2, criterion), axis=1)
+            mean = means[lo:lo + chunk_origins]
+            lags = z[(t - p)[:, None] + np.arange(p)] - mean[:, None]
+            preds = _arp_horizon_batch(table[rows, orders], lags, steps_ahead) + (mean + offset)[:, None]
+        else:
+            end = t - 1  # pairs (z[i], z[i+1]) with i < t - 1
+            start = np.zeros_like(end) if window is None else np.maximum(end - (int(window) - 1), 0)
+            sums = prefix[:, end] - prefix[:, start]
+            c, phi = _ar1_fit_sums((end - start).astype(float), *sums)
+            preds = _ar1_horizon_batch(c, phi, z[t - 1], steps_ahead) + offset
+        truth = y[(t - 1)[:, None] + k]
+        err = np.abs(truth - preds)
+        abs_sum += err.sum(axis=0)
+        pct_sum += (err / np.maximum(np.abs(truth), 1e-6)).sum(axis=0)
+
+    if not max_order:
+        label = "AR(1)"
+    elif criterion is None:
+        label = f"AR({int(max_order)})"
+    else:
+        label = f"AR(p<={int(max_order)}, {criterion.upper()})"
+    return BacktestResult(
+        horizon_steps=k,
+        horizon_seconds=k * sample_period,
+        mae=abs_sum / origins.size,
+        mape=pct_sum / origins.size * 100.0,
+        n_origins=int(origins.size),
+        label=label,
+    )
+
+
+class RecursiveAR1Forecaster:
+    """
+    Stateful AR(1)+bias forecaster updated by recursive least squares.
+
+    Each `update` costs O(1), so the model can be refreshed on every new sample of a
+    live lock-monitoring loop. A forgetting factor below 1 discounts old samples
+    (effective memory ~ 1 / (1 - forgetting) samples). MAE/MAPE are computed from
+    the most recent one-step-ahead prediction errors, made before each update.
+    """
+
+    def __init__(self, sample_period: float, forgetting: float = 1.0, error_window: int = 30, prior_scale: float = 1e6):
+        if not 0.0 < forgetting <= 1.0:
+            raise ValueError("forgetting must be in (0, 1]")
+        self.sample_period = float(sample_period)
+        self.forgetting = float(forgetting)
+        self.c = 0.0
+        self.phi = 0.0
+        self.n_samples = 0
+        self.last = None
+        self._p = [float(prior_scale), 0.0, float(prior_scale)]  # symmetric 2x2: p00, p01, p11
+        self._abs_err = deque(maxlen=int(error_window))
+        self._pct_err = deque(maxlen=int(error_window))
+
+    def fit(self, series: Iterable[float]) -> "RecursiveAR1Forecaster":
+        """Initialise the state from a history in one weighted least-squares solve."""
+
+        y = np.asarray(series, dtype=float)
+        if y.size < 3:
+            raise ValueError("Need at least 3 samples to initialise the AR(1) forecaster")
+        y0, y1 = y[:-1], y[1:]
+        w = self.forgetting ** np.arange(y0.size - 1, -1, -1, dtype=float)
+        gram = np.array([[w.sum(), w @ y0], [w @ y0, w @ (y0 * y0)]])
+        cov = np.linalg.pinv(gram)
+        self.c, self.phi = cov @ np.array([w @ y1, w @ (y0 * y1)])
+        self._p = [float(cov[0, 0]), float(cov[0, 1]), float(cov[1, 1])]
+
+        preds = self.c + self.phi * y0[-self._abs_err.maxlen:]
+        truth = y1[-self._abs_err.maxlen:]
+        self._abs_err.clear()
+        self._pct_err.clear()
+        self._abs_err.extend(np.abs(truth - preds))
+        self._pct_err.extend(np.abs((truth - preds) / np.maximum(np.abs(truth), 1e-6)) * 100.0)
+        self.n_samples = int(y.size)
+        self.last = float(y[-1])
+        return self
+
+    def update(self, value: float) -> "RecursiveAR1Forecaster":
+        """Incorporate one new sample."""
+
+        value = float(value)
+        if self.last is not None:
+            x = self.last
+            err = value - (self.c + self.phi * x)
+            self._abs_err.append(abs(err))
+            self._pct_err.append(abs(err) / max(abs(value), 1e-6) * 100.0)
+
+            p00, p01, p11 = self._p
+            g0 = p00 + p01 * x
+            g1 = p01 + p11 * x
+            denom = self.forgetting + g0 + g1 * x
+            k0, k1 = g0 / denom, g1 / denom
+            self.c += k0 * err
+            self.phi += k1 * err
+            lam = self.forgetting
+            self._p = [(p00 - k0 * g0) / lam, (p01 - k0 * g1) / lam, (p11 - k1 * g1) / lam]
+        self.last = value
+        self.n_samples += 1
+        return self
+
+    def update_many(self, values: Iterable[float]) -> "RecursiveAR1Forecaster":
+        for value in values:
+            self.update(value)
+        return self
+
+    def forecast(self, steps_ahead: int, alert_threshold: float) -> ForecastResult:
+        """Forecast from the latest sample with the current coefficients."""
+
+        if self.last is None:
+            raise ValueError("No samples seen yet")
+        lead_steps = _lead_steps(self.c, self.phi, self.last, alert_threshold, steps_ahead)
+        return ForecastResult(
+            forecast=_ar1_horizon(self.c, self.phi, self.last, steps_ahead),
+            horizon_seconds=steps_ahead * self.sample_period,
+            mae=float(np.mean(self._abs_err)) if self._abs_err else np.nan,
+            mape=float(np.mean(self._pct_err)) if self._pct_err else np.nan,
+            lead_time_seconds=lead_steps * self.sample_period if lead_steps is not None else np.nan,
+        )
@@ -0,0 +1,153 @@
+"""Batched PSD, Allan deviation and AR(1) forecasts over several log columns at once."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .allan import StabilityResult, stability_deviations
+from .forecast import _ar1_fit_sums, _ar1_horizon_batch, _lead_steps
+
+_BLOCK_SAMPLES = 1 << 22
+
+
+@dataclass
+class ChannelAnalysis:
+    """Per-channel results; every array has one row per entry of `channels`."""
+
+    channels: List[str]
+    mean: np.ndarray
+    std: np.ndarray
+    freqs: np.ndarray
+    psd: np.ndarray
+    noise_floor: np.ndarray
+    stability: StabilityResult
+    c: np.ndarray
+    phi: np.ndarray
+    forecast: np.ndarray
+    forecast_mae: np.ndarray
+    forecast_mape: np.ndarray
+    lead_time_seconds: np.ndarray
+
+    def as_dict(self) -> Dict[str, float]:
+        out = {}
+        for i, ch in enumerate(self.channels):
+            out[f"{ch}_mean"] = float(self.mean[i])
+            out[f"{ch}_std"] = float(self.std[i])
+            out[f"{ch}_psd_noise_floor"] = float(self.noise_floor[i])
+            out[f"{ch}_allan_deviation"] = float(self.stability.adev[i, 0])
+            out[f"{ch}_ar1_phi"] = float(self.phi[i])
+            out[f"{ch}_forecast_mae"] = float(self.forecast_mae[i])
+            out[f"{ch}_forecast_mape"] = float(self.forecast_mape[i])
+            out[f"{ch}_forecast_lead_seconds"] = float(self.lead_time_seconds[i])
+        return out
+
+
+def _batched_psd(y: np.ndarray, fs_hz: float, segment_length: Optional[int], overlap: float):
+    """Row-wise `compute_psd`: periodogram, or Welch when `segment_length` is set."""
+
+    n = y.shape[1]
+    L = min(int(segment_length), n) if segment_length else n
+    if L < 2:
+        raise ValueError("segment_length must be at least 2")
+    step = max(1, L - int(round(overlap * L))) if segment_length else L
+    window = np.hanning(L)
+    segments = np.lib.stride_tricks.sliding_window_view(y, L, axis=1)[:, ::step]
+    n_seg = segments.shape[1]
+    power = np.zeros((y.shape[0], L // 2 + 1))
+    block = max(1, _BLOCK_SAMPLES // (L * y.shape[0]))
+    for lo in range(0, n_seg, block):
+        seg = segments[:, lo:lo + block]
+        seg = (seg - seg.mean(axis=2, keepdims=True)) * window
+        power += np.sum(np.abs(np.fft.rfft(seg, axis=2)) ** 2, axis=1)
+    psd = power / (n_seg * np.sum(window**2) * fs_hz)
+    return np.fft.rfftfreq(L, d=1.0 / fs_hz), psd
+
+
+def analyze_channels(
+    df: pd.DataFrame,
+    channels: Sequence[str],
+    sample_period: float,
+    segment_length: Optional[int] = None,
+    overlap: float = 0.5,
+    steps_ahead: int = 30,
+    alert_thresholds: Optional[Dict[str, float]] = None,
+) -> ChannelAnalysis:
+    """
+    Run the PSD, Allan and AR(1) forecast analyses on several columns together.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Log with one numeric column per channel.
+    channels : sequence of str
+        Columns to analyse.
+    sample_period : float
+        Sampling period in seconds.
+    segment_length, overlap :
+        As in `compute_psd`; ``None`` gives a full-length periodogram.
+    steps_ahead : int
+        Forecast horizon in samples.
+    alert_thresholds : dict, optional
+        Per-channel absolute thresholds for the forecast lead time; channels
+        without one report NaN.
+
+    The columns are stacked into one (channels x samples) array, so each stage is
+    a single batched operation along the sample axis: one FFT for the PSDs, one
+    cumulative-sum pass for the Allan family and one set of pair sums for AR(1).
+    Welch segments are transformed in blocks of at most `_BLOCK_SAMPLES` values.
+    Per-channel values match the single-channel functions.
+    """
+
+    channels = list(channels)
+    missing = [ch for ch in channels if ch not in df.columns]
+    if missing:
+        raise ValueError(f"Missing channels: {missing}")
+    y = np.stack([df[ch].to_numpy(dtype=float) for ch in channels])
+    if y.shape[1] < 10:
+        raise ValueError("Need at least 10 samples per channel")
+
+    mean = y.mean(axis=1)
+    std = y.std(axis=1, ddof=1)
+    freqs, psd = _batched_psd(y, 1.0 / sample_period, segment_length, overlap)
+    tail = psd[:, -10:] if psd.shape[1] >= 10 else psd
+    noise_floor = np.median(tail, axis=1)
+    stability = stability_deviations(y, sample_period)
+
+    # AR(1)+bias on mean-removed channels keeps the pair sums well conditioned
+    centred = y - mean[:, None]
+    x0, x1 = centred[:, :-1], centred[:, 1:]
+    n = np.full(len(channels), float(x0.shape[1]))
+    c0, phi = _ar1_fit_sums(n, x0.sum(axis=1), x1.sum(axis=1), np.einsum("ij,ij->i", x0, x0), np.einsum("ij,ij->i", x0, x1))
+    c = c0 + mean * (1.0 - phi)
+    forecast = _ar1_horizon_batch(c, phi, y[:, -1], steps_ahead)
+
+    k = min(steps_ahead, x1.shape[1])
+    truth = y[:, -k:]
+    preds = c[:, None] + phi[:, None] * y[:, -k - 1:-1]
+    forecast_mae = np.mean(np.abs(truth - preds), axis=1)
+    forecast_mape = np.mean(np.abs((truth - preds) / np.maximum(np.abs(truth), 1e-6)), axis=1) * 100.0
+
+    thresholds = alert_thresholds or {}
+    lead = np.full(len(channels), np.nan)
+    for i, ch in enumerate(channels):
+        if ch in thresholds:
+            steps = _lead_steps(c[i], phi[i], y[i, -1], float(thresholds[ch]), steps_ahead)
+            lead[i] = steps * sample_period if steps is not None else np.nan
+
+    return ChannelAnalysis(
+        channels=channels,
+        mean=mean,
+        std=std,
+        freqs=freqs,
+        psd=psd,
+        noise_floor=noise_floor,
+        stability=stability,
+        c=c,
+        phi=phi,
+        forecast=forecast,
+        forecast_mae=forecast_mae,
+        forecast_mape=forecast_mape,
+        lead_time_seconds=lead,
+    )
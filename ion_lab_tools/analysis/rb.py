@@ -1,11 +1,20 @@
 """Randomized benchmarking (RB) decay fitting utilities."""
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from scipy.optimize import curve_fit
+
+
+# Columns of RBFitResult.as_dict(), for batch tables that have no fit to take them from
+_FIT_COLUMNS = ["rb_a", "rb_p", "rb_b", "rb_residual_rms", "rb_ci_half_width"]
+
+# Pools start workers with "spawn": callers such as the report's stage threads may be
+# multithreaded, and forking a multithreaded process can deadlock the child.
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
 
 
 @dataclass
@@ -29,10 +38,39 @@ class RBFitResult:
         }
 
 
+_LOWER = np.array([0.0, 0.5, 0.0])
+_UPPER = np.array([1.5, 1.0, 1.0])
+
+
 def _rb_model(m: np.ndarray, a: float, p: float, b: float) -> np.ndarray:
     return a * (p**m) + b
 
 
+def _initial_guess(y: np.ndarray) -> Tuple[float, float, float]:
+    # Initial guesses: a~(y0 - y_end), p~0.995, b~y_end
+    return max(y[0] - y[-1], 0.01), 0.995, max(y[-1], 0.5)
+
+
+def _build_result(m: np.ndarray, y: np.ndarray, popt: np.ndarray, pcov: np.ndarray) -> Tuple[np.ndarray, RBFitResult]:
+    fit_y = _rb_model(m, *popt)
+    residuals = y - fit_y
+    residual_rms = float(np.sqrt(np.mean(residuals**2)))
+
+    # 95% confidence interval half-width using diagonal of covariance
+    sigma = np.sqrt(np.diag(pcov))
+    ci_half_width = float(1.96 * np.mean(sigma))
+
+    result = RBFitResult(
+        a=float(popt[0]),
+        p=float(popt[1]),
+        b=float(popt[2]),
+        covariance=pcov,
+        residual_rms=residual_rms,
+        ci_half_width=ci_half_width,
+    )
+    return fit_y, result
+
+
 def fit_rb_decay(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, RBFitResult]:
     """
     Fit the standard RB decay curve:
@@ -63,26 +101,257 @@ def fit_rb_decay(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, RBFitResult]
     if len(m) < 5:
         raise ValueError("Need at least 5 RB points to fit a decay curve")
 
-    # Initial guesses: a~(y0 - y_end), p~0.995, b~y_end
-    a0 = max(y[0] - y[-1], 0.01)
-    p0 = 0.995
-    b0 = max(y[-1], 0.5)
+    # SciPy is only needed here; importing it lazily keeps cached report runs fast to start
+    from scipy.optimize import curve_fit
 
-    popt, pcov = curve_fit(_rb_model, m, y, p0=[a0, p0, b0], bounds=([0, 0.5, 0], [1.5, 1.0, 1.0]))
-    fit_y = _rb_model(m, *popt)
+    popt, pcov = curve_fit(_rb_model, m, y, p0=list(_initial_guess(y)), bounds=(_LOWER, _UPPER))
+    fit_y, result = _build_result(m, y, popt, pcov)
+    return m, fit_y, result
+
+
+def _fit_rb_batched(
+    m: np.ndarray, y: np.ndarray, mask: np.ndarray, start: np.ndarray, max_iter: int = 200, tol: float = 1e-12
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bounded Levenberg-Marquardt fit of F(m) = a * p^m + b for many curves at once.
+
+    `m`, `y` and `mask` are (curves, points) arrays; padded points carry mask=False.
+    Returns parameters (curves, 3), covariances (curves, 3, 3) scaled like
+    `curve_fit` (residual variance times the inverse normal matrix) and a boolean
+    per curve that is False when `max_iter` ran out before convergence.
+    """
+
+    w = mask.astype(float)
+    m = np.where(mask, m, 0.0)
+    params = np.clip(np.asarray(start, dtype=float), _LOWER, _UPPER)
+    n_points = w.sum(axis=1)
+
+    def residuals_and_jacobian(theta, rows):
+        a, p, b = theta[:, 0:1], theta[:, 1:2], theta[:, 2:3]
+        mr, wr = m[rows], w[rows]
+        pm = p**mr
+        resid = (y[rows] - (a * pm + b)) * wr
+        jac = np.stack([pm, a * mr * p ** np.maximum(mr - 1.0, 0.0), np.ones_like(pm)], axis=-1) * wr[..., None]
+        return resid, jac
+
+    resid, jac = residuals_and_jacobian(params, slice(None))
+    sse = np.einsum("gl,gl->g", resid, resid)
+    lam = np.full(params.shape[0], 1e-3)
+    active = np.ones(params.shape[0], dtype=bool)
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        jtj = np.einsum("gli,glj->gij", jac[idx], jac[idx])
+        jtr = np.einsum("gli,gl->gi", jac[idx], resid[idx])
+        damped = jtj + lam[idx, None, None] * (jtj * np.eye(3) + 1e-12 * np.eye(3))
+        step = np.linalg.solve(damped, jtr[..., None])[..., 0]
+        trial = np.clip(params[idx] + step, _LOWER, _UPPER)
+        trial_resid, trial_jac = residuals_and_jacobian(trial, idx)
+        trial_sse = np.einsum("gl,gl->g", trial_resid, trial_resid)
+
+        better = trial_sse < sse[idx]
+        gain = np.where(better, sse[idx] - trial_sse, 0.0)
+        moved = np.max(np.abs(trial - params[idx]), axis=1)
+        good = idx[better]
+        params[good] = trial[better]
+        resid[good] = trial_resid[better]
+        jac[good] = trial_jac[better]
+        lam[good] = np.maximum(lam[good] / 3.0, 1e-12)
+        lam[idx[~better]] *= 4.0
+
+        done = (better & ((gain <= tol * np.maximum(sse[idx], 1e-300)) | (moved < 1e-12))) | (lam[idx] > 1e12)
+        sse[good] = trial_sse[better]
+        active[idx[done]] = False
+
+    jtj = np.einsum("gli,glj->gij", jac, jac)
+    dof = np.maximum(n_points - 3.0, 1.0)
+    pcov = np.linalg.pinv(jtj) * (sse / dof)[:, None, None]
+    return params, pcov, ~active
+
+
+def _fit_group(item):
+    key, frame = item
+    try:
+        _, _, result = fit_rb_decay(frame)
+        return key, result, ""
+    except (ValueError, RuntimeError) as exc:
+        return key, None, str(exc)
+
+
+def fit_rb_batch(
+    df: pd.DataFrame,
+    group_cols: Union[str, Sequence[str]],
+    method: str = "vectorized",
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Fit the RB decay for every group of a long-format table.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Columns `sequence_length`, `fidelity` plus the grouping columns
+        (e.g. qubit, gate, interleaved variant).
+    group_cols : str or list of str
+        Columns identifying one RB dataset.
+    method : {"vectorized", "process"}
+        "vectorized" runs one batched Levenberg-Marquardt over all groups with the
+        analytic Jacobian; "process" runs `fit_rb_decay` per group in a process pool.
+    max_workers : int, optional
+        Pool size for the "process" method.
+
+    Returns
+    -------
+    DataFrame with one row per group: the group keys, an `rb_fit` column holding the
+    `RBFitResult` (None on failure), its `as_dict()` fields, `n_points` and `error`
+    (empty unless the fit failed or did not converge). Rows with a missing group
+    key are skipped; with no groups left the table is empty but has these columns.
+    """
+
+    group_cols = [group_cols] if isinstance(group_cols, str) else list(group_cols)
+    needed = {"sequence_length", "fidelity", *group_cols}
+    if not needed <= set(df.columns):
+        raise ValueError(f"RB batch data must contain {sorted(needed)}")
+
+    # Rows without a complete group key belong to no dataset (groupby drops them too)
+    data = df.dropna(subset=["sequence_length", "fidelity", *group_cols]).sort_values(group_cols + ["sequence_length"], kind="stable")
+    grouped = data.groupby(group_cols, sort=False)
+    keys = data[group_cols].drop_duplicates().reset_index(drop=True)  # same order as ngroup()
+
+    if method not in ("vectorized", "process"):
+        raise ValueError("method must be 'vectorized' or 'process'")
+    if keys.empty:
+        results, errors, counts = [], [], np.zeros(0, dtype=int)
+    elif method == "process":
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=_POOL_CONTEXT) as pool:
+            fitted = list(pool.map(_fit_group, grouped, chunksize=max(1, len(keys) // 64)))
+        results = [r for _, r, _ in fitted]
+        errors = [e for _, _, e in fitted]
+        counts = grouped.size().to_numpy()
+    else:
+        codes = grouped.ngroup().to_numpy()
+        pos = grouped.cumcount().to_numpy()
+        counts = np.bincount(codes, minlength=len(keys))
+        shape = (len(keys), int(counts.max()) if len(keys) else 0)
+        m = np.zeros(shape)
+        y = np.zeros(shape)
+        mask = np.zeros(shape, dtype=bool)
+        m[codes, pos] = data["sequence_length"].to_numpy(dtype=float)
+        y[codes, pos] = data["fidelity"].to_numpy(dtype=float)
+        mask[codes, pos] = True
+
+        last = y[np.arange(len(keys)), np.maximum(counts - 1, 0)]
+        start = np.column_stack([np.maximum(y[:, 0] - last, 0.01), np.full(len(keys), 0.995), np.maximum(last, 0.5)])
+        params, pcov, converged = _fit_rb_batched(m, y, mask, start)
+        results, errors = [], []
+        for g in range(len(keys)):
+            if counts[g] < 5:
+                results.append(None)
+                errors.append("Need at least 5 RB points to fit a decay curve")
+                continue
+            n = counts[g]
+            _, result = _build_result(m[g, :n], y[g, :n], params[g], pcov[g])
+            results.append(result)
+            errors.append("" if converged[g] else "Levenberg-Marquardt did not converge; parameters are from the last iteration")
+
+    table = keys
+    table["rb_fit"] = results
+    metrics = pd.DataFrame([r.as_dict() if r is not None else {} for r in results], index=table.index, columns=_FIT_COLUMNS)
+    table = pd.concat([table, metrics], axis=1)
+    table["n_points"] = counts
+    table["error"] = errors
+    return table
+
+
+@dataclass
+class RBBootstrapResult:
+    """Percentile confidence intervals for the RB decay `p` and the derived gate error."""
+
+    p_ci: Tuple[float, float]
+    gate_error: float
+    gate_error_ci: Tuple[float, float]
+    confidence: float
+    p_samples: np.ndarray
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "rb_p_ci_low": float(self.p_ci[0]),
+            "rb_p_ci_high": float(self.p_ci[1]),
+            "rb_gate_error": float(self.gate_error),
+            "rb_gate_error_ci_low": float(self.gate_error_ci[0]),
+            "rb_gate_error_ci_high": float(self.gate_error_ci[1]),
+        }
+
+
+def _bootstrap_chunk(m, fit_y, residuals, popt, method, count, seed):
+    rng = np.random.default_rng(seed)
+    n = m.size
+    if method == "residual":
+        noise = residuals[rng.integers(0, n, size=(count, n))]
+    else:
+        scale = np.sqrt(np.sum(residuals**2) / max(n - 3, 1))
+        noise = rng.normal(scale=scale, size=(count, n))
+    samples = fit_y + noise
+    params, _, _ = _fit_rb_batched(np.broadcast_to(m, samples.shape), samples, np.ones(samples.shape, dtype=bool), np.tile(popt, (count, 1)))
+    return params[:, 1]
+
+
+def bootstrap_rb_ci(
+    df: pd.DataFrame,
+    n_boot: int = 2000,
+    method: str = "residual",
+    confidence: float = 0.95,
+    dimension: int = 2,
+    seed: int = 0,
+    n_jobs: int = 1,
+) -> RBBootstrapResult:
+    """
+    Bootstrap the RB fit to get percentile CIs for `p` and the gate error.
+
+    Parameters
+    ----------
+    df : DataFrame
+        Must contain `sequence_length` and `fidelity`.
+    n_boot : int
+        Number of resampled curves; all are refitted as one batched problem.
+    method : {"residual", "parametric"}
+        Resample fit residuals with replacement, or draw Gaussian noise with the
+        residual variance.
+    confidence : float
+        Two-sided confidence level.
+    dimension : int
+        Hilbert-space dimension d for the gate error r = (d - 1) / d * (1 - p).
+    n_jobs : int
+        Split the resamples across this many worker processes.
+    """
+
+    if method not in ("residual", "parametric"):
+        raise ValueError("method must be 'residual' or 'parametric'")
+    if n_boot < 1:
+        raise ValueError("n_boot must be positive")
+    m, fit_y, result = fit_rb_decay(df)
+    y = df.dropna(subset=["sequence_length", "fidelity"]).sort_values("sequence_length")["fidelity"].to_numpy(dtype=float)
+    popt = np.array([result.a, result.p, result.b])
     residuals = y - fit_y
-    residual_rms = float(np.sqrt(np.mean(residuals**2)))
 
-    # 95% confidence interval half-width using diagonal of covariance
-    sigma = np.sqrt(np.diag(pcov))
-    ci_half_width = float(1.96 * np.mean(sigma))
+    seeds = np.random.SeedSequence(seed).spawn(max(1, int(n_jobs)))
+    counts = [len(c) for c in np.array_split(np.arange(n_boot), len(seeds))]
+    args = [(m, fit_y, residuals, popt, method, c, sd) for c, sd in zip(counts, seeds) if c]
+    if len(args) == 1:
+        chunks = [_bootstrap_chunk(*args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(args), mp_context=_POOL_CONTEXT) as pool:
+            chunks = list(pool.map(_bootstrap_chunk, *zip(*args)))
+    p_samples = np.concatenate(chunks)
 
-    result = RBFitResult(
-        a=float(popt[0]),
-        p=float(popt[1]),
-        b=float(popt[2]),
-        covariance=pcov,
-        residual_rms=residual_rms,
-        ci_half_width=ci_half_width,
+    alpha = 0.5 * (1.0 - confidence)
+    p_lo, p_hi = np.quantile(p_samples, [alpha, 1.0 - alpha])
+    scale = (dimension - 1) / dimension
+    return RBBootstrapResult(
+        p_ci=(float(p_lo), float(p_hi)),
+        gate_error=float(scale * (1.0 - result.p)),
+        gate_error_ci=(float(scale * (1.0 - p_hi)), float(scale * (1.0 - p_lo))),
+        confidence=float(confidence),
+        p_samples=p_samples,
     )
-    return m, fit_y, result
@@ -1,11 +1,14 @@
 """Noise/decimation robustness diagnostics."""
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from .allan import phase_sums
+from .forecast import _ar1_fit_sums, autocovariance
+
 
 @dataclass
 class RobustnessResult:
@@ -32,6 +35,87 @@ def evaluate_noise_robustness(series: pd.Series, noise_levels: Iterable[float])
     return np.asarray(levels, dtype=float), np.asarray(stds, dtype=float) / (baseline_std + 1e-9)
 
 
+@dataclass
+class NoiseSweepResult:
+    """Per-level, per-trial metrics from a Monte Carlo noise injection sweep.
+
+    Arrays are (levels, trials); `std_ratio` is relative to the clean series std.
+    """
+
+    levels: np.ndarray
+    std_ratio: np.ndarray
+    adev: np.ndarray
+    forecast_mae: np.ndarray
+
+    def band(self, metric: str = "std_ratio", confidence: float = 0.9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (median, low, high) across trials for one metric."""
+
+        values = getattr(self, metric)
+        alpha = 0.5 * (1.0 - confidence)
+        lo, med, hi = np.quantile(values, [alpha, 0.5, 1.0 - alpha], axis=1)
+        return med, lo, hi
+
+    def as_dict(self, confidence: float = 0.9) -> Dict[str, float]:
+        """Median and `confidence` band of every metric at the highest noise level."""
+
+        out = {}
+        for metric in ("std_ratio", "adev", "forecast_mae"):
+            med, lo, hi = self.band(metric, confidence)
+            out[f"robustness_noise_{metric}_median"] = float(med[-1])
+            out[f"robustness_noise_{metric}_lo"] = float(lo[-1])
+            out[f"robustness_noise_{metric}_hi"] = float(hi[-1])
+        return out
+
+
+def noise_robustness_sweep(
+    series: pd.Series,
+    noise_levels: Iterable[float],
+    n_trials: int = 200,
+    steps_ahead: int = 30,
+    seed: int = 0,
+    max_elements: Optional[int] = 1 << 24,
+) -> NoiseSweepResult:
+    """
+    Inject independent Gaussian noise realisations at every level and measure the std
+    ratio, shortest-tau Allan deviation and AR(1) in-sample forecast MAE per trial.
+
+    All trials are drawn and scored as one (levels, trials, samples) array; when that
+    exceeds `max_elements` the trials are processed in chunks.
+    """
+
+    y = np.asarray(series, dtype=float)
+    levels = np.asarray(list(noise_levels), dtype=float)
+    n = y.size
+    if n < 10:
+        raise ValueError("Need at least 10 samples for the noise sweep")
+    baseline_std = y.std(ddof=1)
+    backtest = min(steps_ahead, n - 1)
+
+    rng = np.random.default_rng(seed)
+    per_chunk = n_trials if not max_elements else max(1, min(n_trials, int(max_elements) // max(1, levels.size * n)))
+    shape = (levels.size, n_trials)
+    std_ratio = np.empty(shape)
+    adev = np.empty(shape)
+    mae = np.empty(shape)
+    for start in range(0, n_trials, per_chunk):
+        stop = min(start + per_chunk, n_trials)
+        noisy = y + rng.standard_normal((levels.size, stop - start, n)) * levels[:, None, None]
+        std_ratio[:, start:stop] = noisy.std(axis=-1, ddof=1) / (baseline_std + 1e-9)
+        diffs = np.diff(noisy, axis=-1)
+        adev[:, start:stop] = np.sqrt(0.5 * np.mean(diffs**2, axis=-1))
+
+        # Batched AR(1)+bias fit and one-step backtest, as in ar1_forecast
+        z = noisy - noisy.mean(axis=-1, keepdims=True)
+        x0, x1 = z[..., :-1], z[..., 1:]
+        c, phi = _ar1_fit_sums(
+            float(n - 1), x0.sum(axis=-1), x1.sum(axis=-1), np.einsum("...i,...i->...", x0, x0), np.einsum("...i,...i->...", x0, x1)
+        )
+        preds = c[..., None] + phi[..., None] * x0[..., -backtest:]
+        mae[:, start:stop] = np.mean(np.abs(x1[..., -backtest:] - preds), axis=-1)
+
+    return NoiseSweepResult(levels=levels, std_ratio=std_ratio, adev=adev, forecast_mae=mae)
+
+
 def evaluate_downsample_robustness(series: pd.Series, factors: Iterable[int]) -> Tuple[np.ndarray, np.ndarray]:
     """Return downsample factors and resulting mean-drift magnitude."""
 
@@ -49,6 +133,114 @@ def evaluate_downsample_robustness(series: pd.Series, factors: Iterable[int]) ->
     return np.asarray(facs, dtype=float), np.asarray(drifts, dtype=float)
 
 
+@dataclass
+class DecimationResult:
+    """Per-factor drift of decimated-series statistics relative to the full-rate series.
+
+    `mean_drift` uses phase 0 (as `evaluate_downsample_robustness`); the other fields
+    aggregate over every phase offset. `adev_ratio` compares the decimated series'
+    shortest-tau ADEV with the full-rate ADEV at the same tau (aliasing penalty), and
+    `psd_floor_ratio` compares high-frequency PSD floors with the undecimated series.
+    """
+
+    factors: np.ndarray
+    mean_drift: np.ndarray
+    mean_drift_max: np.ndarray
+    variance_ratio: np.ndarray
+    adev_ratio: np.ndarray
+    psd_floor_ratio: np.ndarray
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "decimation_mean_drift_worst_phase": float(self.mean_drift_max[-1]),
+            "decimation_variance_ratio": float(self.variance_ratio[-1]),
+            "decimation_adev_ratio": float(self.adev_ratio[-1]),
+            "decimation_psd_floor_ratio": float(self.psd_floor_ratio[-1]),
+        }
+
+
+def _lag_window_floor(acov_lags: np.ndarray, sample_period: float, floor_bins: int = 10) -> float:
+    # Blackman-Tukey PSD from autocovariance lags (Hann lag window), same scaling as compute_psd
+    K = acov_lags.size
+    w = 0.5 * (1.0 + np.cos(np.pi * np.arange(K) / K))
+    seq = np.zeros(2 * K)
+    seq[:K] = acov_lags * w
+    seq[K + 1:] = seq[1:K][::-1]
+    psd = np.fft.rfft(seq).real * sample_period
+    return float(np.median(psd[-floor_bins:]))
+
+
+def decimation_robustness(series: pd.Series, factors: Iterable[int], sample_period: float = 1.0, psd_lags: int = 64) -> DecimationResult:
+    """
+    Mean, variance, Allan deviation and PSD-floor drift for every decimation factor and phase.
+
+    Per-phase sums come from strided reshape views of one shared (centred) copy of the
+    series, so nothing is copied per factor. Full-rate ADEVs reuse one cumulative sum,
+    with cluster starts thinned to every m/4 samples (statistically almost as efficient
+    as fully overlapping), and all PSD floors are Blackman-Tukey estimates from one FFT
+    autocovariance.
+    """
+
+    y = np.asarray(series, dtype=float)
+    n = y.size
+    facs = np.unique(np.asarray([f for f in factors if 0 < f <= n // 2], dtype=int))
+    if facs.size == 0:
+        raise ValueError("No decimation factor leaves at least 2 samples per phase")
+
+    baseline = y.mean()
+    z = y - baseline
+    z2 = z * z
+    var = z2.sum() / (n - 1)
+    sums = phase_sums(y)
+    acov = autocovariance(y, min(n - 1, int(facs[-1]) * (psd_lags - 1)))
+    base_floor = _lag_window_floor(acov[: min(psd_lags, acov.size)], sample_period)
+
+    ones = np.ones(n // int(facs[0]))  # column sums as BLAS matrix-vector products
+    out = np.empty((5, facs.size))
+    for i, f in enumerate(facs):
+        rows = n // f
+        r = n - rows * f
+        view = z[: rows * f].reshape(rows, f)
+        tail = z[rows * f:]
+        count = np.full(f, rows, dtype=float)
+        count[:r] += 1
+        s1 = ones[:rows] @ view
+        s2 = ones[:rows] @ z2[: rows * f].reshape(rows, f)
+        cross = np.einsum("ij,ij->j", view[:-1], view[1:])
+        s1[:r] += tail
+        s2[:r] += tail * tail
+        cross[:r] += view[-1, :r] * tail
+        last = view[-1].copy()
+        last[:r] = tail
+
+        means = s1 / count
+        phase_var = (s2 - count * means**2) / (count - 1)
+        diff_sq = 2.0 * s2 - view[0] ** 2 - last**2 - 2.0 * cross
+        phase_adev = np.sqrt(0.5 * np.maximum(diff_sq, 0.0) / (count - 1))
+        stride = max(1, f // 4)
+        k = sums.size - 2 * f
+        d = sums[2 * f::stride] - 2.0 * sums[f:f + k:stride] + sums[:k:stride]
+        full_adev = np.sqrt(0.5 * np.dot(d, d) / d.size) / f
+
+        lags = acov[:: f][: min(psd_lags, (n - 1) // f + 1)]
+        out[:, i] = [
+            abs(means[0]),
+            np.max(np.abs(means)),
+            np.mean(phase_var) / var,
+            np.mean(phase_adev) / full_adev,
+            _lag_window_floor(lags, f * sample_period) / base_floor,
+        ]
+
+    return DecimationResult(
+        factors=facs.astype(float),
+        mean_drift=out[0],
+        mean_drift_max=out[1],
+        variance_ratio=out[2],
+        adev_ratio=out[3],
+        psd_floor_ratio=out[4],
+    )
+
+
 def summarize_robustness(noise_levels: np.ndarray, noise_ratio: np.ndarray, factors: np.ndarray, drifts: np.ndarray) -> RobustnessResult:
     noise_slope = float(np.polyfit(noise_levels, noise_ratio, 1)[0]) if len(noise_levels) > 1 else 0.0
     downsample_slope = float(np.polyfit(factors, drifts, 1)[0]) if len(factors) > 1 else 0.0
@@ -0,0 +1,208 @@
+"""
+Run many report configs (e.g. one per trap and day) in one process pool.
+
+Example:
+    python -m ion_lab_tools.batch "configs/traps/*.yaml" --workers 4 --index out/batch_index.json
+    python -m ion_lab_tools.batch --manifest configs/nightly.yaml
+
+Configs whose input files are identical are grouped so each group loads its
+log, RB and BO data once and shares it between its configs. A failing config
+is recorded in the index with its error and does not stop the others.
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .pipeline import Pipeline
+from .report import INPUT_STAGES, STAGES, _load_config, generate_from_config
+
+
+def expand_configs(patterns: Sequence[str] = (), manifest: Optional[str] = None) -> List[str]:
+    """
+    Config paths from glob `patterns` and/or a YAML `manifest`, in order and without duplicates.
+
+    The manifest is a list of paths (or a mapping with a ``configs`` list); entries
+    may be globs and are resolved relative to the manifest's directory.
+    """
+    entries = [(pattern, None) for pattern in patterns]
+    if manifest:
+        import yaml
+
+        with open(manifest, "r", encoding="utf-8") as fh:
+            listed = yaml.safe_load(fh) or []
+        if isinstance(listed, dict):
+            listed = listed.get("configs", [])
+        base = os.path.dirname(os.path.abspath(manifest))
+        entries += [(str(entry), base) for entry in listed]
+
+    paths: List[str] = []
+    for pattern, base in entries:
+        if base is not None and not os.path.isabs(pattern):
+            pattern = os.path.join(base, pattern)
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def _input_key(config: Dict) -> Tuple[str, ...]:
+    # Pipeline keys of the loader stages cover the input paths, their size/mtime and load options
+    keys = Pipeline(STAGES, config, cache_dir=None).keys
+    return tuple(keys[name] for name in INPUT_STAGES)
+
+
+def group_configs(configs: Sequence[Tuple[str, Dict]], workers: int = 1) -> List[List[Tuple[str, Dict]]]:
+    """
+    Group (path, config) items that read the same inputs.
+
+    Groups larger than an even share of the pool are split so that every worker
+    has something to do; each chunk still loads its inputs only once.
+    """
+    groups: Dict[Tuple[str, ...], List[Tuple[str, Dict]]] = {}
+    for item in configs:
+        groups.setdefault(_input_key(item[1]), []).append(item)
+    share = max(1, math.ceil(len(configs) / max(1, workers)))
+    chunks = []
+    for items in groups.values():
+        size = max(1, math.ceil(len(items) / math.ceil(len(items) / share)))
+        chunks.extend(items[lo:lo + size] for lo in range(0, len(items), size))
+    return chunks
+
+
+def _error(path: str, exc: BaseException, started: float) -> Dict:
+    return {
+        "config": path,
+        "status": "error",
+        "error": f"{type(exc).__name__}: {exc}",
+        "traceback": traceback.format_exc(),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _run_group(items: Sequence[Tuple[str, Dict]], metrics_only: bool = False) -> List[Dict]:
+    """Load the group's shared inputs once, then run each config on them."""
+
+    shared = {}
+    try:
+        shared = Pipeline(STAGES, items[0][1], cache_dir=None, max_workers=1).run(INPUT_STAGES)
+    except Exception:
+        # Each config then loads (and reports) its own inputs
+        shared = {}
+
+    results = []
+    for path, config in items:
+        started = time.perf_counter()
+        try:
+            outputs = generate_from_config(config, preloaded=shared, metrics_only=metrics_only)
+        except Exception as exc:
+            results.append(_error(path, exc, started))
+            continue
+        results.append(
+            {
+                "config": path,
+                "status": "ok",
+                "output_dir": config.get("output_dir", "out"),
+                "outputs": outputs,
+                "seconds": time.perf_counter() - started,
+            }
+        )
+    return results
+
+
+def run_batch(paths: Sequence[str], workers: int = 1, index_path: Optional[str] = None, metrics_only: bool = False) -> Dict:
+    """
+    Run `generate_from_config` for every config path on `workers` processes.
+
+    Returns the combined index (and writes it to `index_path` if given): one entry
+    per config in input order with its status, outputs or error, plus counts.
+    Configs that cannot be read, or that write to an output directory already
+    claimed by an earlier config, fail without running. `metrics_only` skips
+    figure rendering as in `generate_from_config`.
+    """
+    started = time.perf_counter()
+    results: Dict[str, Dict] = {}
+    runnable: List[Tuple[str, Dict]] = []
+    owners: Dict[str, str] = {}
+    for path in paths:
+        t0 = time.perf_counter()
+        try:
+            config = _load_config(path)
+            if not isinstance(config, dict):
+                raise ValueError("Config is not a mapping")
+            output = os.path.abspath(config.get("output_dir", "out"))
+            if output in owners:
+                raise ValueError(f"output_dir {output} is already used by {owners[output]}")
+            owners[output] = path
+            # The batch pool is the parallelism; nested render pools would oversubscribe it
+            config.setdefault("report", {})["render_workers"] = 1
+            runnable.append((path, config))
+        except Exception as exc:
+            results[path] = _error(path, exc, t0)
+
+    groups = group_configs(runnable, workers)
+    if workers <= 1 or len(groups) <= 1:
+        for items in groups:
+            for entry in _run_group(items, metrics_only):
+                results[entry["config"]] = entry
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as pool:
+            futures = {pool.submit(_run_group, items, metrics_only): items for items in groups}
+            for future in as_completed(futures):
+                try:
+                    entries = future.result()
+                except Exception as exc:
+                    # e.g. a worker killed by the OS; only its own group is lost
+                    entries = [_error(path, exc, started) for path, _ in futures[future]]
+                for entry in entries:
+                    results[entry["config"]] = entry
+
+    ordered = [results[path] for path in paths if path in results]
+    index = {
+        "n_configs": len(ordered),
+        "n_ok": sum(entry["status"] == "ok" for entry in ordered),
+        "n_failed": sum(entry["status"] != "ok" for entry in ordered),
+        "n_input_groups": len({_input_key(config) for _, config in runnable}),
+        "workers": int(workers),
+        "seconds": time.perf_counter() - started,
+        "runs": ordered,
+    }
+    if index_path:
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(index_path, "w", encoding="utf-8") as fh:
+            json.dump(index, fh, indent=2)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many report configs in parallel")
+    parser.add_argument("configs", nargs="*", help="Config files or glob patterns")
+    parser.add_argument("--manifest", help="YAML list of config paths/globs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--index", default="batch_index.json", help="Where to write the combined index")
+    parser.add_argument("--metrics-only", action="store_true", help="Write metrics.json and summary.txt without rendering figures")
+    args = parser.parse_args()
+
+    paths = expand_configs(args.configs, args.manifest)
+    if not paths:
+        parser.error("no configs matched")
+    index = run_batch(paths, workers=args.workers, index_path=args.index, metrics_only=args.metrics_only)
+    print(f"{index['n_ok']}/{index['n_configs']} reports generated in {index['seconds']:.1f} s (index: {args.index})")
+    for entry in index["runs"]:
+        if entry["status"] != "ok":
+            print(f"  FAILED {entry['config']}: {entry['error']}")
+    sys.exit(1 if index["n_failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Append-only SQLite store of per-run metrics for run-to-run comparisons.
+
+Each report run adds one row to ``runs`` and one row per numeric metric to
+``metrics`` (clustered by run, for "previous run" lookups). For window queries
+every metric also has a daily rollup in ``metric_days``: one blob of
+(run_at, value) float64 pairs per trap, metric and UTC day. A 30-day median
+reads ~31 blobs per metric whatever the run cadence, and nothing outside the
+window is touched however many years or traps the file holds.
+"""
+
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_at REAL NOT NULL,
+    trap TEXT NOT NULL,
+    config_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_trap_time ON runs (trap, run_at);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS metric_days (
+    trap TEXT NOT NULL,
+    name TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    samples BLOB NOT NULL,
+    PRIMARY KEY (trap, name, day)
+) WITHOUT ROWID;
+"""
+_DAY = 86400.0
+
+
+@dataclass
+class MetricDelta:
+    """A metric's current value against the previous run and the trailing-window median."""
+
+    name: str
+    value: float
+    previous: float
+    median: float
+    n_window: int
+
+    @property
+    def delta_previous(self) -> float:
+        return self.value - self.previous
+
+    @property
+    def delta_median(self) -> float:
+        return self.value - self.median
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "value": self.value,
+            "previous": self.previous,
+            "delta_previous": self.delta_previous,
+            "median": self.median,
+            "delta_median": self.delta_median,
+            "n_window": self.n_window,
+        }
+
+
+def flatten_metrics(metrics: Dict) -> Dict[str, float]:
+    """Numeric entries of `metrics` as floats (NaN for non-finite values); others are dropped."""
+
+    out = {}
+    for name, value in metrics.items():
+        if isinstance(value, (bool, np.bool_, int, float, np.integer, np.floating)):
+            out[name] = float(value)
+    return out
+
+
+def _day(run_at: float) -> int:
+    return int(math.floor(run_at / _DAY))
+
+
+def _samples(blobs: Iterable[bytes]) -> np.ndarray:
+    """(n, 2) array of (run_at, value) from concatenated rollup blobs."""
+
+    data = b"".join(blobs)
+    return np.frombuffer(data, dtype="<f8").reshape(-1, 2)
+
+
+def _finite(value: float) -> Optional[float]:
+    return value if value is not None and math.isfinite(value) else None
+
+
+class MetricsHistory:
+    """
+    Metrics history backed by one SQLite file.
+
+    Parameters
+    ----------
+    path : str
+        Database file; created with its schema on first use.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"{path} uses history schema {version}; this version reads up to {SCHEMA_VERSION}")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            if version == 1:
+                self._rebuild_rollups()
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _rebuild_rollups(self):
+        # Files written before the rollups existed (schema 1)
+        self._conn.execute("DELETE FROM metric_days")
+        rows = self._conn.execute(
+            "SELECT r.trap, m.name, r.run_at, m.value FROM metrics m JOIN runs r ON r.id = m.run_id ORDER BY r.trap, m.name, r.run_at"
+        )
+        days: Dict[Tuple[str, str, int], List[Tuple[float, float]]] = {}
+        for trap, name, run_at, value in rows:
+            days.setdefault((trap, name, _day(run_at)), []).append((run_at, np.nan if value is None else value))
+        self._conn.executemany(
+            "INSERT INTO metric_days (trap, name, day, samples) VALUES (?, ?, ?, ?)",
+            [(*key, np.asarray(pairs, dtype="<f8").tobytes()) for key, pairs in days.items()],
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def record(self, metrics: Dict, trap: str = "default", config_hash: Optional[str] = None, run_at: Optional[float] = None) -> int:
+        """Append one run (epoch-seconds `run_at`, default now) and return its id."""
+
+        values = flatten_metrics(metrics)
+        run_at = time.time() if run_at is None else float(run_at)
+        day = _day(run_at)
+        with self._conn:
+            cur = self._conn.execute("INSERT INTO runs (run_at, trap, config_hash) VALUES (?, ?, ?)", (run_at, trap, config_hash))
+            run_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+                [(run_id, name, _finite(value)) for name, value in values.items()],
+            )
+            existing = dict(
+                self._conn.execute("SELECT name, samples FROM metric_days WHERE trap = ? AND day = ?", (trap, day)).fetchall()
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metric_days (trap, name, day, samples) VALUES (?, ?, ?, ?)",
+                [
+                    (trap, name, day, existing.get(name, b"") + np.array([run_at, value], dtype="<f8").tobytes())
+                    for name, value in values.items()
+                ],
+            )
+        return run_id
+
+    def runs(self, trap: str = "default", since: Optional[float] = None) -> List[Tuple[int, float, Optional[str]]]:
+        """(id, run_at, config_hash) for the trap's runs, oldest first."""
+
+        rows = self._conn.execute(
+            "SELECT id, run_at, config_hash FROM runs WHERE trap = ? AND run_at >= ? ORDER BY run_at, id",
+            (trap, -math.inf if since is None else float(since)),
+        )
+        return rows.fetchall()
+
+    def previous_run(self, trap: str = "default", before: Optional[float] = None) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT id FROM runs WHERE trap = ? AND run_at < ? ORDER BY run_at DESC, id DESC LIMIT 1",
+            (trap, math.inf if before is None else float(before)),
+        ).fetchone()
+        return row[0] if row else None
+
+    def run_metrics(self, run_id: int) -> Dict[str, float]:
+        rows = self._conn.execute("SELECT name, value FROM metrics WHERE run_id = ?", (run_id,))
+        return {name: (np.nan if value is None else value) for name, value in rows}
+
+    def series(self, name: str, trap: str = "default", since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Run times (epoch seconds) and values of one metric, oldest first."""
+
+        samples = self._window(name, trap, -math.inf if since is None else float(since), math.inf)
+        return samples[:, 0].copy(), samples[:, 1].copy()
+
+    def _window(self, name: str, trap: str, lo: float, hi: float, ordered: bool = True) -> np.ndarray:
+        """(run_at, value) pairs of one metric with lo <= run_at < hi, oldest first if `ordered`."""
+
+        day_lo = _day(lo) if math.isfinite(lo) else -(2**62)
+        day_hi = _day(hi) if math.isfinite(hi) else 2**62
+        blobs = self._conn.execute(
+            "SELECT samples FROM metric_days WHERE trap = ? AND name = ? AND day BETWEEN ? AND ? ORDER BY day",
+            (trap, name, day_lo, day_hi),
+        )
+        samples = _samples(row[0] for row in blobs)
+        samples = samples[(samples[:, 0] >= lo) & (samples[:, 0] < hi)]
+        return samples[np.argsort(samples[:, 0], kind="stable")] if ordered else samples
+
+    def compare(
+        self,
+        metrics: Dict,
+        trap: str = "default",
+        window_days: float = 30.0,
+        now: Optional[float] = None,
+        names: Optional[Iterable[str]] = None,
+    ) -> List[MetricDelta]:
+        """
+        Compare `metrics` with stored runs of `trap` that happened before `now`.
+
+        Returns one MetricDelta per metric (restricted to `names` if given) with
+        the previous run's value and the median over the last `window_days`;
+        both are NaN when there is no history for that metric.
+        """
+
+        now = time.time() if now is None else float(now)
+        values = flatten_metrics(metrics)
+        if names is not None:
+            values = {name: values[name] for name in names if name in values}
+        previous_id = self.previous_run(trap, before=now)
+        previous = self.run_metrics(previous_id) if previous_id is not None else {}
+
+        out = []
+        for name, value in values.items():
+            history = self._window(name, trap, now - window_days * _DAY, now, ordered=False)[:, 1]
+            history = history[~np.isnan(history)]
+            out.append(
+                MetricDelta(
+                    name=name,
+                    value=value,
+                    previous=previous.get(name, np.nan),
+                    median=float(np.median(history)) if history.size else np.nan,
+                    n_window=int(history.size),
+                )
+            )
+        return out
@@ -0,0 +1,253 @@
+"""
+Live metrics over a log that is still being written.
+
+`LiveMonitor` keeps running statistics, a Welch PSD, octave Allan deviations,
+a recursive AR(1) forecast and the quality rules up to date from appended rows
+only; `watch` tails the file and rewrites ``metrics.json`` / ``summary.txt``.
+Every update costs O(new rows), so latency does not grow with the hours of data
+already seen.
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .analysis.allan import AllanAccumulator
+from .analysis.forecast import ForecastResult, RecursiveAR1Forecaster
+from .processing.io import LogTail
+from .processing.metrics import QualityMonitor, RunningStats, WelchPSD
+from .reporting.report import write_summary_text
+
+STATS_COLUMNS = ["rb_fidelity", "rabi_freq", "lock_error", "temperature"]
+
+# Streaming stand-ins for `quality_flags`; its temperature check is a whole-log
+# mean of |diff|, approximated here as a sustained fraction of large steps.
+DEFAULT_RULES = [
+    {"name": "rb_fidelity_low", "column": "rb_fidelity", "op": "<", "threshold": 0.95, "fraction": 0.2, "message": "RB fidelity often < 0.95"},
+    {"name": "lock_error_excursion", "column": "lock_error", "transform": "abs", "op": ">", "threshold": 200, "fraction": 0.1, "message": "Lock error frequently > 200 Hz"},
+    {"name": "temperature_drift", "column": "temperature", "transform": "abs_diff", "op": ">", "threshold": 0.2, "window": 120, "fraction": 0.5, "message": "Temperature drifting"},
+]
+
+
+class LiveMonitor:
+    """
+    Incrementally updated lock-error metrics.
+
+    Parameters
+    ----------
+    steps_ahead, alert_threshold : int, float
+        Forecast horizon in samples and lock-error level that raises a lead-time alert.
+    segment_length, overlap : int, float
+        Welch PSD segmentation.
+    rules : list, optional
+        Quality rules (dicts or `QualityRule`); defaults to `DEFAULT_RULES`.
+    forgetting : float
+        RLS forgetting factor of the forecaster; 1 weighs all history equally.
+    """
+
+    def __init__(
+        self,
+        steps_ahead: int = 30,
+        alert_threshold: float = 200.0,
+        segment_length: int = 256,
+        overlap: float = 0.5,
+        rules: Optional[Sequence] = None,
+        forgetting: float = 1.0,
+    ):
+        self._settings = dict(
+            steps_ahead=steps_ahead,
+            alert_threshold=alert_threshold,
+            segment_length=segment_length,
+            overlap=overlap,
+            rules=rules,
+            forgetting=forgetting,
+        )
+        self.steps_ahead = int(steps_ahead)
+        self.alert_threshold = float(alert_threshold)
+        self.segment_length = int(segment_length)
+        self.overlap = float(overlap)
+        self.forgetting = float(forgetting)
+        self.quality = QualityMonitor(DEFAULT_RULES if rules is None else rules)
+        self.stats = {col: RunningStats() for col in STATS_COLUMNS}
+        self.n_samples = 0
+        self.last_timestamp = None
+        self.sample_period = None
+        self.forecast: Optional[ForecastResult] = None
+        self._pending: List[pd.DataFrame] = []
+        self._psd: Optional[WelchPSD] = None
+        self._allan: Optional[AllanAccumulator] = None
+        self._forecaster: Optional[RecursiveAR1Forecaster] = None
+
+    def reset(self):
+        """Forget everything seen so far (e.g. after the log was rotated)."""
+
+        self.__init__(**self._settings)
+
+    def update(self, df: pd.DataFrame) -> "LiveMonitor":
+        """Fold newly appended rows into every metric."""
+
+        if len(df) == 0:
+            return self
+        for col, acc in self.stats.items():
+            if col in df.columns:
+                acc.update(df[col].to_numpy(dtype=float))
+        self.quality.update(df)
+        self.n_samples += len(df)
+        self.last_timestamp = df["timestamp"].iloc[-1]
+
+        if self._forecaster is None:
+            # The sampling period (and so the PSD/ADEV axes) needs a few rows first
+            self._pending.append(df)
+            if sum(len(p) for p in self._pending) < 3:
+                return self
+            df = pd.concat(self._pending, ignore_index=True)
+            self._pending = []
+            dt = df["timestamp"].diff().dt.total_seconds().median()
+            self.sample_period = float(dt if dt and dt > 0 else 1.0)
+            y = df["lock_error"].to_numpy(dtype=float)
+            self._psd = WelchPSD(1.0 / self.sample_period, self.segment_length, self.overlap)
+            self._allan = AllanAccumulator(self.sample_period)
+            self._forecaster = RecursiveAR1Forecaster(self.sample_period, forgetting=self.forgetting).fit(y)
+        else:
+            y = df["lock_error"].to_numpy(dtype=float)
+            self._forecaster.update_many(y)
+        self._psd.update(y)
+        self._allan.update(y)
+        self.forecast = self._forecaster.forecast(self.steps_ahead, self.alert_threshold)
+        return self
+
+    @property
+    def lead_time_seconds(self) -> float:
+        return self.forecast.lead_time_seconds if self.forecast is not None else np.nan
+
+    def flags(self) -> List[str]:
+        flags = [alert.describe() for alert in self.quality.alerts()]
+        if not np.isnan(self.lead_time_seconds):
+            flags.append(f"Forecast crosses lock-error threshold in {self.lead_time_seconds/60:.1f} min")
+        return flags
+
+    def metrics(self) -> Dict:
+        out: Dict = {
+            "n_samples": self.n_samples,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+        }
+        for col, acc in self.stats.items():
+            summary = acc.as_dict()
+            out[f"{col}_mean"] = summary["mean"]
+            out[f"{col}_std"] = summary["std"]
+        if self._psd is not None and self._psd.n_segments:
+            _, psd = self._psd.result()
+            out["psd_noise_floor"] = float(np.median(psd[-10:]))
+        if self._allan is not None and self._allan.n_samples >= 2:
+            taus, adevs = self._allan.result()
+            out["allan_tau_seconds"] = float(taus[0])
+            out["allan_deviation"] = float(adevs[0])
+        if self.forecast is not None:
+            out.update(self.forecast.as_dict())
+        out["quality_alert_count"] = len(self.quality.alerts())
+        return out
+
+    def summary(self) -> str:
+        metrics = self.metrics()
+        entries = [
+            ("Samples", self.n_samples),
+            ("Last sample", metrics["last_timestamp"]),
+            ("RB fidelity mean", metrics["rb_fidelity_mean"]),
+            ("Lock error std (Hz)", metrics["lock_error_std"]),
+            ("Temperature mean", metrics["temperature_mean"]),
+        ]
+        if "allan_deviation" in metrics:
+            entries.append((f"Allan deviation tau={metrics['allan_tau_seconds']:.1f}s", metrics["allan_deviation"]))
+        if "psd_noise_floor" in metrics:
+            entries.append(("PSD noise floor (Hz^2/Hz)", metrics["psd_noise_floor"]))
+        if self.forecast is not None:
+            entries += [
+                ("Forecast MAE (Hz)", self.forecast.mae),
+                ("Lead time (min)", self.lead_time_seconds / 60.0),
+            ]
+        return write_summary_text(entries, self.flags(), title="Live Metric Summary")
+
+
+def monitor_from_config(config: Dict) -> LiveMonitor:
+    """Build a monitor from the report config's forecast, PSD and quality sections."""
+
+    analysis = config.get("analysis", {})
+    forecast_cfg = analysis.get("forecast", {})
+    psd_cfg = analysis.get("psd", {})
+    return LiveMonitor(
+        steps_ahead=int(forecast_cfg.get("horizon_steps", 30)),
+        alert_threshold=float(forecast_cfg.get("alert_threshold", 200)),
+        segment_length=int(psd_cfg.get("segment_length") or 256),
+        overlap=float(psd_cfg.get("overlap", 0.5)),
+        rules=config.get("quality", {}).get("rules"),
+        forgetting=float(config.get("watch", {}).get("forgetting", 1.0)),
+    )
+
+
+def _write_atomic(path: str, text: str):
+    # Readers polling the outputs never see a half-written file
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path) or ".")
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+def write_outputs(monitor: LiveMonitor, out_dir: str):
+    _write_atomic(os.path.join(out_dir, "metrics.json"), json.dumps(monitor.metrics(), indent=2))
+    _write_atomic(os.path.join(out_dir, "summary.txt"), monitor.summary())
+
+
+def watch(
+    path: str,
+    out_dir: str,
+    monitor: Optional[LiveMonitor] = None,
+    poll_interval: float = 0.25,
+    write_interval: float = 5.0,
+    duration: Optional[float] = None,
+    on_alert: Callable[[str], None] = print,
+) -> LiveMonitor:
+    """
+    Tail `path` and keep `monitor` and the outputs in `out_dir` current.
+
+    New rows are picked up every `poll_interval` seconds. ``metrics.json`` and
+    ``summary.txt`` are rewritten at most every `write_interval` seconds, and
+    immediately when the lead-time alert starts or clears (also reported through
+    `on_alert`). Runs until `duration` seconds have passed, or forever; the
+    outputs are written once more on the way out.
+    """
+
+    os.makedirs(out_dir, exist_ok=True)
+    monitor = monitor or LiveMonitor()
+    tail = LogTail(path)
+    started = time.monotonic()
+    last_write = -np.inf
+    alerting = False
+    try:
+        while True:
+            tick = time.monotonic()
+            rows = tail.read()
+            if tail.restarted:
+                monitor.reset()
+            monitor.update(rows)
+
+            now_alerting = not np.isnan(monitor.lead_time_seconds)
+            toggled = now_alerting != alerting
+            if toggled:
+                alerting = now_alerting
+                on_alert(monitor.flags()[-1] if alerting else "Lock-error forecast back below threshold")
+            if toggled or (len(rows) and tick - last_write >= write_interval):
+                write_outputs(monitor, out_dir)
+                last_write = tick
+
+            if duration is not None and tick - started >= duration:
+                return monitor
+            time.sleep(max(0.0, poll_interval - (time.monotonic() - tick)))
+    finally:
+        # Leave the outputs current when stopping (duration reached or Ctrl-C)
+        if monitor.n_samples:
+            write_outputs(monitor, out_dir)
@@ -0,0 +1,272 @@
+"""
+Stage graph with a keyed result cache.
+
+A stage's key hashes the config values it reads, the keys of the stages it
+depends on and the size/mtime of the input files it names, so a rerun only
+recomputes stages whose inputs changed. Keys are not content hashes: a file
+rewritten with the same size and mtime is not noticed, and neither is a change
+to a stage function's code, so bump `CACHE_VERSION` whenever a stage computes
+something different. Independent stages run concurrently on a thread pool (the
+analyses spend their time in NumPy).
+
+Entries from other configs sharing a cache directory are left alone; a stage's
+entries are only pruned once nothing has used them for `max_age_days`.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Bump when a stage function changes (code or meaning of its result); keys do not cover code.
+CACHE_VERSION = 2
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One step of the pipeline.
+
+    `func(config, **deps)` receives the config pruned to `config_keys` (dotted
+    paths, e.g. ``"analysis.psd"``) and the results of `deps` by stage name.
+    `inputs` are dotted config paths holding file names whose size and mtime
+    are part of the key. Stages with ``cache=False`` are never written to disk
+    and are recomputed whenever a dependent needs them (e.g. CSV loaders that
+    already have their own column cache).
+
+    The key does not include `func`'s code: bump `CACHE_VERSION` when it changes.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    config_keys: Tuple[str, ...] = ()
+    inputs: Tuple[str, ...] = ()
+    cache: bool = True
+
+
+def _lookup(config: Dict, dotted: str):
+    node = config
+    for part in dotted.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return _MISSING
+        node = node[part]
+    return node
+
+
+def select_config(config: Dict, keys: Iterable[str]) -> Dict:
+    """Return a nested copy of `config` holding only the dotted `keys` that are set."""
+
+    out: Dict = {}
+    for dotted in keys:
+        value = _lookup(config, dotted)
+        if value is _MISSING:
+            continue
+        parts = dotted.split(".")
+        node = out
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    return out
+
+
+def file_fingerprint(path: str) -> Dict:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {"path": os.path.abspath(path), "missing": True}
+    return {"path": os.path.abspath(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def combine_keys(*parts) -> str:
+    """Stable hex digest of JSON-serialisable parts."""
+
+    payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _topological(stages: Sequence[Stage]) -> List[Stage]:
+    by_name = {s.name: s for s in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Duplicate stage names")
+    order: List[Stage] = []
+    state: Dict[str, int] = {}
+
+    def visit(name, trail):
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Stage cycle: {' -> '.join(trail + [name])}")
+        if name not in by_name:
+            raise ValueError(f"Unknown stage dependency: {name}")
+        state[name] = 1
+        for dep in by_name[name].deps:
+            visit(dep, trail + [name])
+        state[name] = 2
+        order.append(by_name[name])
+
+    for stage in stages:
+        visit(stage.name, [])
+    return order
+
+
+class Pipeline:
+    """
+    Executes a stage graph for one config, loading unchanged results from `cache_dir`.
+
+    Parameters
+    ----------
+    stages : sequence of Stage
+        The graph; dependencies are referenced by name.
+    config : dict
+        Full configuration; each stage only sees (and is keyed on) its own keys.
+    cache_dir : str, optional
+        Where stage results are pickled. ``None`` disables the cache.
+    max_workers : int
+        Threads for independent stages; 1 runs stages in dependency order.
+    preloaded : dict, optional
+        Results supplied by the caller, used instead of running those stages.
+    max_age_days : float, optional
+        Cached results of a stage not written or loaded for this long are deleted
+        when the stage is next stored. ``None`` never prunes.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        config: Dict,
+        cache_dir: Optional[str] = None,
+        max_workers: int = 4,
+        preloaded: Optional[Dict[str, Any]] = None,
+        max_age_days: Optional[float] = 30.0,
+    ):
+        self.stages = {s.name: s for s in _topological(stages)}
+        self.config = config
+        self.cache_dir = cache_dir
+        self.max_workers = max(1, int(max_workers))
+        self.max_age_days = max_age_days
+        self.results: Dict[str, Any] = dict(preloaded or {})
+        self.computed: List[str] = []
+        self.loaded: List[str] = []
+        self._lock = threading.Lock()
+        self.keys: Dict[str, str] = {}
+        for name, stage in self.stages.items():
+            self.keys[name] = combine_keys(
+                CACHE_VERSION,
+                name,
+                select_config(config, stage.config_keys),
+                [self.keys[d] for d in stage.deps],
+                [file_fingerprint(str(v)) for v in (_lookup(config, k) for k in stage.inputs) if v is not _MISSING],
+            )
+
+    def _cache_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, f"{name}-{self.keys[name]}.pkl")
+
+    def _cached(self, name: str) -> bool:
+        return bool(self.cache_dir) and self.stages[name].cache and os.path.exists(self._cache_path(name))
+
+    def _load(self, name: str):
+        try:
+            with open(self._cache_path(name), "rb") as fh:
+                value = pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return _MISSING
+        try:
+            # The mtime records the last use, so entries in use are never pruned
+            os.utime(self._cache_path(name))
+        except OSError:
+            pass
+        return value
+
+    def _store(self, name: str, value):
+        if not self.cache_dir or not self.stages[name].cache:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.cache_dir)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._cache_path(name))
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            return
+        self._prune(name)
+
+    def _prune(self, name: str):
+        # Other entries of this stage may belong to other configs (or concurrent
+        # runs) sharing the directory, so only drop those unused for a while
+        if self.max_age_days is None:
+            return
+        cutoff = time.time() - float(self.max_age_days) * 86400.0
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{glob.escape(name)}-*.pkl")):
+            try:
+                if stale != self._cache_path(name) and os.path.getmtime(stale) < cutoff:
+                    os.unlink(stale)
+            except OSError:
+                pass
+
+    def _execute(self, name: str):
+        stage = self.stages[name]
+        deps = {d: self.results[d] for d in stage.deps}
+        value = stage.func(select_config(self.config, stage.config_keys), **deps)
+        self._store(name, value)
+        with self._lock:
+            self.results[name] = value
+            self.computed.append(name)
+        return value
+
+    def run(self, targets: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Make the results of `targets` (default: every stage) available and return them."""
+
+        targets = list(self.stages) if targets is None else list(targets)
+        to_run: List[str] = []
+        seen = set()
+
+        def plan(name):
+            if name in seen or name in self.results:
+                return
+            seen.add(name)
+            if self._cached(name):
+                value = self._load(name)
+                if value is not _MISSING:
+                    self.results[name] = value
+                    self.loaded.append(name)
+                    return
+            for dep in self.stages[name].deps:
+                plan(dep)
+            to_run.append(name)
+
+        for name in targets:
+            if name not in self.stages and name not in self.results:
+                raise ValueError(f"Unknown stage: {name}")
+            plan(name)
+
+        # `plan` appends dependencies first, so `to_run` is already topologically sorted
+        if self.max_workers == 1 or len(to_run) <= 1:
+            for name in to_run:
+                self._execute(name)
+        else:
+            pending = list(to_run)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                running = {}
+                while pending or running:
+                    for name in [n for n in pending if all(d in self.results for d in self.stages[n].deps)]:
+                        pending.remove(name)
+                        running[pool.submit(self._execute, name)] = name
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        del running[future]
+                        future.result()
+        return {name: self.results[name] for name in targets}
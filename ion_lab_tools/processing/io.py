@@ -1,8 +1,135 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
 import pandas as pd
 
 REQUIRED = ["timestamp","rb_fidelity","rabi_freq","lock_error","temperature"]
 
-def load_csv(path):
+# Bump when the on-disk layout of the column cache changes.
+CACHE_VERSION = 1
+_CACHE_SUFFIX = ".npcache"
+_HASH_BLOCK = 1 << 20
+
+
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_key(path):
+    st = os.stat(path)
+    return {"path": os.path.abspath(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def cache_dir_for(path, cache_root=None):
+    """Return the column-cache directory used for `path`."""
+    name = os.path.basename(path) + _CACHE_SUFFIX
+    if cache_root is None:
+        return os.path.join(os.path.dirname(os.path.abspath(path)), name)
+    digest = hashlib.blake2b(os.path.abspath(path).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(cache_root, f"{digest}-{name}")
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), "r", encoding="utf-8") as fh:
+            meta = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+
+def _valid_meta(path, cache_dir):
+    """Return cache metadata if it still describes `path`, else None.
+
+    A matching size/mtime is trusted directly; otherwise the source is hashed so
+    that touched-but-unchanged files keep their cache.
+    """
+    meta = _read_meta(cache_dir)
+    if meta is None:
+        return None
+    key = _source_key(path)
+    if meta["source"] == key:
+        return meta
+    if meta["source"]["size"] != key["size"] or meta["sha"] != _file_digest(path):
+        return None
+    meta["source"] = key
+    try:
+        with open(os.path.join(cache_dir, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+    except OSError:
+        pass
+    return meta
+
+
+def _write_cache(df, path, cache_dir, source_key):
+    """Store `df` as one .npy file per column; timestamps as sorted int64 ns."""
+    columns = {}
+    for col in df.columns:
+        if col == "timestamp":
+            continue
+        if not (pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col])):
+            return
+        columns[col] = df[col].to_numpy()
+    ts = df["timestamp"]
+    if not pd.api.types.is_datetime64_any_dtype(ts):
+        return
+    tz = str(ts.dt.tz) if ts.dt.tz is not None else None
+    if tz:
+        try:
+            ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+            pd.Timestamp(0).tz_localize("UTC").tz_convert(tz)
+        except (TypeError, ValueError):
+            return
+    columns["timestamp"] = ts.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+    meta = {
+        "version": CACHE_VERSION,
+        "source": source_key,
+        "sha": _file_digest(path),
+        "rows": int(len(df)),
+        "columns": list(df.columns),
+        "tz": tz,
+        "unit": df["timestamp"].dt.unit,
+    }
+    parent = os.path.dirname(cache_dir)
+    try:
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    except OSError:
+        return
+    try:
+        for col, values in columns.items():
+            np.save(os.path.join(tmp, f"{col}.npy"), values)
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.replace(tmp, cache_dir)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _read_cache(cache_dir, meta):
+    data = {}
+    for col in meta["columns"]:
+        values = np.load(os.path.join(cache_dir, f"{col}.npy"))
+        if col == "timestamp":
+            values = pd.to_datetime(values, unit="ns").as_unit(meta["unit"])
+            if meta["tz"]:
+                values = values.tz_localize("UTC").tz_convert(meta["tz"])
+        data[col] = values
+    return pd.DataFrame(data, columns=meta["columns"])
+
+
+def _parse_csv(path):
     df = pd.read_csv(path)
     missing = [c for c in REQUIRED if c not in df.columns]
     if missing:
@@ -10,3 +137,221 @@ def load_csv(path):
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df = df.sort_values('timestamp').reset_index(drop=True)
     return df
+
+
+def load_csv(path, cache=True, cache_root=None):
+    """Load a lab log, reusing a columnar sidecar cache when it is still valid.
+
+    The cache lives next to the CSV (``<name>.npcache/``) unless `cache_root` is
+    given, and is keyed on the source path, size, mtime and content hash.
+    """
+    if not cache:
+        return _parse_csv(path)
+
+    cache_dir = cache_dir_for(path, cache_root)
+    meta = _valid_meta(path, cache_dir)
+    if meta is not None:
+        try:
+            return _read_cache(cache_dir, meta)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    source_key = _source_key(path)
+    df = _parse_csv(path)
+    _write_cache(df, path, cache_dir, source_key)
+    return df
+
+
+# Compact on-disk dtypes used by `open_log` unless overridden per column.
+DEFAULT_DTYPES = {
+    "timestamp": np.int64,
+    "rb_fidelity": np.float32,
+    "rabi_freq": np.float64,
+    "lock_error": np.float64,
+    "temperature": np.float32,
+}
+_CONVERT_BLOCK = 1 << 22
+
+
+def _typed_column_path(cache_dir, col, dtype):
+    """Return a .npy file holding `col` as `dtype`, deriving it from the cache once.
+
+    Returns None when the cache directory cannot take the derived file (read-only
+    or full); the caller then converts the column in memory.
+    """
+    base = os.path.join(cache_dir, f"{col}.npy")
+    source = np.load(base, mmap_mode="r")
+    if source.dtype == dtype:
+        return base
+    path = os.path.join(cache_dir, f"{col}.{dtype.name}.npy")
+    if os.path.exists(path):
+        return path
+    try:
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".npy", dir=cache_dir)
+        os.close(fd)
+    except OSError:
+        return None
+    try:
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=source.shape)
+        for start in range(0, source.shape[0], _CONVERT_BLOCK):
+            out[start:start + _CONVERT_BLOCK] = source[start:start + _CONVERT_BLOCK]
+        out.flush()
+        del out
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        return None
+    return path
+
+
+class LogColumns:
+    """Lazily opened, read-only columns of a cached lab log.
+
+    Columns are memory-mapped on first access, so only the pages a pipeline
+    actually touches are read from disk. Timestamps are int64 epoch nanoseconds
+    unless a different dtype is requested.
+    """
+
+    def __init__(self, cache_dir, meta, columns, dtypes, frame=None):
+        self._cache_dir = cache_dir
+        self._meta = meta
+        self._dtypes = dtypes
+        self._frame = frame
+        self._arrays = {}
+        self.columns = list(columns)
+
+    def __len__(self):
+        return int(self._meta["rows"])
+
+    def __contains__(self, col):
+        return col in self.columns
+
+    def __getitem__(self, col):
+        if col not in self.columns:
+            raise KeyError(col)
+        if col not in self._arrays:
+            dtype = self._dtypes[col]
+            if self._frame is not None:
+                values = self._frame[col]
+                if col == "timestamp":
+                    values = values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+                self._arrays[col] = np.asarray(values).astype(dtype, copy=False)
+            else:
+                path = _typed_column_path(self._cache_dir, col, dtype)
+                if path is None:
+                    self._arrays[col] = np.load(os.path.join(self._cache_dir, f"{col}.npy")).astype(dtype, copy=False)
+                else:
+                    self._arrays[col] = np.load(path, mmap_mode="r")
+        return self._arrays[col]
+
+    def timestamps(self):
+        """Return the timestamp column as a DatetimeIndex."""
+        values = pd.to_datetime(np.asarray(self["timestamp"], dtype=np.int64), unit="ns")
+        tz = self._meta.get("tz")
+        return values.tz_localize("UTC").tz_convert(tz) if tz else values
+
+    def to_frame(self):
+        """Materialise the selected columns as a DataFrame."""
+        data = {}
+        for col in self.columns:
+            data[col] = self.timestamps() if col == "timestamp" else np.asarray(self[col])
+        return pd.DataFrame(data, columns=self.columns)
+
+
+def open_log(path, columns=None, dtypes=None, cache_root=None):
+    """Open a lab log as lazily memory-mapped columns.
+
+    Parameters
+    ----------
+    path : str
+        CSV log; its column cache is built on first use.
+    columns : list of str, optional
+        Columns to expose. Defaults to every column in the log.
+    dtypes : dict, optional
+        Per-column dtype overrides on top of `DEFAULT_DTYPES`. Columns not listed
+        in either keep the dtype they were cached with.
+    cache_root : str, optional
+        Directory for the column cache (defaults to next to the CSV).
+    """
+
+    cache_dir = cache_dir_for(path, cache_root)
+    meta = _valid_meta(path, cache_dir)
+    frame = None
+    if meta is None:
+        frame = load_csv(path, cache_root=cache_root)
+        meta = _valid_meta(path, cache_dir)
+        if meta is None:
+            # Cache directory not writable: serve the parsed frame instead.
+            meta = {"rows": len(frame), "columns": list(frame.columns), "tz": None}
+            if frame["timestamp"].dt.tz is not None:
+                meta["tz"] = str(frame["timestamp"].dt.tz)
+        else:
+            frame = None
+
+    selected = list(meta["columns"]) if columns is None else list(columns)
+    unknown = [c for c in selected if c not in meta["columns"]]
+    if unknown:
+        raise ValueError(f"Unknown columns: {unknown}")
+
+    overrides = {**DEFAULT_DTYPES, **(dtypes or {})}
+    resolved = {}
+    for col in selected:
+        if col in overrides:
+            resolved[col] = np.dtype(overrides[col])
+        elif frame is not None:
+            resolved[col] = frame[col].to_numpy().dtype
+        else:
+            resolved[col] = np.load(os.path.join(cache_dir, f"{col}.npy"), mmap_mode="r").dtype
+    return LogColumns(cache_dir, meta, selected, resolved, frame=frame)
+
+
+class LogTail:
+    """Reads the rows appended to a growing CSV log since the previous call.
+
+    The byte offset of the last complete line is remembered, so each `read()`
+    parses only new data; a trailing partial line is left for the next call. If
+    the file shrinks (truncated or rotated) reading starts over from its header
+    and `restarted` is set for that call.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+        self.rows = 0
+        self.columns = None
+        self.restarted = False
+
+    def _empty(self):
+        return pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "timestamp" else float) for c in self.columns or REQUIRED})
+
+    def read(self):
+        self.restarted = False
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return self._empty()
+        if size < self.offset:
+            self.offset, self.rows, self.columns, self.restarted = 0, 0, None, True
+        if size == self.offset:
+            return self._empty()
+        with open(self.path, "rb") as fh:
+            fh.seek(self.offset)
+            data = fh.read(size - self.offset)
+        end = data.rfind(b"\n")
+        if end < 0:
+            return self._empty()
+        data = data[:end + 1]
+        self.offset += end + 1
+        if self.columns is None:
+            header, _, data = data.partition(b"\n")
+            self.columns = header.decode("utf-8").strip().split(",")
+            missing = [c for c in REQUIRED if c not in self.columns]
+            if missing:
+                raise ValueError(f"Missing columns: {missing}")
+        if not data.strip():
+            return self._empty()
+        df = pd.read_csv(io.BytesIO(data), names=self.columns, header=None)
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        self.rows += len(df)
+        return df
@@ -1,3 +1,6 @@
+from dataclasses import dataclass
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
@@ -9,7 +12,10 @@ def basic_stats(series: pd.Series):
         "max": float(series.max())
     }
 
-def compute_psd(y, fs_hz):
+def compute_psd(y, fs_hz, segment_length=None, overlap=0.5):
+    if segment_length:
+        # Welch estimate: averaged, overlapping Hann-windowed segments
+        return welch_psd([y], fs_hz, min(int(segment_length), len(y)), overlap)
     # Periodogram (simple PSD estimate)
     y = np.asarray(y) - np.mean(y)
     n = len(y)
@@ -19,6 +25,59 @@ def compute_psd(y, fs_hz):
     freqs = np.fft.rfftfreq(n, d=1.0/fs_hz)
     return freqs, psd
 
+class WelchPSD:
+    """Segment-averaged PSD fed chunk by chunk; memory is bounded by the segment size.
+
+    Uses the same Hann window and normalisation as the periodogram in `compute_psd`,
+    with each segment's mean removed.
+    """
+
+    _BLOCK_SAMPLES = 1 << 20
+
+    def __init__(self, fs_hz, segment_length, overlap=0.5):
+        segment_length = int(segment_length)
+        if segment_length < 2:
+            raise ValueError("segment_length must be at least 2")
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError("overlap must be in [0, 1)")
+        self.fs_hz = float(fs_hz)
+        self.segment_length = segment_length
+        self.step = max(1, segment_length - int(round(overlap * segment_length)))
+        self.n_segments = 0
+        self._window = np.hanning(segment_length)
+        self._power = np.zeros(segment_length // 2 + 1)
+        self._buffer = np.empty(0)
+
+    def update(self, chunk):
+        buf = np.concatenate((self._buffer, np.asarray(chunk, dtype=float).ravel()))
+        L = self.segment_length
+        n_seg = (buf.size - L) // self.step + 1 if buf.size >= L else 0
+        if n_seg:
+            segments = np.lib.stride_tricks.sliding_window_view(buf, L)[:: self.step][:n_seg]
+            block = max(1, self._BLOCK_SAMPLES // L)
+            for start in range(0, n_seg, block):
+                seg = segments[start:start + block]
+                seg = (seg - seg.mean(axis=1, keepdims=True)) * self._window
+                self._power += np.sum(np.abs(np.fft.rfft(seg, axis=1)) ** 2, axis=0)
+            self.n_segments += n_seg
+        self._buffer = buf[n_seg * self.step:].copy()
+        return self
+
+    def result(self):
+        if not self.n_segments:
+            raise ValueError("Not enough samples for a single PSD segment")
+        psd = self._power / (self.n_segments * np.sum(self._window**2) * self.fs_hz)
+        freqs = np.fft.rfftfreq(self.segment_length, d=1.0/self.fs_hz)
+        return freqs, psd
+
+
+def welch_psd(chunks, fs_hz, segment_length, overlap=0.5):
+    acc = WelchPSD(fs_hz, segment_length, overlap)
+    for chunk in chunks:
+        acc.update(chunk)
+    return acc.result()
+
+
 def quality_flags(df):
     flags = []
     if (df['rb_fidelity'] < 0.95).mean() > 0.2:
@@ -28,3 +87,322 @@ def quality_flags(df):
     if df['temperature'].diff().abs().mean() > 0.2:
         flags.append("Temperature drifting")
     return flags
+
+
+_TRANSFORMS = {
+    "none": lambda x: x,
+    "abs": np.abs,
+    "diff": lambda x: np.concatenate(([np.nan], np.diff(x))),
+    "abs_diff": lambda x: np.concatenate(([np.nan], np.abs(np.diff(x)))),
+}
+_OPS = {">": (1.0, True), ">=": (1.0, False), "<": (-1.0, True), "<=": (-1.0, False)}
+
+
+@dataclass
+class QualityRule:
+    """Alert when more than `fraction` of a trailing `window` violates `column op threshold`.
+
+    `window` is in samples; None evaluates the whole log at once (like `quality_flags`).
+    A window longer than the log is treated the same way: until the log has grown
+    to `window` samples the rule raises at most one alert spanning the whole log.
+    `transform` is applied to the column first: none, abs, diff or abs_diff.
+    """
+
+    name: str
+    column: str
+    op: str
+    threshold: float
+    fraction: float
+    window: Optional[int] = None
+    transform: str = "none"
+    message: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, spec):
+        rule = cls(**spec)
+        if rule.op not in _OPS:
+            raise ValueError(f"Unknown comparison '{rule.op}' in rule {rule.name}")
+        if rule.transform not in _TRANSFORMS:
+            raise ValueError(f"Unknown transform '{rule.transform}' in rule {rule.name}")
+        return rule
+
+
+@dataclass
+class QualityAlert:
+    rule: str
+    message: str
+    start: pd.Timestamp
+    end: pd.Timestamp
+    start_index: int
+    end_index: int
+    peak_fraction: float
+
+    def describe(self):
+        return f"{self.message} ({self.start:%Y-%m-%d %H:%M:%S} to {self.end:%Y-%m-%d %H:%M:%S}, peak {self.peak_fraction:.0%})"
+
+    def as_dict(self):
+        return {
+            "rule": self.rule,
+            "message": self.message,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "start_index": int(self.start_index),
+            "end_index": int(self.end_index),
+            "peak_fraction": float(self.peak_fraction),
+        }
+
+
+def _rule_message(rule):
+    return rule.message or f"{rule.column} {rule.op} {rule.threshold:g} in >{rule.fraction:.0%} of window"
+
+
+def _window_runs(values, rules, w, n, block_size):
+    """Alert runs [first, last, peak] per rule for rules sharing one window of `w` < n samples."""
+    signs = np.array([_OPS[r.op][0] for r in rules])[:, None]
+    strict = np.array([_OPS[r.op][1] for r in rules])[:, None]
+    limits = signs * np.array([r.threshold for r in rules], dtype=float)[:, None]
+    fractions = np.array([r.fraction for r in rules], dtype=float)[:, None]
+
+    runs = [[] for _ in rules]
+    open_run = [None] * len(rules)
+    for b0 in range(0, n, block_size):
+        b1 = min(b0 + block_size, n)
+        lo = max(0, b0 - w)
+        stacked = signs * np.stack([v[lo:b1] for v in values])
+        bad = np.where(strict, stacked > limits, stacked >= limits)
+        counts = np.zeros((len(rules), b1 - lo + 1), dtype=np.int64)
+        np.cumsum(bad, axis=1, out=counts[:, 1:])
+
+        idx = np.arange(b0, b1)
+        upper = idx - lo + 1
+        frac = (counts[:, upper] - counts[:, np.maximum(upper - w, 0)]) / w
+        alert = (frac > fractions) & (idx[None, :] + 1 >= w)
+
+        for r in np.flatnonzero(alert.any(axis=1) | np.array([run is not None for run in open_run])):
+            edges = np.diff(np.concatenate(([0], alert[r].astype(np.int8), [0])))
+            starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+            if open_run[r] is not None and (starts.size == 0 or starts[0] != 0):
+                runs[r].append(open_run[r])
+                open_run[r] = None
+            for s, e in zip(starts, stops):
+                peak = float(frac[r, s:e].max())
+                if s == 0 and open_run[r] is not None:
+                    run = open_run[r]
+                    run[1], run[2] = b0 + e - 1, max(run[2], peak)
+                else:
+                    run = [b0 + s, b0 + e - 1, peak]
+                if e == b1 - b0 and b1 < n:
+                    open_run[r] = run
+                else:
+                    runs[r].append(run)
+                    open_run[r] = None
+    return runs
+
+
+def evaluate_quality_rules(df, rules, block_size=1 << 20):
+    """Evaluate all rules together and return time-localised alert intervals.
+
+    Rules sharing a window length are stacked into one (rules x samples) array per
+    block, re-reading only that window's lookback; violation counts over each
+    trailing window come from one cumulative sum along time. Whole-log rules, and
+    windows at least as long as the log (which evaluate the whole log, see
+    `QualityRule`), reduce to a single count, so mixing them
+    with windowed rules keeps the cost O(rules x n). An alert interval spans from
+    the start of the first violating window to the end of the last one.
+    """
+    rules = [r if isinstance(r, QualityRule) else QualityRule.from_dict(r) for r in rules]
+    n = len(df)
+    if not rules or n == 0:
+        return []
+    columns = {}
+    for r in rules:
+        key = (r.column, r.transform)
+        if key not in columns:
+            columns[key] = _TRANSFORMS[r.transform](df[r.column].to_numpy(dtype=float))
+
+    windows = [min(r.window or n, n) for r in rules]
+    runs = [[] for _ in rules]
+    groups = {}
+    for i, w in enumerate(windows):
+        if w >= n:
+            # Only the last sample has a full window: one count over the whole log
+            sign, strict = _OPS[rules[i].op]
+            values = sign * columns[(rules[i].column, rules[i].transform)]
+            limit = sign * rules[i].threshold
+            frac = np.count_nonzero(values > limit if strict else values >= limit) / n
+            if frac > rules[i].fraction:
+                runs[i].append([n - 1, n - 1, float(frac)])
+        else:
+            groups.setdefault(w, []).append(i)
+    for w, members in groups.items():
+        group_rules = [rules[i] for i in members]
+        values = [columns[(r.column, r.transform)] for r in group_rules]
+        for i, rule_runs in zip(members, _window_runs(values, group_rules, w, n, block_size)):
+            runs[i] = rule_runs
+
+    ts = df["timestamp"]
+    alerts = []
+    for rule, w, rule_runs in zip(rules, windows, runs):
+        for first, last, peak in rule_runs:
+            start = max(0, first - w + 1)
+            alerts.append(
+                QualityAlert(
+                    rule=rule.name,
+                    message=_rule_message(rule),
+                    start=ts.iloc[start],
+                    end=ts.iloc[last],
+                    start_index=int(start),
+                    end_index=int(last),
+                    peak_fraction=peak,
+                )
+            )
+    alerts.sort(key=lambda a: (a.start_index, a.rule))
+    return alerts
+
+
+class RunningStats:
+    """Mean, sample std, min and max of a column fed chunk by chunk (NaNs skipped, like `basic_stats`)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, chunk):
+        x = np.asarray(chunk, dtype=float).ravel()
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return self
+        # Chan et al. merge of the chunk's moments into the running ones
+        n, mean = x.size, float(x.mean())
+        m2 = float(np.sum((x - mean) ** 2))
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta**2 * self.n * n / total
+        self.n = total
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        return self
+
+    def as_dict(self):
+        return {
+            "mean": self.mean if self.n else np.nan,
+            "std": float(np.sqrt(self._m2 / (self.n - 1))) if self.n > 1 else np.nan,
+            "min": self.min if self.n else np.nan,
+            "max": self.max if self.n else np.nan,
+        }
+
+
+class QualityMonitor:
+    """Streaming counterpart of `evaluate_quality_rules` for a log that keeps growing.
+
+    Only each rule's trailing window of violation flags (and the last raw value for
+    diff transforms) is kept, so a chunk costs O(len(chunk) + window) however long
+    the log is. `alerts()` returns what `evaluate_quality_rules` would on every row
+    fed so far; the last interval of a rule stays open while it keeps violating.
+    """
+
+    def __init__(self, rules):
+        self.rules = [r if isinstance(r, QualityRule) else QualityRule.from_dict(r) for r in rules]
+        self.n_samples = 0
+        self._last = {}
+        self._flags = [np.zeros(0, dtype=bool) for _ in self.rules]
+        self._bad = np.zeros(len(self.rules), dtype=np.int64)
+        self._lookback = max([r.window for r in self.rules if r.window] or [1])
+        self._ts = pd.Series([], dtype="datetime64[ns]")
+        self._first_ts = None
+        self._open = [None] * len(self.rules)  # [first alert index, last alert index, peak fraction, start timestamp]
+        self._closed = []
+
+    def _values(self, df, rule):
+        x = df[rule.column].to_numpy(dtype=float)
+        if rule.transform in ("diff", "abs_diff"):
+            x = np.diff(np.concatenate(([self._last.get(rule.column, np.nan)], x)))
+            if rule.transform == "abs_diff":
+                x = np.abs(x)
+        elif rule.transform == "abs":
+            x = np.abs(x)
+        sign, strict = _OPS[rule.op]
+        limit = sign * rule.threshold
+        return sign * x > limit if strict else sign * x >= limit
+
+    def update(self, df):
+        m = len(df)
+        if m == 0:
+            return self
+        n0 = self.n_samples
+        ts = pd.concat([self._ts, df["timestamp"]], ignore_index=True) if len(self._ts) else df["timestamp"].reset_index(drop=True)
+        ts_base = n0 - len(self._ts)
+        if self._first_ts is None:
+            self._first_ts = ts.iloc[0]
+
+        for r, rule in enumerate(self.rules):
+            bad = self._values(df, rule)
+            if not rule.window:
+                self._bad[r] += int(bad.sum())
+                continue
+            w = int(rule.window)
+            tail = self._flags[r]
+            combined = np.concatenate((tail, bad))
+            counts = np.zeros(combined.size + 1, dtype=np.int64)
+            np.cumsum(combined, out=counts[1:])
+            upper = np.arange(tail.size, combined.size) + 1
+            frac = (counts[upper] - counts[np.maximum(upper - w, 0)]) / w
+            alert = (frac > rule.fraction) & (np.arange(n0, n0 + m) + 1 >= w)
+            self._flags[r] = combined[-w:]
+
+            edges = np.diff(np.concatenate(([0], alert.astype(np.int8), [0])))
+            starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+            if self._open[r] is not None and (starts.size == 0 or starts[0] != 0):
+                self._closed.append(self._alert(rule, self._open[r], ts, ts_base))
+                self._open[r] = None
+            for s, e in zip(starts, stops):
+                peak = float(frac[s:e].max())
+                if s == 0 and self._open[r] is not None:
+                    run = self._open[r]
+                    run[1], run[2] = n0 + e - 1, max(run[2], peak)
+                else:
+                    start = max(0, n0 + s - w + 1)
+                    run = [n0 + s, n0 + e - 1, peak, ts.iloc[start - ts_base]]
+                if e == m:
+                    self._open[r] = run
+                else:
+                    self._closed.append(self._alert(rule, run, ts, ts_base))
+                    self._open[r] = None
+
+        for rule in self.rules:
+            self._last[rule.column] = float(df[rule.column].iloc[-1])
+        self.n_samples += m
+        self._ts = ts.iloc[-self._lookback:].reset_index(drop=True)
+        return self
+
+    def _alert(self, rule, run, ts, ts_base):
+        first, last, peak, start_ts = run
+        return QualityAlert(
+            rule=rule.name,
+            message=_rule_message(rule),
+            start=start_ts,
+            end=ts.iloc[last - ts_base],
+            start_index=int(max(0, first - int(rule.window) + 1)),
+            end_index=int(last),
+            peak_fraction=peak,
+        )
+
+    def alerts(self):
+        """Closed intervals plus the ones still open at the latest sample."""
+        n = self.n_samples
+        out = list(self._closed)
+        for r, rule in enumerate(self.rules):
+            if self._open[r] is not None:
+                out.append(self._alert(rule, self._open[r], self._ts, n - len(self._ts)))
+                continue
+            # Whole-log rules, and windowed ones before a full window, cover everything so far
+            if n and (not rule.window or n < rule.window):
+                frac = (self._bad[r] if not rule.window else int(self._flags[r].sum())) / n
+                if frac > rule.fraction:
+                    out.append(QualityAlert(rule.name, _rule_message(rule), self._first_ts, self._ts.iloc[-1], 0, n - 1, float(frac)))
+        out.sort(key=lambda a: (a.start_index, a.rule))
+        return out
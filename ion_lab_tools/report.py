@@ -8,33 +8,29 @@ Example:
 import argparse
 import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
-import yaml
 
-from .analysis.allan import allan_deviation
-from .analysis.bo import compare_methods
-from .analysis.forecast import ar1_forecast
-from .analysis.rb import fit_rb_decay
+from .analysis.allan import stability_deviations
+from .analysis.bo import compare_methods_sweep
+from .analysis.crosscorr import cross_channel_analysis
+from .analysis.forecast import ar1_forecast, arp_forecast, fit_ar, rolling_origin_backtest
+from .analysis.multichannel import analyze_channels
+from .analysis.rb import bootstrap_rb_ci, fit_rb_decay
 from .analysis.robustness import (
-    evaluate_downsample_robustness,
+    decimation_robustness,
     evaluate_noise_robustness,
+    noise_robustness_sweep,
     summarize_robustness,
 )
+from .analysis.stability_map import stability_map
+from .history import MetricsHistory
+from .pipeline import Pipeline, Stage, combine_keys, file_fingerprint
 from .processing.io import load_csv
-from .processing.metrics import basic_stats, compute_psd, quality_flags
-from .reporting.make_plots import (
-    allan_plot,
-    bo_comparison_plot,
-    forecast_plot,
-    psd_plot,
-    rb_fit_plot,
-    robustness_plot,
-    timeseries_plot,
-)
-from .reporting.report import compile_pdf, save_text_as_figure, write_summary_text
+from .processing.metrics import basic_stats, compute_psd, evaluate_quality_rules, quality_flags
+from .reporting.report import write_summary_text
 
 
 def _ensure_out(path: str):
@@ -42,148 +38,567 @@ def _ensure_out(path: str):
 
 
 def _load_config(path: str) -> Dict:
+    import yaml
+
     with open(path, "r", encoding="utf-8") as fh:
         return yaml.safe_load(fh)
 
 
-def generate_from_config(config: Dict) -> Dict[str, str]:
-    output = config.get("output_dir", "out")
-    _ensure_out(output)
+# --- stages ---
+# Each stage reads only the config keys it declares; see `ion_lab_tools.pipeline`.
+
+
+def _forecast_settings(config: Dict):
+    forecast_cfg = config.get("analysis", {}).get("forecast", {})
+    return int(forecast_cfg.get("horizon_steps", 30)), float(forecast_cfg.get("alert_threshold", 200))
+
+
+def _stage_log(config):
+    return load_csv(config["inputs"]["log"], cache=config["inputs"].get("cache", True))
 
-    log_df = load_csv(config["inputs"]["log"])
-    rb_df = pd.read_csv(config["inputs"]["rb"])
-    bo_df = pd.read_csv(config["inputs"]["bo"])
 
-    dt = (log_df["timestamp"].diff().dt.total_seconds()).median()
-    sample_period = float(dt if dt and dt > 0 else 1.0)
-    fs = 1.0 / sample_period
+def _stage_rb_data(config):
+    return pd.read_csv(config["inputs"]["rb"])
 
-    stats = {
-        "rb_fidelity_mean": basic_stats(log_df["rb_fidelity"])["mean"],
-        "lock_error_std": basic_stats(log_df["lock_error"])["std"],
+
+def _stage_bo_data(config):
+    return pd.read_csv(config["inputs"]["bo"])
+
+
+def _stage_sampling(config, log):
+    dt = (log["timestamp"].diff().dt.total_seconds()).median()
+    return float(dt if dt and dt > 0 else 1.0)
+
+
+def _stage_stats(config, log):
+    return {
+        "rb_fidelity_mean": basic_stats(log["rb_fidelity"])["mean"],
+        "lock_error_std": basic_stats(log["lock_error"])["std"],
     }
 
-    freqs, psd_vals = compute_psd(log_df["lock_error"].to_numpy(), fs)
-    psd_noise_floor = float(np.median(psd_vals[-10:])) if psd_vals.size >= 10 else float(np.median(psd_vals))
 
-    taus, adevs = allan_deviation(log_df["lock_error"].to_numpy(), sample_period)
+def _stage_psd(config, log, sampling):
+    psd_cfg = config.get("analysis", {}).get("psd", {})
+    freqs, psd_vals = compute_psd(
+        log["lock_error"].to_numpy(),
+        1.0 / sampling,
+        segment_length=psd_cfg.get("segment_length"),
+        overlap=float(psd_cfg.get("overlap", 0.5)),
+    )
+    noise_floor = float(np.median(psd_vals[-10:])) if psd_vals.size >= 10 else float(np.median(psd_vals))
+    return {"freqs": freqs, "psd": psd_vals, "noise_floor": noise_floor}
+
+
+def _stage_stability(config, log, sampling):
+    return stability_deviations(log["lock_error"].to_numpy(), sampling)
 
-    m, rb_fit_y, rb_result = fit_rb_decay(rb_df)
 
+def _stage_stability_map(config, log, sampling):
+    map_cfg = config.get("analysis", {}).get("stability_map", {})
+    map_window = min(int(map_cfg.get("window_length", 256)), len(log))
+    return stability_map(log["lock_error"].to_numpy(), sampling, map_window, map_cfg.get("step"))
+
+
+def _stage_rb(config, rb_data):
+    m, fit_y, result = fit_rb_decay(rb_data)
+    rb_cfg = config.get("analysis", {}).get("rb", {})
+    bootstrap = None
+    if int(rb_cfg.get("bootstrap_samples", 0)) > 0:
+        bootstrap = bootstrap_rb_ci(
+            rb_data,
+            n_boot=int(rb_cfg["bootstrap_samples"]),
+            method=rb_cfg.get("bootstrap_method", "residual"),
+            seed=int(rb_cfg.get("seed", 0)),
+            n_jobs=int(rb_cfg.get("n_jobs", 1)),
+        )
+    fidelity = rb_data.sort_values("sequence_length")["fidelity"].to_numpy()
+    return {"m": m, "fit_y": fit_y, "fidelity": fidelity, "result": result, "bootstrap": bootstrap}
+
+
+def _stage_ar_model(config, log):
+    # The AR(p) fit shared by the forecast and its backtest; None selects AR(1)
+    forecast_cfg = config.get("analysis", {}).get("forecast", {})
+    forecast_model = forecast_cfg.get("model", "ar1")
+    if forecast_model == "ar1":
+        return None
+    if forecast_model == "arp":
+        return fit_ar(log["lock_error"], int(forecast_cfg.get("max_order", 20)), forecast_cfg.get("criterion", "aic"))
+    raise ValueError(f"Unknown forecast model: {forecast_model}")
+
+
+def _stage_forecast(config, log, sampling, ar_model):
+    steps_ahead, alert_threshold = _forecast_settings(config)
+    if ar_model is None:
+        return ar1_forecast(log["lock_error"], sampling, steps_ahead, alert_threshold)
+    return arp_forecast(log["lock_error"], sampling, steps_ahead, alert_threshold, model=ar_model)
+
+
+def _stage_backtest(config, log, sampling):
+    # Refits the forecast's model (AR(1), or AR(p) with its order search) at every origin
     forecast_cfg = config.get("analysis", {}).get("forecast", {})
-    steps_ahead = int(forecast_cfg.get("horizon_steps", 30))
-    alert_threshold = float(forecast_cfg.get("alert_threshold", 200))
-    forecast_result = ar1_forecast(log_df["lock_error"], sample_period, steps_ahead, alert_threshold)
+    steps_ahead, _ = _forecast_settings(config)
+    arp = forecast_cfg.get("model", "ar1") == "arp"
+    return rolling_origin_backtest(
+        log["lock_error"],
+        sampling,
+        steps_ahead,
+        window=forecast_cfg.get("backtest_window"),
+        max_origins=forecast_cfg.get("backtest_origins", 5000),
+        max_order=int(forecast_cfg.get("max_order", 20)) if arp else None,
+        criterion=forecast_cfg.get("criterion", "aic"),
+    )
+
+
+def _stage_channels(config, log, sampling):
+    channel_names = config.get("analysis", {}).get("channels")
+    if not channel_names:
+        return None
+    psd_cfg = config.get("analysis", {}).get("psd", {})
+    steps_ahead, alert_threshold = _forecast_settings(config)
+    return analyze_channels(
+        log,
+        channel_names,
+        sampling,
+        segment_length=psd_cfg.get("segment_length"),
+        overlap=float(psd_cfg.get("overlap", 0.5)),
+        steps_ahead=steps_ahead,
+        alert_thresholds={"lock_error": alert_threshold},
+    )
+
+
+def _stage_crosscorr(config, log, sampling):
+    xcorr_cfg = config.get("analysis", {}).get("crosscorr")
+    if xcorr_cfg is None:
+        return None
+    return cross_channel_analysis(
+        log,
+        xcorr_cfg.get("channels") or config.get("analysis", {}).get("channels") or ["lock_error", "rabi_freq", "temperature"],
+        sampling,
+        max_lag=xcorr_cfg.get("max_lag"),
+        segment_length=int(xcorr_cfg.get("segment_length", 256)),
+        overlap=float(xcorr_cfg.get("overlap", 0.5)),
+    )
+
 
+def _stage_robustness(config, log, sampling):
     robustness_cfg = config.get("analysis", {}).get("robustness", {})
+    steps_ahead, _ = _forecast_settings(config)
     noise_levels = np.asarray(robustness_cfg.get("noise_levels", [0.0, 30.0, 60.0]), dtype=float)
     downsample_factors = np.asarray(robustness_cfg.get("downsample_factors", [1, 2, 4]), dtype=int)
-    noise_x, noise_ratio = evaluate_noise_robustness(log_df["lock_error"], noise_levels)
-    ds_x, ds_drift = evaluate_downsample_robustness(log_df["lock_error"], downsample_factors)
-    robustness_result = summarize_robustness(noise_x, noise_ratio, ds_x, ds_drift)
-
-    bo_comparison = compare_methods(bo_df)
+    noise_trials = int(robustness_cfg.get("trials", 1))
+    noise_band = sweep = None
+    if noise_trials > 1:
+        sweep = noise_robustness_sweep(
+            log["lock_error"], noise_levels, n_trials=noise_trials, steps_ahead=steps_ahead, seed=int(robustness_cfg.get("seed", 0))
+        )
+        noise_x = sweep.levels
+        noise_ratio, band_lo, band_hi = sweep.band("std_ratio")
+        noise_band = (band_lo, band_hi)
+    else:
+        noise_x, noise_ratio = evaluate_noise_robustness(log["lock_error"], noise_levels)
+    decimation = decimation_robustness(log["lock_error"], downsample_factors, sampling)
+    return {
+        "noise_x": noise_x,
+        "noise_ratio": noise_ratio,
+        "noise_band": noise_band,
+        "noise_sweep": sweep,
+        "decimation": decimation,
+        "summary": summarize_robustness(noise_x, noise_ratio, decimation.factors, decimation.mean_drift),
+    }
 
-    flags = quality_flags(log_df)
-    if not np.isnan(forecast_result.lead_time_seconds):
-        flags.append(f"Forecast crosses lock-error threshold in {forecast_result.lead_time_seconds/60:.1f} min")
 
-    # --- plots ---
-    paths: Dict[str, str] = {}
-    paths["timeseries"] = os.path.join(output, "timeseries.png")
-    timeseries_plot(log_df, paths["timeseries"])
-
-    paths["psd"] = os.path.join(output, "psd.png")
-    psd_plot(freqs, psd_vals, paths["psd"])
-
-    paths["rb_fit"] = os.path.join(output, "rb_fit.png")
-    rb_fit_plot(
-        m,
-        rb_df.sort_values("sequence_length")["fidelity"].to_numpy(),
-        rb_fit_y,
-        rb_result.ci_half_width,
-        paths["rb_fit"],
+def _stage_bo(config, bo_data):
+    bo_cfg = config.get("analysis", {}).get("bo", {})
+    return compare_methods_sweep(
+        bo_data,
+        run_col=bo_cfg.get("run_col"),
+        n_boot=int(bo_cfg.get("bootstrap_samples", 1000)),
+        seed=int(bo_cfg.get("seed", 0)),
     )
 
-    paths["allan"] = os.path.join(output, "allan.png")
-    allan_plot(taus, adevs, paths["allan"])
-
-    paths["forecast"] = os.path.join(output, "forecast.png")
-    forecast_plot(
-        log_df["timestamp"],
-        log_df["lock_error"],
-        forecast_result.forecast,
-        sample_period,
-        paths["forecast"],
-        alert_threshold,
-    )
 
-    paths["bo_comparison"] = os.path.join(output, "bo_comparison.png")
-    bo_comparison_plot(bo_df, paths["bo_comparison"])
+def _stage_quality(config, log):
+    quality_rules = config.get("quality", {}).get("rules")
+    if quality_rules:
+        alerts = evaluate_quality_rules(log, quality_rules)
+        return {"alerts": alerts, "flags": [alert.describe() for alert in alerts]}
+    return {"alerts": None, "flags": quality_flags(log)}
+
+
+_FORECAST_KEYS = ("analysis.forecast.horizon_steps", "analysis.forecast.alert_threshold")
+
+STAGES = [
+    Stage("log", _stage_log, config_keys=("inputs.log", "inputs.cache"), inputs=("inputs.log",), cache=False),
+    Stage("rb_data", _stage_rb_data, config_keys=("inputs.rb",), inputs=("inputs.rb",), cache=False),
+    Stage("bo_data", _stage_bo_data, config_keys=("inputs.bo",), inputs=("inputs.bo",), cache=False),
+    Stage("sampling", _stage_sampling, deps=("log",)),
+    Stage("stats", _stage_stats, deps=("log",)),
+    Stage("psd", _stage_psd, deps=("log", "sampling"), config_keys=("analysis.psd",)),
+    Stage("stability", _stage_stability, deps=("log", "sampling")),
+    Stage("stability_map", _stage_stability_map, deps=("log", "sampling"), config_keys=("analysis.stability_map",)),
+    Stage("rb", _stage_rb, deps=("rb_data",), config_keys=("analysis.rb",)),
+    Stage(
+        "ar_model",
+        _stage_ar_model,
+        deps=("log",),
+        config_keys=("analysis.forecast.model", "analysis.forecast.max_order", "analysis.forecast.criterion"),
+    ),
+    Stage("forecast", _stage_forecast, deps=("log", "sampling", "ar_model"), config_keys=_FORECAST_KEYS),
+    Stage(
+        "backtest",
+        _stage_backtest,
+        deps=("log", "sampling"),
+        config_keys=(
+            "analysis.forecast.model",
+            "analysis.forecast.max_order",
+            "analysis.forecast.criterion",
+            "analysis.forecast.horizon_steps",
+            "analysis.forecast.backtest_window",
+            "analysis.forecast.backtest_origins",
+        ),
+    ),
+    Stage("channels", _stage_channels, deps=("log", "sampling"), config_keys=("analysis.channels", "analysis.psd") + _FORECAST_KEYS),
+    Stage("crosscorr", _stage_crosscorr, deps=("log", "sampling"), config_keys=("analysis.crosscorr", "analysis.channels")),
+    Stage("robustness", _stage_robustness, deps=("log", "sampling"), config_keys=("analysis.robustness", "analysis.forecast.horizon_steps")),
+    Stage("bo", _stage_bo, deps=("bo_data",), config_keys=("analysis.bo",)),
+    Stage("quality", _stage_quality, deps=("log",), config_keys=("quality.rules",)),
+]
+_ANALYSIS_STAGES = [s.name for s in STAGES if s.cache]
+INPUT_STAGES = [s.name for s in STAGES if not s.cache]
+
+
+def _plots():
+    # Plotting pulls in matplotlib; imported on first use so metrics-only runs skip it
+    from .reporting import make_plots
+
+    return make_plots
+
+
+def _sweep_bands(sweep):
+    # Trial-spread bands of the Monte Carlo noise sweep's metrics that share Hz units
+    if sweep is None:
+        return None
+    return {"Allan deviation": sweep.band("adev"), "Forecast MAE": sweep.band("forecast_mae")}
+
+
+# Figure name -> (stages it draws from, builder returning (plot function, args, kwargs))
+_FIGURES = {
+    "timeseries": (("log",), lambda r, points: (_plots().timeseries_plot, (r["log"],), {"max_points": points})),
+    "psd": (("psd",), lambda r, points: (_plots().psd_plot, (r["psd"]["freqs"], r["psd"]["psd"]), {})),
+    "stability_map": (
+        ("stability_map",),
+        lambda r, points: (
+            _plots().stability_map_plot,
+            (r["stability_map"].times, r["stability_map"].freqs, r["stability_map"].psd, r["stability_map"].taus, r["stability_map"].adev),
+            {},
+        ),
+    ),
+    "channels": (
+        ("channels",),
+        lambda r, points: (
+            _plots().channels_plot,
+            (r["channels"].channels, r["channels"].freqs, r["channels"].psd, r["channels"].stability.taus, r["channels"].stability.adev),
+            {},
+        ),
+    ),
+    "crosscorr": (
+        ("crosscorr",),
+        lambda r, points: (
+            _plots().crosscorr_plot,
+            (r["crosscorr"].pairs, r["crosscorr"].lag_seconds, r["crosscorr"].correlation, r["crosscorr"].freqs, r["crosscorr"].coherence),
+            {},
+        ),
+    ),
+    "rb_fit": (
+        ("rb",),
+        lambda r, points: (_plots().rb_fit_plot, (r["rb"]["m"], r["rb"]["fidelity"], r["rb"]["fit_y"], r["rb"]["result"].ci_half_width), {}),
+    ),
+    "allan": (
+        ("stability",),
+        lambda r, points: (_plots().allan_plot, (r["stability"].taus, r["stability"].adev), {"mdevs": r["stability"].mdev, "hdevs": r["stability"].hdev}),
+    ),
+    "forecast": (
+        ("log", "sampling", "forecast"),
+        lambda r, points: (
+            _plots().forecast_plot,
+            (r["log"]["timestamp"], r["log"]["lock_error"], r["forecast"].forecast, r["sampling"]),
+            {"threshold": r["alert_threshold"], "label": r["forecast"].label, "max_points": points},
+        ),
+    ),
+    "forecast_backtest": (
+        ("backtest",),
+        lambda r, points: (
+            _plots().backtest_plot,
+            (r["backtest"].horizon_seconds, r["backtest"].mae, r["backtest"].mape),
+            {"label": r["backtest"].label},
+        ),
+    ),
+    "bo_comparison": (
+        ("bo_data", "bo"),
+        lambda r, points: (
+            _plots().bo_comparison_plot,
+            (r["bo_data"],),
+            {"targets": r["bo"].targets, "bo_steps": r["bo"].bo_steps, "baseline_steps": r["bo"].baseline_steps},
+        ),
+    ),
+    "robustness": (
+        ("robustness",),
+        lambda r, points: (
+            _plots().robustness_plot,
+            (r["robustness"]["noise_x"], r["robustness"]["noise_ratio"], r["robustness"]["decimation"].factors, r["robustness"]["decimation"].mean_drift),
+            {"noise_band": r["robustness"]["noise_band"], "metric_bands": _sweep_bands(r["robustness"]["noise_sweep"])},
+        ),
+    ),
+}
+_HISTORY_SUMMARY_METRICS = [
+    "rb_p",
+    "rb_gate_error",
+    "lock_error_std",
+    "psd_noise_floor",
+    "allan_deviation",
+    "forecast_mae",
+    "forecast_backtest_mae_horizon",
+    "bo_step_reduction_pct",
+    "decimation_adev_ratio",
+    "quality_alert_count",
+]
+_DEFAULT_PAGES = ["summary", "rb_fit", "timeseries", "psd", "allan", "stability_map", "forecast", "forecast_backtest", "bo_comparison", "robustness"]
+
+
+def _stage_cache_dir(config: Dict, output: str):
+    pipeline_cfg = config.get("pipeline", {})
+    if not pipeline_cfg.get("cache", True):
+        return None
+    return pipeline_cfg.get("cache_dir") or os.path.join(output, ".stage_cache")
+
+
+def generate_from_config(config: Dict, preloaded: Optional[Dict] = None, metrics_only: bool = False) -> Dict[str, str]:
+    """
+    Run the report for `config` and return the written paths by name.
+
+    `preloaded` maps stage names (normally `INPUT_STAGES`) to results already loaded
+    for this config's inputs, e.g. by a batch run sharing them between configs.
+    With `metrics_only` nothing is plotted (matplotlib is never imported): only
+    ``metrics.json``, ``summary.txt`` and the alert/history files are written.
+    """
+    output = config.get("output_dir", "out")
+    _ensure_out(output)
 
-    paths["robustness"] = os.path.join(output, "robustness.png")
-    robustness_plot(noise_x, noise_ratio, ds_x, ds_drift, paths["robustness"])
+    pipeline = Pipeline(
+        STAGES,
+        config,
+        cache_dir=_stage_cache_dir(config, output),
+        max_workers=int(config.get("pipeline", {}).get("workers", 4)),
+        preloaded=preloaded,
+        max_age_days=config.get("pipeline", {}).get("cache_max_age_days", 30.0),
+    )
+    r = pipeline.run(_ANALYSIS_STAGES)
+    _, alert_threshold = _forecast_settings(config)
+
+    rb_result, rb_bootstrap = r["rb"]["result"], r["rb"]["bootstrap"]
+    stability, stab_map = r["stability"], r["stability_map"]
+    forecast_result, backtest = r["forecast"], r["backtest"]
+    decimation, robustness_result = r["robustness"]["decimation"], r["robustness"]["summary"]
+    bo_comparison, xcorr = r["bo"], r["crosscorr"]
+    channel_result, quality_alerts = r["channels"], r["quality"]["alerts"]
+    taus, adevs, ds_x = stability.taus, stability.adev, decimation.factors
+    bo_headline = bo_comparison.as_dict()
+
+    flags = list(r["quality"]["flags"])
+    if not np.isnan(forecast_result.lead_time_seconds):
+        flags.append(f"Forecast crosses lock-error threshold in {forecast_result.lead_time_seconds/60:.1f} min")
 
+    paths: Dict[str, str] = {}
     summary_entries: List = [
         ("RB gate fidelity p", rb_result.p),
         ("RB residual RMS", rb_result.residual_rms),
         ("RB CI half-width", rb_result.ci_half_width),
+    ]
+    if rb_bootstrap is not None:
+        summary_entries += [
+            ("RB p 95% CI (bootstrap)", f"[{rb_bootstrap.p_ci[0]:.5f}, {rb_bootstrap.p_ci[1]:.5f}]"),
+            ("RB gate error", rb_bootstrap.gate_error),
+        ]
+    summary_entries += [
         (f"Allan deviation tau={taus[0]:.1f}s", adevs[0]),
-        ("PSD noise floor (Hz^2/Hz)", psd_noise_floor),
+        ("PSD noise floor (Hz^2/Hz)", r["psd"]["noise_floor"]),
+        ("Rolling ADEV peak/median", stab_map.as_dict()["stability_map_adev_peak_ratio"]),
+        ("Forecast model", forecast_result.label),
         ("Forecast MAE (Hz)", forecast_result.mae),
         ("Forecast MAPE (%)", forecast_result.mape),
+        (f"{backtest.label} backtest MAE @{backtest.horizon_seconds[-1]:.0f}s (Hz)", backtest.mae[-1]),
         ("Lead time (min)", forecast_result.lead_time_seconds / 60.0 if not np.isnan(forecast_result.lead_time_seconds) else float("nan")),
-        ("BO step reduction (%)", bo_comparison.step_reduction),
+        ("BO step reduction (%)", bo_headline["bo_step_reduction_pct"]),
         ("BO terminal gain", bo_comparison.terminal_gain),
         ("Noise sensitivity slope", robustness_result.noise_slope),
         ("Downsample sensitivity slope", robustness_result.downsample_slope),
+        (f"Decimation x{ds_x[-1]:.0f} ADEV ratio", decimation.adev_ratio[-1]),
+        (f"Decimation x{ds_x[-1]:.0f} PSD floor ratio", decimation.psd_floor_ratio[-1]),
     ]
 
-    summary_text = write_summary_text(summary_entries, flags)
-    summary_txt_path = os.path.join(output, "summary.txt")
-    with open(summary_txt_path, "w", encoding="utf-8") as fh:
-        fh.write(summary_text)
-
-    summary_fig_path = os.path.join(output, "summary.png")
-    save_text_as_figure(summary_text, summary_fig_path, title="Metric Overview")
+    if xcorr is not None:
+        for i, (a, b) in enumerate(xcorr.pairs):
+            if "lock_error" in (a, b):
+                summary_entries.append(
+                    (f"Xcorr {a}/{b}", f"r={xcorr.peak_correlation[i]:+.2f} at {xcorr.peak_lag_seconds[i]:+.0f}s")
+                )
 
     metrics_json = {
-        **stats,
-        **{"psd_noise_floor": psd_noise_floor},
+        **r["stats"],
+        **{"psd_noise_floor": r["psd"]["noise_floor"]},
         **rb_result.as_dict(),
+        **(rb_bootstrap.as_dict() if rb_bootstrap is not None else {}),
         **forecast_result.as_dict(),
-        **bo_comparison.as_dict(),
+        **backtest.as_dict(),
+        **bo_headline,
         **robustness_result.as_dict(),
+        **(r["robustness"]["noise_sweep"].as_dict() if r["robustness"]["noise_sweep"] is not None else {}),
+        **decimation.as_dict(),
+        **stab_map.as_dict(),
+        **(channel_result.as_dict() if channel_result is not None else {}),
+        **(xcorr.as_dict() if xcorr is not None else {}),
         "allan_tau_seconds": float(taus[0]),
         "allan_deviation": float(adevs[0]),
     }
+    if quality_alerts is not None:
+        metrics_json["quality_alert_count"] = len(quality_alerts)
     metrics_path = os.path.join(output, "metrics.json")
     with open(metrics_path, "w", encoding="utf-8") as fh:
         json.dump(metrics_json, fh, indent=2)
 
-    include_figs = config.get("report", {}).get("include_figures")
+    if quality_alerts is not None:
+        alerts_path = os.path.join(output, "quality_alerts.json")
+        with open(alerts_path, "w", encoding="utf-8") as fh:
+            json.dump([alert.as_dict() for alert in quality_alerts], fh, indent=2)
+        paths["quality_alerts"] = alerts_path
+
+    history_sections = None
+    history_cfg = config.get("history", {})
+    if history_cfg.get("path"):
+        trap = history_cfg.get("trap", "default")
+        with MetricsHistory(history_cfg["path"]) as history:
+            deltas = history.compare(metrics_json, trap, window_days=float(history_cfg.get("window_days", 30)))
+            history.record(metrics_json, trap, config_hash=combine_keys(config))
+        history_path = os.path.join(output, "metrics_history.json")
+        with open(history_path, "w", encoding="utf-8") as fh:
+            json.dump({delta.name: delta.as_dict() for delta in deltas}, fh, indent=2)
+        paths["metrics_history"] = history_path
+        by_name = {delta.name: delta for delta in deltas}
+        heading = f"Change vs previous run / {float(history_cfg.get('window_days', 30)):g}-day median ({trap})"
+        history_sections = {
+            heading: [
+                f"{name:<30} {by_name[name].value:.4g}  prev {by_name[name].delta_previous:+.3g}  median {by_name[name].delta_median:+.3g}"
+                for name in history_cfg.get("summary_metrics", _HISTORY_SUMMARY_METRICS)
+                if name in by_name
+            ]
+        }
+
+    summary_text = write_summary_text(summary_entries, flags, sections=history_sections)
+    summary_txt_path = os.path.join(output, "summary.txt")
+    with open(summary_txt_path, "w", encoding="utf-8") as fh:
+        fh.write(summary_text)
+    paths["summary_text"] = summary_txt_path
+    paths["metrics"] = metrics_path
+    if metrics_only:
+        return paths
+
+    # --- figures ---
+    # A figure is redrawn only when a stage it draws from (or the point budget)
+    # changed; the keys of the last render are kept next to the outputs.
+    report_cfg = config.get("report", {})
+    write_png = bool(report_cfg.get("png", True))
+    points_key = report_cfg.get("max_plot_points", "default")
+    names = [name for name in _FIGURES if name not in ("channels", "crosscorr") or r[name] is not None]
+    figure_keys = {name: combine_keys(name, [pipeline.keys[d] for d in _FIGURES[name][0]], points_key) for name in names}
+    figure_keys["forecast"] = combine_keys(figure_keys["forecast"], alert_threshold)
+    figure_keys["summary"] = combine_keys("summary", summary_text)
+    figure_paths = {name: os.path.join(output, f"{name}.png") for name in figure_keys}
+
+    include_figs = report_cfg.get("include_figures")
     if not include_figs:
-        pdf_figs = [summary_fig_path, paths["rb_fit"], paths["timeseries"], paths["psd"], paths["allan"], paths["forecast"], paths["bo_comparison"], paths["robustness"]]
+        pages = list(_DEFAULT_PAGES)
+        pages[6:6] = [name for name in ("channels", "crosscorr") if name in figure_keys]
     else:
-        pdf_figs = [os.path.join(output, fig) if not os.path.isabs(fig) else fig for fig in include_figs]
+        # Names of generated figures become vector pages; anything else is an image file
+        pages = []
+        for fig in include_figs:
+            name = os.path.splitext(fig)[0]
+            if not os.path.isabs(fig) and name in figure_keys:
+                pages.append(name)
+            else:
+                pages.append(fig if os.path.isabs(fig) else os.path.join(output, fig))
 
     pdf_path = os.path.join(output, "report.pdf")
-    compile_pdf(pdf_figs, pdf_path)
+    page_dir = os.path.join(output, ".pages")
+    manifest_path = os.path.join(output, ".figures.json")
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        manifest = {}
+    pdf_key = combine_keys([figure_keys[p] if p in figure_keys else file_fingerprint(p) for p in pages])
+    rendered = manifest.get("png", {})
+    stale_png = [
+        name for name in figure_keys if write_png and (rendered.get(name) != figure_keys[name] or not os.path.exists(figure_paths[name]))
+    ]
+    # Each page is kept as its own one-page PDF, so e.g. a new summary redraws one page
+    drawn_pages = manifest.get("pages", {})
+    stale_pages = [
+        p for p in pages if p in figure_keys and (drawn_pages.get(p) != figure_keys[p] or not os.path.exists(os.path.join(page_dir, f"{p}.pdf")))
+    ]
+    pdf_stale = manifest.get("pdf") != pdf_key or not os.path.exists(pdf_path)
+    to_draw = set(stale_png) | set(stale_pages)
+    if to_draw or pdf_stale:
+        _render(config, pipeline, summary_text, alert_threshold, to_draw, stale_png, figure_paths, pages, pdf_path if pdf_stale else None, page_dir)
+
+    manifest = {
+        "png": {name: figure_keys[name] for name in figure_keys if write_png},
+        "pages": {p: figure_keys[p] for p in pages if p in figure_keys},
+        "pdf": pdf_key,
+    }
+    with open(manifest_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
 
-    paths["summary"] = summary_fig_path
-    paths["summary_text"] = summary_txt_path
-    paths["metrics"] = metrics_path
+    if write_png:
+        paths.update(figure_paths)
     paths["pdf"] = pdf_path
     return paths
 
 
+def _render(config, pipeline, summary_text, alert_threshold, to_draw, stale_png, figure_paths, pages, pdf_path, page_dir):
+    """
+    Draw the `to_draw` figures (PNGs for `stale_png`, pages into `page_dir`), then
+    reassemble the PDF from all pages unless `pdf_path` is None.
+    """
+
+    # Plotting imports stay here so runs with nothing to draw never load matplotlib
+    from .reporting.make_plots import DEFAULT_MAX_POINTS
+    from .reporting.report import render_report, save_text_as_figure
+
+    report_cfg = config.get("report", {})
+    max_plot_points = report_cfg.get("max_plot_points", DEFAULT_MAX_POINTS)
+    data = dict(pipeline.run({d for name in to_draw if name != "summary" for d in _FIGURES[name][0]}))
+    data["alert_threshold"] = alert_threshold
+    jobs = {}
+    for name in to_draw:
+        if name == "summary":
+            func, args, kwargs = save_text_as_figure, (summary_text,), {"title": "Metric Overview"}
+        else:
+            func, args, kwargs = _FIGURES[name][1](data, max_plot_points)
+        jobs[name] = (func, args, {**kwargs, "path": figure_paths[name] if name in stale_png else None})
+
+    # Pages without a job are reused from page_dir; a redrawn PNG also refreshes its page
+    render_report(jobs, pages, pdf_path, workers=int(report_cfg.get("render_workers", 1)), page_dir=page_dir)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Ion lab reporting pipeline")
     parser.add_argument("--config", required=True, help="YAML config file")
+    parser.add_argument("--metrics-only", action="store_true", help="Write metrics.json and summary.txt without rendering figures")
     args = parser.parse_args()
 
     config = _load_config(args.config)
-    outputs = generate_from_config(config)
+    outputs = generate_from_config(config, metrics_only=args.metrics_only)
     print("Report generated:")
     for name, path in outputs.items():
         print(f"  {name}: {path}")
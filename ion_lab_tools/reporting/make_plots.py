@@ -4,20 +4,58 @@ import matplotlib
 matplotlib.use("Agg", force=True)
 
 import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
 import numpy as np
 import pandas as pd
 
 
-def timeseries_plot(df: pd.DataFrame, path: str):
+# Default point budget per plotted line: a few samples per horizontal pixel at 200 dpi
+DEFAULT_MAX_POINTS = 4000
+
+
+def _finish(fig, path, pdf):
+    # PNG when a path is given, a vector page when a PdfPages stream is given
+    if path:
+        fig.savefig(path, dpi=200, bbox_inches="tight")
+    if pdf is not None:
+        pdf.savefig(fig, bbox_inches="tight")
+    plt.close(fig)
+
+
+def minmax_indices(y, max_points: int = DEFAULT_MAX_POINTS) -> np.ndarray:
+    """
+    Sorted sample indices that keep each bucket's minimum and maximum of `y`.
+
+    The series is split into max_points // 2 equal buckets; plotting only these
+    samples preserves the visual envelope (spikes included) while the cost of
+    drawing stays bounded by `max_points` regardless of the log length.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    if max_points is None or n <= max(int(max_points), 4):
+        return np.arange(n)
+    size = -(-n // max(int(max_points) // 2, 1))
+    rows = -(-n // size)
+    padded = np.concatenate((y, np.full(rows * size - n, y[-1])))
+    blocks = padded.reshape(rows, size)
+    base = np.arange(rows)[:, None] * size
+    picks = np.sort(np.stack((blocks.argmin(axis=1), blocks.argmax(axis=1)), axis=1), axis=1) + base
+    idx = np.unique(np.minimum(picks.ravel(), n - 1))
+    return np.union1d(idx, [0, n - 1])
+
+
+def timeseries_plot(df: pd.DataFrame, path: str, max_points: int = DEFAULT_MAX_POINTS, pdf=None):
     fig = plt.figure(figsize=(8, 4))
     ax1 = plt.gca()
-    ax1.plot(df["timestamp"], df["rb_fidelity"], label="RB fidelity", color="#1f77b4")
+    idx = minmax_indices(df["rb_fidelity"], max_points)
+    ax1.plot(df["timestamp"].iloc[idx], df["rb_fidelity"].iloc[idx], label="RB fidelity", color="#1f77b4")
     ax1.set_ylabel("RB fidelity")
     ax1.set_xlabel("Time")
     ax1.legend(loc="upper left")
 
     ax2 = ax1.twinx()
-    ax2.plot(df["timestamp"], df["lock_error"], label="Lock error (Hz)", color="#ff7f0e", alpha=0.7)
+    idx = minmax_indices(df["lock_error"], max_points)
+    ax2.plot(df["timestamp"].iloc[idx], df["lock_error"].iloc[idx], label="Lock error (Hz)", color="#ff7f0e", alpha=0.7)
     ax2.set_ylabel("Lock error (Hz)")
     fig.autofmt_xdate()
 
@@ -25,22 +63,20 @@ def timeseries_plot(df: pd.DataFrame, path: str):
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax1.legend(lines + lines2, labels + labels2, loc="upper right")
 
-    fig.savefig(path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
+    _finish(fig, path, pdf)
 
 
-def psd_plot(freqs: np.ndarray, psd: np.ndarray, path: str, xlabel: str = "Frequency (Hz)", ylabel: str = "PSD"):
+def psd_plot(freqs: np.ndarray, psd: np.ndarray, path: str, xlabel: str = "Frequency (Hz)", ylabel: str = "PSD", pdf=None):
     fig = plt.figure(figsize=(6, 4))
     ax = plt.gca()
     ax.loglog(freqs[1:], psd[1:], color="#2ca02c")  # skip DC
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
     ax.grid(True, which="both", ls="--", alpha=0.4)
-    fig.savefig(path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
+    _finish(fig, path, pdf)
 
 
-def rb_fit_plot(m: np.ndarray, y: np.ndarray, fit_y: np.ndarray, ci_half_width: float, path: str):
+def rb_fit_plot(m: np.ndarray, y: np.ndarray, fit_y: np.ndarray, ci_half_width: float, path: str, pdf=None):
     fig = plt.figure(figsize=(6, 4))
     ax = plt.gca()
     ax.scatter(m, y, label="Measured data", color="#1f77b4")
@@ -49,41 +85,77 @@ def rb_fit_plot(m: np.ndarray, y: np.ndarray, fit_y: np.ndarray, ci_half_width:
     ax.set_xlabel("Sequence length (Clifford count)")
     ax.set_ylabel("RB fidelity")
     ax.legend(loc="upper right")
-    fig.savefig(path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
+    _finish(fig, path, pdf)
 
 
-def allan_plot(taus: np.ndarray, adevs: np.ndarray, path: str):
+def allan_plot(taus: np.ndarray, adevs: np.ndarray, path: str, mdevs: np.ndarray = None, hdevs: np.ndarray = None, pdf=None):
     fig = plt.figure(figsize=(6, 4))
     ax = plt.gca()
-    ax.loglog(taus, adevs, marker="o", color="#9467bd")
+    ax.loglog(taus, adevs, marker="o", color="#9467bd", label="ADEV")
+    if mdevs is not None:
+        ax.loglog(taus, mdevs, marker="^", color="#8c564b", alpha=0.8, label="MDEV")
+    if hdevs is not None:
+        ax.loglog(taus, hdevs, marker="s", color="#e377c2", alpha=0.8, label="HDEV")
     ax.set_xlabel("Integration time tau (s)")
     ax.set_ylabel("Allan deviation")
     ax.grid(True, which="both", ls="--", alpha=0.4)
-    fig.savefig(path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
+    if mdevs is not None or hdevs is not None:
+        ax.legend(loc="best")
+    _finish(fig, path, pdf)
 
 
-def forecast_plot(time_index: pd.Series, actual: pd.Series, forecast: np.ndarray, sample_period: float, path: str, threshold: float):
+def forecast_plot(
+    time_index: pd.Series,
+    actual: pd.Series,
+    forecast: np.ndarray,
+    sample_period: float,
+    path: str,
+    threshold: float,
+    label: str = "AR(1)",
+    max_points: int = DEFAULT_MAX_POINTS,
+    pdf=None,
+):
     future_times = time_index.iloc[-1] + pd.to_timedelta(np.arange(1, forecast.size + 1) * sample_period, unit="s")
 
     fig = plt.figure(figsize=(8, 4))
     ax = plt.gca()
-    ax.plot(time_index, actual, label="Lock error (measured)", color="#1f77b4")
-    ax.plot(future_times, forecast, label="AR(1) forecast", color="#d62728", linestyle="--")
+    idx = minmax_indices(actual, max_points)
+    ax.plot(time_index.iloc[idx], actual.iloc[idx], label="Lock error (measured)", color="#1f77b4")
+    ax.plot(future_times, forecast, label=f"{label} forecast", color="#d62728", linestyle="--")
     ax.axhline(threshold, color="#ff7f0e", linestyle=":", label="Alert threshold")
     ax.axhline(-threshold, color="#ff7f0e", linestyle=":")
     ax.set_ylabel("Lock error (Hz)")
     ax.set_xlabel("Time")
     ax.legend(loc="upper left")
     fig.autofmt_xdate()
-    fig.savefig(path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
+    _finish(fig, path, pdf)
 
 
-def bo_comparison_plot(df: pd.DataFrame, path: str):
+def backtest_plot(horizon_seconds: np.ndarray, mae: np.ndarray, mape: np.ndarray, path: str, label: str = "AR(1)", pdf=None):
     fig = plt.figure(figsize=(6, 4))
-    ax = plt.gca()
+    ax1 = plt.gca()
+    ax1.set_title(f"{label} rolling-origin backtest")
+    ax1.plot(horizon_seconds, mae, marker="o", color="#1f77b4", label="MAE (Hz)")
+    ax1.set_xlabel("Forecast horizon (s)")
+    ax1.set_ylabel("MAE (Hz)")
+    ax1.grid(True, ls="--", alpha=0.3)
+
+    ax2 = ax1.twinx()
+    ax2.plot(horizon_seconds, mape, marker="s", color="#d62728", alpha=0.7, label="MAPE (%)")
+    ax2.set_ylabel("MAPE (%)")
+
+    lines, labels = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines + lines2, labels + labels2, loc="upper left")
+    _finish(fig, path, pdf)
+
+
+def bo_comparison_plot(df: pd.DataFrame, path: str, targets: np.ndarray = None, bo_steps: np.ndarray = None, baseline_steps: np.ndarray = None, pdf=None):
+    if targets is None:
+        fig = plt.figure(figsize=(6, 4))
+        ax = plt.gca()
+    else:
+        fig, (ax, ax_t) = plt.subplots(1, 2, figsize=(10, 4))
     for method, group in df.groupby("method"):
         sorted_group = group.sort_values("step")
         cum_best = np.maximum.accumulate(sorted_group["score"].to_numpy())
@@ -92,14 +164,36 @@ def bo_comparison_plot(df: pd.DataFrame, path: str):
     ax.set_ylabel("Best score (cumulative)")
     ax.legend(loc="lower right")
     ax.grid(True, ls="--", alpha=0.3)
-    fig.savefig(path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
 
+    if targets is not None:
+        ax_t.plot(targets, bo_steps, marker="o", label="BO")
+        ax_t.plot(targets, baseline_steps, marker="s", label="Baselines (mean)")
+        ax_t.set_xlabel("Target score")
+        ax_t.set_ylabel("Mean steps to target")
+        ax_t.set_title("Steps to target")
+        ax_t.legend(loc="upper left")
+        ax_t.grid(True, ls="--", alpha=0.3)
+        fig.tight_layout()
+    _finish(fig, path, pdf)
 
-def robustness_plot(noise_levels: np.ndarray, noise_ratio: np.ndarray, factors: np.ndarray, drifts: np.ndarray, path: str):
-    fig, axes = plt.subplots(1, 2, figsize=(10, 4))
 
-    axes[0].plot(noise_levels, noise_ratio, marker="o", color="#17becf")
+def robustness_plot(
+    noise_levels: np.ndarray,
+    noise_ratio: np.ndarray,
+    factors: np.ndarray,
+    drifts: np.ndarray,
+    path: str,
+    noise_band: tuple = None,
+    metric_bands: dict = None,
+    pdf=None,
+):
+    # metric_bands: label -> (median, low, high) per noise level, drawn in a third panel
+    fig, axes = plt.subplots(1, 3 if metric_bands else 2, figsize=(15 if metric_bands else 10, 4))
+
+    axes[0].plot(noise_levels, noise_ratio, marker="o", color="#17becf", label="Median" if noise_band else None)
+    if noise_band is not None:
+        axes[0].fill_between(noise_levels, noise_band[0], noise_band[1], color="#17becf", alpha=0.3, label="Trial spread")
+        axes[0].legend(loc="upper left")
     axes[0].set_xlabel("Injected noise std (Hz)")
     axes[0].set_ylabel("Std amplification")
     axes[0].set_title("Noise sensitivity")
@@ -111,6 +205,71 @@ def robustness_plot(noise_levels: np.ndarray, noise_ratio: np.ndarray, factors:
     axes[1].set_title("Sampling sensitivity")
     axes[1].grid(True, ls="--", alpha=0.3)
 
+    if metric_bands:
+        for (label, (med, lo, hi)), color in zip(metric_bands.items(), ["#9467bd", "#8c564b"]):
+            axes[2].plot(noise_levels, med, marker="o", color=color, label=label)
+            axes[2].fill_between(noise_levels, lo, hi, color=color, alpha=0.3)
+        axes[2].set_xlabel("Injected noise std (Hz)")
+        axes[2].set_ylabel("Hz")
+        axes[2].set_title("Metrics under noise")
+        axes[2].legend(loc="upper left")
+        axes[2].grid(True, ls="--", alpha=0.3)
+
     fig.tight_layout()
-    fig.savefig(path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
+    _finish(fig, path, pdf)
+
+
+def stability_map_plot(times: np.ndarray, freqs: np.ndarray, psd: np.ndarray, taus: np.ndarray, adev: np.ndarray, path: str, pdf=None):
+    minutes = times / 60.0
+    fig, axes = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
+
+    floor = np.min(psd[:, 1:][psd[:, 1:] > 0]) if np.any(psd[:, 1:] > 0) else 1e-12
+    mesh = axes[0].pcolormesh(minutes, freqs[1:], np.maximum(psd[:, 1:], floor).T, shading="nearest", norm=LogNorm(), cmap="viridis", rasterized=True)
+    axes[0].set_yscale("log")
+    axes[0].set_ylabel("Frequency (Hz)")
+    axes[0].set_title("Rolling PSD")
+    fig.colorbar(mesh, ax=axes[0], label="PSD")
+
+    mesh = axes[1].pcolormesh(minutes, taus, adev.T, shading="nearest", norm=LogNorm(), cmap="magma", rasterized=True)
+    axes[1].set_yscale("log")
+    axes[1].set_ylabel("Tau (s)")
+    axes[1].set_xlabel("Time since start (min)")
+    axes[1].set_title("Rolling Allan deviation")
+    fig.colorbar(mesh, ax=axes[1], label="Allan deviation")
+
+    fig.tight_layout()
+    _finish(fig, path, pdf)
+
+
+def channels_plot(channels: list, freqs: np.ndarray, psd: np.ndarray, taus: np.ndarray, adev: np.ndarray, path: str, pdf=None):
+    # One row per channel: units differ, so channels do not share an axis
+    fig, axes = plt.subplots(len(channels), 2, figsize=(9, 2.2 * len(channels)), squeeze=False)
+    for row, ch in enumerate(channels):
+        axes[row, 0].loglog(freqs[1:], psd[row, 1:], color="#2ca02c")
+        axes[row, 0].set_ylabel(f"{ch}\nPSD")
+        axes[row, 1].loglog(taus, adev[row], marker="o", color="#9467bd")
+        axes[row, 1].set_ylabel("ADEV")
+        for ax in axes[row]:
+            ax.grid(True, which="both", ls="--", alpha=0.4)
+    axes[-1, 0].set_xlabel("Frequency (Hz)")
+    axes[-1, 1].set_xlabel("Tau (s)")
+    fig.tight_layout()
+    _finish(fig, path, pdf)
+
+
+def crosscorr_plot(pairs: list, lag_seconds: np.ndarray, correlation: np.ndarray, freqs: np.ndarray, coherence: np.ndarray, path: str, pdf=None):
+    fig, axes = plt.subplots(1, 2, figsize=(10, 4))
+    for row, (a, b) in enumerate(pairs):
+        axes[0].plot(lag_seconds, correlation[row], label=f"{a} / {b}")
+        axes[1].semilogx(freqs[1:], coherence[row, 1:], label=f"{a} / {b}")
+    axes[0].axvline(0.0, color="k", lw=0.8, alpha=0.5)
+    axes[0].set_xlabel("Lag (s)")
+    axes[0].set_ylabel("Cross-correlation")
+    axes[1].set_xlabel("Frequency (Hz)")
+    axes[1].set_ylabel("Coherence")
+    axes[1].set_ylim(0.0, 1.0)
+    for ax in axes:
+        ax.grid(True, which="both", ls="--", alpha=0.4)
+    axes[1].legend(loc="upper right", fontsize="small")
+    fig.tight_layout()
+    _finish(fig, path, pdf)
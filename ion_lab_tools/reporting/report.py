@@ -1,15 +1,32 @@
-import matplotlib
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
-# Match the plotting module to ensure Agg backend (headless friendly)
-matplotlib.use("Agg", force=True)
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
+def _pyplot():
+    # matplotlib is imported on first use so text-only callers (summaries,
+    # metrics-only runs, watch mode) never pay for it
+    import matplotlib
 
+    # Match the plotting module to ensure Agg backend (headless friendly)
+    matplotlib.use("Agg", force=True)
+    import matplotlib.pyplot as plt
 
-def write_summary_text(summary_entries, flags=None, title="Metric Summary"):
+    return plt
+
+
+def _pdf_pages(path):
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    _pyplot()
+    return PdfPages(path)
+
+
+def write_summary_text(summary_entries, flags=None, title="Metric Summary", sections=None):
     """
     Accepts either a dict or iterable of (label, value) pairs.
+    `sections` maps extra section titles to their pre-formatted lines.
     """
     if isinstance(summary_entries, dict):
         items = summary_entries.items()
@@ -23,6 +40,12 @@ def write_summary_text(summary_entries, flags=None, title="Metric Summary"):
         else:
             lines.append(f"{label:<30} {value}")
 
+    for heading, section_lines in (sections or {}).items():
+        lines.append("")
+        lines.append(heading)
+        lines.append("-" * len(heading))
+        lines.extend(section_lines)
+
     if flags:
         lines.append("")
         lines.append("Threshold Alerts")
@@ -33,21 +56,156 @@ def write_summary_text(summary_entries, flags=None, title="Metric Summary"):
     return "\n".join(lines)
 
 
-def save_text_as_figure(text, fig_path, title="Summary"):
+def save_text_as_figure(text, path=None, title="Summary", pdf=None):
+    plt = _pyplot()
     fig = plt.figure(figsize=(8.27, 11.69))  # A4 portrait
     fig.text(0.05, 0.95, title, fontsize=16, va="top")
     fig.text(0.05, 0.9, text, fontsize=10, va="top", family="monospace")
-    fig.savefig(fig_path, dpi=200, bbox_inches="tight")
+    if path:
+        fig.savefig(path, dpi=200, bbox_inches="tight")
+    if pdf is not None:
+        pdf.savefig(fig, bbox_inches="tight")
+    plt.close(fig)
+
+
+def _image_page(image_path, pdf):
+    plt = _pyplot()
+    img = plt.imread(image_path)
+    fig = plt.figure(figsize=(8.27, 11.69))
+    ax = plt.gca()
+    ax.imshow(img)
+    ax.axis("off")
+    pdf.savefig(fig, bbox_inches="tight")
     plt.close(fig)
 
 
 def compile_pdf(fig_paths, pdf_path):
-    with PdfPages(pdf_path) as pdf:
+    with _pdf_pages(pdf_path) as pdf:
         for p in fig_paths:
-            img = plt.imread(p)
-            fig = plt.figure(figsize=(8.27, 11.69))
-            ax = plt.gca()
-            ax.imshow(img)
-            ax.axis("off")
-            pdf.savefig(fig, bbox_inches="tight")
-            plt.close(fig)
+            _image_page(p, pdf)
+
+
+_OBJ_REF = re.compile(rb"(?<![\d.])(\d+) 0 R\b")
+
+
+def _pdf_objects(data):
+    """Objects of a PDF with a classic xref table (as matplotlib writes), plus the trailer."""
+
+    start = int(data[data.rindex(b"startxref") + len(b"startxref"):].split()[0])
+    trailer_at = data.index(b"trailer", start)
+    rows = data[start:trailer_at].split(b"\n")[1:]
+    offsets = {}
+    i = 0
+    while i < len(rows) and rows[i].strip():
+        first, count = map(int, rows[i].split())
+        for num, row in enumerate(rows[i + 1:i + 1 + count], start=first):
+            if row.split()[2:3] == [b"n"]:
+                offsets[num] = int(row.split()[0])
+        i += 1 + count
+    # An object runs until the next one starts (stream data is never parsed)
+    ends = sorted(offsets.values()) + [start]
+    next_start = dict(zip(ends, ends[1:]))
+    return {num: data[off:next_start[off]] for num, off in offsets.items()}, data[trailer_at:]
+
+
+def _renumber(body, mapping, new_num):
+    # References only occur in the object's dictionary, never in its stream data
+    head, sep, stream = body.partition(b"stream\n")
+    head = re.sub(rb"^\d+ 0 obj", b"%d 0 obj" % new_num, head)
+    head = _OBJ_REF.sub(lambda m: b"%d 0 R" % mapping[int(m.group(1))], head)
+    return head + sep + stream
+
+
+def join_pdfs(paths, out_path):
+    """
+    Concatenate the pages of the PDFs in `paths`, in order, into `out_path`.
+
+    Meant for the one-page vector PDFs written by matplotlib: objects are copied
+    byte for byte and only renumbered, so nothing is redrawn.
+    """
+    chunks = []
+    kids = []
+    next_num = 3  # 1 and 2 are the new catalog and page tree
+    for path in paths:
+        with open(path, "rb") as fh:
+            objects, trailer = _pdf_objects(fh.read())
+        root = int(re.search(rb"/Root (\d+) 0 R", trailer).group(1))
+        info = re.search(rb"/Info (\d+) 0 R", trailer)
+        tree = int(re.search(rb"/Pages (\d+) 0 R", objects[root]).group(1))
+        old_kids = [int(k) for k in _OBJ_REF.findall(re.search(rb"/Kids \[([^\]]*)\]", objects[tree]).group(1))]
+        dropped = {root, tree} | ({int(info.group(1))} if info else set())
+        mapping = {tree: 2}
+        for num in sorted(objects):
+            if num not in dropped:
+                mapping[num] = next_num
+                next_num += 1
+        kids += [mapping[k] for k in old_kids]
+        chunks += [_renumber(objects[num], mapping, mapping[num]) for num in sorted(objects) if num not in dropped]
+
+    head = [
+        b"%PDF-1.4\n%\xac\xdc \xab\xba\n",
+        b"1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n",
+        b"2 0 obj\n<< /Type /Pages /Kids [ %s ] /Count %d >>\nendobj\n" % (b" ".join(b"%d 0 R" % k for k in kids), len(kids)),
+    ]
+    offsets = []
+    pos = 0
+    with open(out_path, "wb") as fh:
+        for chunk in head + chunks:
+            if chunk is not head[0]:
+                offsets.append(pos)
+            fh.write(chunk)
+            pos += len(chunk)
+        fh.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+        fh.write(b"".join(b"%010d 00000 n \n" % off for off in offsets))
+        fh.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(offsets) + 1, pos))
+
+
+def _draw(func, args, kwargs, page_path=None):
+    # One figure: its PNG (kwargs["path"]) and/or a one-page vector PDF at `page_path`
+    if page_path is None:
+        func(*args, **kwargs)
+        return
+    with _pdf_pages(page_path) as pdf:
+        func(*args, **{**kwargs, "pdf": pdf})
+
+
+def render_report(jobs, pages=(), pdf_path=None, workers=1, page_dir=None):
+    """
+    Write the PNGs of `jobs` and, if `pdf_path` is given, assemble `pages` into it as vector pages.
+
+    `jobs` maps figure names to (function, args, kwargs) where kwargs["path"] is the
+    PNG to write or None. Every job is one task that builds its figure once and
+    writes both its PNG and, for a page, a one-page PDF ``<page_dir>/<name>.pdf``;
+    with more than one worker the tasks run in a process pool, and the pages are
+    then joined in order without redrawing. A page that is not a job reuses its
+    existing file in `page_dir`, so unchanged figures are not drawn again; any
+    other page is embedded as an image file. The first failing job's exception
+    is re-raised here.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        page_dir = page_dir or scratch
+        if pdf_path is not None:
+            os.makedirs(page_dir, exist_ok=True)
+        page_paths = {}
+        tasks = []
+        for i, page in enumerate(pages if pdf_path is not None else ()):
+            if page in jobs:
+                page_paths[page] = os.path.join(page_dir, f"{page}.pdf")
+            elif os.path.exists(os.path.join(page_dir, f"{page}.pdf")):
+                page_paths[page] = os.path.join(page_dir, f"{page}.pdf")
+            else:
+                page_paths[page] = os.path.join(scratch, f"image-{i}.pdf")
+                tasks.append((_image_page, (page,), {}, page_paths[page]))
+        tasks += [(func, args, kwargs, page_paths.get(name)) for name, (func, args, kwargs) in jobs.items()]
+        tasks = [task for task in tasks if task[3] is not None or task[2].get("path")]
+
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                futures = [pool.submit(_draw, *task) for task in tasks]
+                for future in futures:
+                    future.result()
+        else:
+            for task in tasks:
+                _draw(*task)
+        if pdf_path is not None:
+            join_pdfs([page_paths[page] for page in pages], pdf_path)
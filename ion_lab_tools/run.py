@@ -2,15 +2,19 @@ import argparse
 import os
 
 from . import report as config_report
+from .live import monitor_from_config, watch
 from .processing.io import load_csv
 from .processing.metrics import basic_stats, compute_psd, quality_flags
-from .reporting.make_plots import psd_plot, timeseries_plot
-from .reporting.report import compile_pdf, save_text_as_figure, write_summary_text
+from .reporting.report import save_text_as_figure, write_summary_text
 
 
-def _simple_pipeline(input_csv: str, out_dir: str):
+def _simple_pipeline(input_csv: str, out_dir: str, cache: bool = True):
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    from .reporting.make_plots import psd_plot, timeseries_plot
+
     os.makedirs(out_dir, exist_ok=True)
-    df = load_csv(input_csv)
+    df = load_csv(input_csv, cache=cache)
 
     stats = {
         "rb_fidelity_mean": basic_stats(df["rb_fidelity"])["mean"],
@@ -24,19 +28,16 @@ def _simple_pipeline(input_csv: str, out_dir: str):
     freqs, psd = compute_psd(df["lock_error"].values, fs)
     flags = quality_flags(df)
 
-    ts_path = os.path.join(out_dir, "timeseries.png")
-    psd_path = os.path.join(out_dir, "psd.png")
-    timeseries_plot(df, ts_path)
-    psd_plot(freqs, psd, psd_path)
-
     summary_text = write_summary_text(stats, flags)
     with open(os.path.join(out_dir, "summary.txt"), "w", encoding="utf-8") as fh:
         fh.write(summary_text)
-    summary_fig = os.path.join(out_dir, "summary.png")
-    save_text_as_figure(summary_text, summary_fig)
 
+    # Each figure is drawn once, to its PNG and as a vector page of the PDF
     pdf_path = os.path.join(out_dir, "report.pdf")
-    compile_pdf([summary_fig, ts_path, psd_path], pdf_path)
+    with PdfPages(pdf_path) as pdf:
+        save_text_as_figure(summary_text, os.path.join(out_dir, "summary.png"), pdf=pdf)
+        timeseries_plot(df, os.path.join(out_dir, "timeseries.png"), pdf=pdf)
+        psd_plot(freqs, psd, os.path.join(out_dir, "psd.png"), pdf=pdf)
     print("Done. Outputs saved to", out_dir)
 
 
@@ -45,17 +46,42 @@ def main():
     ap.add_argument("--config", help="YAML config file for the enhanced report")
     ap.add_argument("--input", help="CSV file (simple pipeline)")
     ap.add_argument("--out", default="out", help="Output directory")
+    ap.add_argument("--no-cache", action="store_true", help="Always re-parse the CSV instead of using its column cache")
+    ap.add_argument("--metrics-only", action="store_true", help="With --config: write metrics.json and summary.txt without figures")
+    ap.add_argument("--watch", action="store_true", help="Tail a growing log and keep metrics.json/summary.txt current")
+    ap.add_argument("--poll", type=float, help="Watch mode: seconds between checks for new rows (default 0.25)")
+    ap.add_argument("--write-every", type=float, help="Watch mode: seconds between output rewrites (default 5)")
+    ap.add_argument("--duration", type=float, help="Watch mode: stop after this many seconds")
     args = ap.parse_args()
 
-    if args.config:
+    if args.watch:
+        config = config_report._load_config(args.config) if args.config else {}
+        watch_cfg = config.get("watch", {})
+        path = args.input or config.get("inputs", {}).get("log")
+        if not path:
+            ap.error("--watch needs --input or a config with inputs.log")
+        out_dir = config.get("output_dir", args.out) if args.config else args.out
+        print(f"Watching {path}; outputs in {out_dir} (Ctrl-C to stop)")
+        try:
+            watch(
+                path,
+                out_dir,
+                monitor_from_config(config),
+                poll_interval=args.poll or float(watch_cfg.get("poll_interval", 0.25)),
+                write_interval=args.write_every or float(watch_cfg.get("write_interval", 5.0)),
+                duration=args.duration,
+            )
+        except KeyboardInterrupt:
+            pass
+    elif args.config:
         config = config_report._load_config(args.config)
         config.setdefault("output_dir", args.out)
-        config_report.generate_from_config(config)
+        config_report.generate_from_config(config, metrics_only=args.metrics_only)
         print(f"Enhanced report generated: {config['output_dir']}")
     else:
         if not args.input:
             ap.error("--input is required for the simple mode (or use --config)")
-        _simple_pipeline(args.input, args.out)
+        _simple_pipeline(args.input, args.out, cache=not args.no_cache)
 
 
 if __name__ == "__main__":
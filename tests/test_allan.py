@@ -1,6 +1,7 @@
 import numpy as np
 
-from ion_lab_tools.analysis.allan import allan_deviation
+from ion_lab_tools.analysis.allan import AllanAccumulator, allan_deviation, stability_deviations
+from ion_lab_tools.analysis.stability_map import stability_map
 
 
 def test_allan_deviation_monotonic():
@@ -8,3 +9,44 @@ def test_allan_deviation_monotonic():
     taus, adevs = allan_deviation(y, sample_period=0.1)
     assert len(taus) == len(adevs) and len(taus) > 1
     assert np.all(adevs > 0)
+
+
+def test_stability_deviations_matches_direct_sums():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=257)
+    result = stability_deviations(y, sample_period=0.5, cluster_sizes=[1, 4])
+    x = np.concatenate([[0.0], np.cumsum(y)]) * 0.5
+    for idx, m in enumerate(result.cluster_sizes):
+        d2 = x[2 * m:] - 2 * x[m:-m] + x[:-2 * m]
+        avar = np.mean(d2**2) / (2 * (m * 0.5) ** 2)
+        mod = np.convolve(d2, np.ones(m), mode="valid")
+        mvar = np.mean(mod**2) / (2 * m**2 * (m * 0.5) ** 2)
+        assert np.isclose(result.adev[idx], np.sqrt(avar))
+        assert np.isclose(result.mdev[idx], np.sqrt(mvar))
+        assert result.n_adev[idx] == d2.size and result.n_mdev[idx] == mod.size
+    assert result.n_hdev[0] == y.size - 2
+    # m=1 overlapping ADEV equals the non-overlapping estimator
+    assert np.isclose(result.adev[0], allan_deviation(y, 0.5, [1])[1][0])
+
+
+def test_allan_accumulator_matches_batch_estimator():
+    rng = np.random.default_rng(1)
+    y = 1e5 + np.cumsum(rng.normal(size=1000)) * 0.1
+    acc = AllanAccumulator(sample_period=0.2)
+    for chunk in np.array_split(y, [3, 4, 100, 517, 518]):
+        acc.update(chunk)
+    taus, adevs = acc.result()
+    ref_taus, ref_adevs = allan_deviation(y, 0.2, cluster_sizes=2 ** np.arange(9))
+    assert np.allclose(taus[: ref_taus.size], ref_taus)
+    assert np.allclose(adevs[: ref_adevs.size], ref_adevs)
+    assert acc.n_samples == y.size
+
+
+def test_stability_map_windows_match_single_window_estimates():
+    rng = np.random.default_rng(2)
+    y = rng.normal(size=2000)
+    result = stability_map(y, sample_period=0.5, window_length=256, step=64)
+    assert result.psd.shape == (result.times.size, 129)
+    window = y[128:384]
+    expected = stability_deviations(window, 0.5).adev[: result.taus.size]
+    assert np.allclose(result.adev[2], expected)
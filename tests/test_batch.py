@@ -0,0 +1,63 @@
+import json
+import os
+
+import yaml
+
+from ion_lab_tools import report
+from ion_lab_tools.batch import expand_configs, group_configs, run_batch
+from ion_lab_tools.processing.io import load_csv
+
+
+def test_batch_groups_shared_inputs_and_isolates_failures(tmp_path):
+    log = tmp_path / "log.csv"
+    log.write_text("timestamp,lock_error\n")
+    configs = []
+    for name, inputs, output in [("a", {"log": str(log)}, "out_a"), ("b", {"log": str(log)}, "out_b"), ("c", {"log": str(tmp_path / "missing.csv")}, "out_c")]:
+        path = tmp_path / f"{name}.yaml"
+        path.write_text(yaml.safe_dump({"inputs": {"rb": "x", "bo": "y", **inputs}, "output_dir": str(tmp_path / output)}))
+        configs.append((str(path), yaml.safe_load(path.read_text())))
+    (tmp_path / "manifest.yaml").write_text(yaml.safe_dump({"configs": ["?.yaml", "a.yaml"]}))
+
+    paths = expand_configs(manifest=str(tmp_path / "manifest.yaml"))
+    assert [p.rsplit("/", 1)[1] for p in paths] == ["a.yaml", "b.yaml", "c.yaml"]
+    assert sorted(len(g) for g in group_configs(configs)) == [1, 2]
+    assert sorted(len(g) for g in group_configs(configs, workers=3)) == [1, 1, 1]
+
+    dup = tmp_path / "dup.yaml"
+    dup.write_text((tmp_path / "a.yaml").read_text())
+    index = run_batch(paths + [str(dup)], workers=1, index_path=str(tmp_path / "index.json"))
+    assert index["n_configs"] == 4 and index["n_failed"] == 4
+    assert "already used" in index["runs"][3]["error"]
+    assert json.loads((tmp_path / "index.json").read_text())["n_input_groups"] == 2
+
+
+def test_batch_runs_configs_sharing_inputs_once(tmp_path, monkeypatch):
+    data = os.path.join(os.path.dirname(__file__), "..", "data", "sample")
+    calls = []
+
+    def counting_load_csv(*args, **kwargs):
+        calls.append(args[0])
+        return load_csv(*args, **kwargs)
+
+    monkeypatch.setattr(report, "load_csv", counting_load_csv)
+    paths = []
+    for name, threshold in [("a", 150.0), ("b", 250.0)]:
+        config = {
+            "output_dir": str(tmp_path / f"out_{name}"),
+            "inputs": {kind: os.path.join(data, f"sample_{kind}.csv") for kind in ("log", "rb", "bo")},
+            "analysis": {
+                "robustness": {"trials": 5, "noise_levels": [0.0, 50.0], "downsample_factors": [1, 2]},
+                "forecast": {"backtest_origins": 50, "alert_threshold": threshold},
+            },
+        }
+        path = tmp_path / f"{name}.yaml"
+        path.write_text(yaml.safe_dump(config))
+        paths.append(str(path))
+
+    index = run_batch(paths, workers=1, metrics_only=True)
+    assert index["n_ok"] == 2 and index["n_input_groups"] == 1
+    for entry in index["runs"]:
+        assert entry["status"] == "ok"
+        assert all(os.path.exists(path) for path in entry["outputs"].values())
+        assert {"metrics", "summary_text"} <= set(entry["outputs"])
+    assert len(calls) == 1
@@ -1,6 +1,6 @@
 import pandas as pd
 
-from ion_lab_tools.analysis.bo import compare_methods
+from ion_lab_tools.analysis.bo import compare_methods, compare_methods_sweep
 
 
 def test_compare_methods():
@@ -14,3 +14,25 @@ def test_compare_methods():
     result = compare_methods(data, target=0.8)
     assert result.step_reduction >= 0
     assert result.terminal_gain >= 0
+
+
+def test_compare_methods_sweep_over_runs():
+    data = pd.DataFrame(
+        {
+            "method": ["bo"] * 6 + ["random"] * 6,
+            "run": [0, 0, 0, 1, 1, 1] * 2,
+            "step": [1, 2, 3] * 4,
+            "score": [0.5, 0.9, 0.8, 0.6, 0.7, 0.95, 0.3, 0.5, 0.9, 0.4, 0.45, 0.6],
+        }
+    )
+    sweep = compare_methods_sweep(data.sample(frac=1.0, random_state=0), targets=[0.5, 0.9], reference_target=0.5, n_boot=200)
+    assert sweep.targets.tolist() == [0.5, 0.9]
+    # BO runs reach 0.5 at steps 1/1 and 0.9 at 2/3; random reaches 0.5 at 2/3 and 0.9 at 3/never
+    assert sweep.bo_steps[:2].tolist() == [1.0, 2.5]
+    assert sweep.baseline_steps[:2].tolist() == [2.5, float("inf")]
+    assert sweep.step_reduction[:2].tolist() == [60.0, 0.0]
+    assert abs(sweep.terminal_gain - ((0.9 + 0.95) / 2 - (0.9 + 0.6) / 2)) < 1e-12
+    assert sweep.step_reduction_samples.shape == (200,)
+    assert sweep.as_dict()["bo_step_reduction_pct"] == 60.0
+    baseline = compare_methods(data[data["run"] == 0], target=0.5)
+    assert baseline.step_reduction == 50.0
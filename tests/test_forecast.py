@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 
-from ion_lab_tools.analysis.forecast import ar1_forecast
+from ion_lab_tools.analysis.forecast import RecursiveAR1Forecaster, ar1_forecast, arp_forecast, autocovariance, fit_ar, levinson_durbin, rolling_origin_backtest
 
 
 def test_ar1_forecast_shapes():
@@ -12,3 +12,70 @@ def test_ar1_forecast_shapes():
     assert result.forecast.shape == (12,)
     assert result.mae >= 0
     assert result.mape >= 0
+
+
+def test_recursive_ar1_matches_batch_fit():
+    rng = np.random.default_rng(1)
+    y = np.empty(400)
+    y[0] = 0.0
+    for i in range(1, y.size):
+        y[i] = 2.0 + 0.8 * y[i - 1] + rng.normal()
+    model = RecursiveAR1Forecaster(sample_period=1.0).fit(y[:50]).update_many(y[50:])
+    batch = ar1_forecast(pd.Series(y), sample_period=1.0, steps_ahead=20, alert_threshold=9.5)
+    live = model.forecast(steps_ahead=20, alert_threshold=9.5)
+    assert np.allclose(live.forecast, batch.forecast)
+    assert live.lead_time_seconds == batch.lead_time_seconds or (
+        np.isnan(live.lead_time_seconds) and np.isnan(batch.lead_time_seconds)
+    )
+    crossing = np.flatnonzero(np.abs(batch.forecast) >= 9.5)
+    expected = crossing[0] + 1.0 if crossing.size else np.nan
+    assert np.array_equal(batch.lead_time_seconds, expected, equal_nan=True)
+
+
+def test_rolling_origin_backtest_matches_refits():
+    rng = np.random.default_rng(2)
+    y = np.cumsum(rng.normal(size=120)) + 20.0
+    result = rolling_origin_backtest(pd.Series(y), sample_period=2.0, steps_ahead=4, window=30)
+    errors = [
+        np.abs(y[t:t + 4] - ar1_forecast(pd.Series(y[max(0, t - 30):t]), 2.0, 4, 0).forecast)
+        for t in range(10, y.size - 3)
+    ]
+    assert result.n_origins == len(errors)
+    assert np.allclose(result.mae, np.mean(errors, axis=0))
+    assert np.allclose(result.horizon_seconds, [2.0, 4.0, 6.0, 8.0])
+
+
+def test_fit_ar_recovers_oscillatory_process():
+    rng = np.random.default_rng(3)
+    y = np.zeros(5000)
+    noise = rng.normal(size=y.size)
+    for t in range(2, y.size):
+        y[t] = 1.6 * y[t - 1] - 0.8 * y[t - 2] + noise[t]
+    model = fit_ar(pd.Series(y + 5.0), max_order=30, criterion="bic")
+    assert model.order == 2
+    assert np.allclose(model.coeffs, [1.6, -0.8], atol=0.05)
+    result = arp_forecast(pd.Series(y), 1.0, steps_ahead=15, alert_threshold=1e6, max_order=30)
+    assert result.forecast.shape == (15,)
+    assert result.label == f"AR({result.order})" and result.order >= 2
+    assert np.isnan(result.lead_time_seconds)
+
+
+def test_arp_backtest_matches_per_origin_refits():
+    rng = np.random.default_rng(4)
+    y = np.zeros(300)
+    for t in range(2, y.size):
+        y[t] = 1.2 * y[t - 1] - 0.5 * y[t - 2] + rng.normal()
+    y += 20.0
+    model = fit_ar(pd.Series(y), max_order=8, criterion=None)
+    assert model.criterion is None and model.order == 8
+    assert np.allclose(model.coeffs, levinson_durbin(autocovariance(y, 8), 8)[0])
+
+    for window, criterion, label in [(None, None, "AR(8)"), (60, "aic", "AR(p<=8, AIC)")]:
+        result = rolling_origin_backtest(pd.Series(y), 1.0, steps_ahead=5, window=window, max_order=8, criterion=criterion)
+        # Every origin's model comes from the samples before it only
+        errors = [
+            np.abs(y[t:t + 5] - arp_forecast(pd.Series(y[max(0, t - (window or t)):t]), 1.0, 5, 0, max_order=8, criterion=criterion).forecast)
+            for t in range(10, y.size - 4)
+        ]
+        assert result.label == label and result.n_origins == len(errors)
+        assert np.allclose(result.mae, np.mean(errors, axis=0))
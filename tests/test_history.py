@@ -0,0 +1,66 @@
+import sqlite3
+
+import numpy as np
+
+from ion_lab_tools import history as history_module
+from ion_lab_tools.history import MetricsHistory
+
+DAY = 86400.0
+
+
+def test_history_compares_with_previous_run_and_window_median(tmp_path):
+    now = 100 * DAY
+    with MetricsHistory(str(tmp_path / "history.sqlite")) as history:
+        history.record({"fidelity": 0.5, "note": "ignored"}, trap="a", run_at=now - 40 * DAY)
+        for k, value in enumerate([0.90, 0.94, 0.92]):
+            history.record({"fidelity": value}, trap="a", run_at=now - (3 - k) * DAY)
+        history.record({"fidelity": 0.1}, trap="b", run_at=now - 0.5 * DAY)
+
+        (delta,) = history.compare({"fidelity": 0.95, "note": "x"}, trap="a", window_days=30, now=now)
+        assert delta.previous == 0.92 and delta.n_window == 3
+        assert np.isclose(delta.median, 0.92) and np.isclose(delta.delta_previous, 0.03)
+
+        times, values = history.series("fidelity", trap="a", since=now - 30 * DAY)
+        assert np.allclose(values, [0.90, 0.94, 0.92]) and np.all(np.diff(times) > 0)
+        assert np.isnan(history.compare({"new": 1.0}, trap="a", now=now)[0].previous)
+
+
+def test_history_rollups_scale_and_migrate_from_schema_1(tmp_path, monkeypatch):
+    path = str(tmp_path / "v1.sqlite")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY, run_at REAL NOT NULL, trap TEXT NOT NULL, config_hash TEXT);"
+        "CREATE TABLE metrics (run_id INTEGER NOT NULL, name TEXT NOT NULL, value REAL, PRIMARY KEY (run_id, name)) WITHOUT ROWID;"
+        "PRAGMA user_version = 1;"
+    )
+    rng = np.random.default_rng(0)
+    times = 1.7e9 + 60.0 * rng.permutation(40 * 1440)  # 40 days of per-minute runs, recorded out of order
+    values = rng.normal(size=(times.size, 3))
+    with conn:
+        conn.executemany("INSERT INTO runs (id, run_at, trap) VALUES (?, ?, 'a')", enumerate(times.tolist()))
+        conn.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?)",
+            [(i, f"m{j}", values[i, j]) for i in range(times.size) for j in range(3)],
+        )
+    conn.close()
+
+    now = times.max() + 1.0
+    blobs_read = []
+    samples = history_module._samples
+
+    def counting_samples(blobs):
+        blobs = list(blobs)
+        blobs_read.append(len(blobs))
+        return samples(blobs)
+
+    with MetricsHistory(path) as history:
+        monkeypatch.setattr(history_module, "_samples", counting_samples)
+        deltas = history.compare({"m0": 0.0, "m1": 0.0, "m2": 0.0}, trap="a", window_days=30, now=now)
+        # A 30-day window reads at most 31 daily rollup rows per metric, however many runs there are
+        assert len(blobs_read) == 3 and max(blobs_read) <= 31
+        monkeypatch.undo()
+        in_window = (times >= now - 30 * DAY) & (times < now)
+        for j, delta in enumerate(deltas):
+            assert delta.n_window == in_window.sum() and np.isclose(delta.median, np.median(values[in_window, j]))
+        series_times, series_values = history.series("m1", trap="a", since=now - DAY)
+        assert np.all(np.diff(series_times) > 0) and series_values.size == ((times >= now - DAY)).sum()
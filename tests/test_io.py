@@ -0,0 +1,84 @@
+import errno
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ion_lab_tools.processing.io import LogTail, cache_dir_for, load_csv, open_log
+
+
+def _write_log(path, n=50, offset=0.0):
+    ts = pd.date_range("2025-01-01", periods=n, freq="s")[::-1]
+    pd.DataFrame(
+        {
+            "timestamp": ts.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rb_fidelity": np.linspace(0.9, 1.0, n),
+            "rabi_freq": np.full(n, 1e5),
+            "lock_error": np.arange(n, dtype=float) + offset,
+            "temperature": np.full(n, 22.0),
+        }
+    ).to_csv(path, index=False)
+
+
+def test_load_csv_cache_roundtrip(tmp_path):
+    path = str(tmp_path / "log.csv")
+    _write_log(path)
+    fresh = load_csv(path, cache=False)
+    first = load_csv(path)
+    assert os.path.isdir(cache_dir_for(path))
+    cached = load_csv(path)
+    pd.testing.assert_frame_equal(fresh, first)
+    pd.testing.assert_frame_equal(fresh, cached)
+    assert cached["timestamp"].is_monotonic_increasing
+
+    _write_log(path, offset=1000.0)
+    os.utime(path, ns=(0, 0))
+    assert load_csv(path)["lock_error"].min() == 1000.0
+
+
+def test_open_log_selects_columns_with_compact_dtypes(tmp_path):
+    path = str(tmp_path / "log.csv")
+    _write_log(path)
+    log = open_log(path, columns=["timestamp", "lock_error", "rb_fidelity"])
+    assert log.columns == ["timestamp", "lock_error", "rb_fidelity"]
+    assert isinstance(log["lock_error"], np.memmap)
+    assert log["rb_fidelity"].dtype == np.float32
+    assert log["timestamp"].dtype == np.int64
+    assert np.all(np.diff(log["timestamp"]) > 0)
+    frame = load_csv(path)
+    np.testing.assert_allclose(log["lock_error"], frame["lock_error"])
+    assert "temperature" not in log
+
+
+def test_open_log_converts_in_memory_when_cache_is_not_writable(tmp_path, monkeypatch):
+    path = str(tmp_path / "log.csv")
+    _write_log(path)
+    frame = load_csv(path)
+
+    def read_only(*args, **kwargs):
+        raise OSError(errno.EROFS, "Read-only file system")
+
+    monkeypatch.setattr(tempfile, "mkstemp", read_only)
+    log = open_log(path, columns=["rb_fidelity"])
+    assert log["rb_fidelity"].dtype == np.float32 and not isinstance(log["rb_fidelity"], np.memmap)
+    np.testing.assert_allclose(log["rb_fidelity"], frame["rb_fidelity"], rtol=1e-6)
+
+
+def test_log_tail_reads_only_complete_appended_lines(tmp_path):
+    path = tmp_path / "log.csv"
+    _write_log(path, n=5)
+    text = path.read_text()
+    tail = LogTail(str(path))
+    assert len(tail.read()) == 5 and len(tail.read()) == 0
+
+    with open(path, "a") as fh:
+        fh.write("2025-01-01T00:00:05,0.9,100000,7.5,22\n2025-01-01T00:00:06,0.9,1")
+    new = tail.read()
+    assert new["lock_error"].tolist() == [7.5] and new["timestamp"].iloc[0] == pd.Timestamp("2025-01-01T00:00:05")
+    with open(path, "a") as fh:
+        fh.write("00000,8.5,22\n")
+    assert tail.read()["lock_error"].tolist() == [8.5] and tail.rows == 7
+
+    path.write_text(text.split("\n", 1)[0] + "\n")
+    assert len(tail.read()) == 0 and tail.restarted
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from ion_lab_tools.analysis.allan import allan_deviation
+from ion_lab_tools.live import LiveMonitor
+from ion_lab_tools.processing.metrics import compute_psd
+
+
+def test_live_monitor_chunks_match_batch_metrics():
+    rng = np.random.default_rng(0)
+    n = 2000
+    lock = np.zeros(n)
+    for i in range(1, n):
+        lock[i] = 0.9 * lock[i - 1] + rng.normal(scale=10)
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2025-01-01", periods=n, freq="2s"),
+            "rb_fidelity": 0.97 + 0.005 * rng.normal(size=n),
+            "rabi_freq": np.full(n, 1e5),
+            "lock_error": lock,
+            "temperature": np.full(n, 22.0),
+        }
+    )
+    monitor = LiveMonitor(segment_length=128, alert_threshold=1e6)
+    for chunk in np.array_split(np.arange(n), [1, 2, 500, 1999]):
+        monitor.update(df.iloc[chunk])
+    metrics = monitor.metrics()
+
+    _, psd = compute_psd(lock, 0.5, segment_length=128)
+    taus, adevs = allan_deviation(lock, 2.0, [1])
+    assert metrics["n_samples"] == n and monitor.sample_period == 2.0
+    assert np.isclose(metrics["psd_noise_floor"], np.median(psd[-10:]))
+    assert np.isclose(metrics["allan_deviation"], adevs[0]) and metrics["allan_tau_seconds"] == taus[0]
+    assert np.isclose(metrics["lock_error_std"], lock.std(ddof=1))
+    assert np.isnan(metrics["forecast_lead_seconds"]) and not monitor.flags()
+
+    monitor.update(df.iloc[-1:].assign(lock_error=5e6))
+    assert monitor.lead_time_seconds > 0 and monitor.flags()[-1].startswith("Forecast crosses")
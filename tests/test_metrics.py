@@ -1,7 +1,65 @@
-from ion_lab_tools.processing.metrics import compute_psd
+from ion_lab_tools.processing.metrics import QualityMonitor, RunningStats, WelchPSD, basic_stats, compute_psd, evaluate_quality_rules
 import numpy as np
+import pandas as pd
 
 def test_psd_nonnegative():
     x = np.random.randn(1024)
     f, p = compute_psd(x, fs_hz=1000.0)
     assert (p >= 0).all()
+
+def test_welch_psd_streaming_matches_one_shot():
+    rng = np.random.default_rng(0)
+    x = rng.normal(scale=2.0, size=20000)
+    f, p = compute_psd(x, fs_hz=10.0, segment_length=256, overlap=0.5)
+    assert f.size == 129
+    assert np.isclose(np.median(p[1:]), 4.0 / 10.0, rtol=0.1)
+    acc = WelchPSD(10.0, 256, 0.5)
+    for chunk in np.array_split(x, 37):
+        acc.update(chunk)
+    f2, p2 = acc.result()
+    assert np.allclose(f, f2) and np.allclose(p, p2)
+
+def test_quality_rules_localise_alerts_across_blocks():
+    x = np.zeros(2000)
+    x[500:600] = 300.0
+    df = pd.DataFrame({"timestamp": pd.date_range("2024-01-01", periods=x.size, freq="s"), "lock_error": -x})
+    rules = [
+        {"name": "lock", "column": "lock_error", "transform": "abs", "op": ">", "threshold": 200, "window": 50, "fraction": 0.5},
+        {"name": "whole", "column": "lock_error", "op": "<", "threshold": -200, "fraction": 0.2},
+    ]
+    for block_size in (1 << 20, 64):
+        alerts = evaluate_quality_rules(df, rules, block_size=block_size)
+        assert [(a.rule, a.start_index, a.end_index) for a in alerts] == [("lock", 476, 623)]
+        assert alerts[0].peak_fraction == 1.0
+
+def test_streaming_quality_and_stats_match_batch():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=3000).cumsum() * 0.3
+    df = pd.DataFrame({"timestamp": pd.date_range("2024-01-01", periods=x.size, freq="s"), "lock_error": x})
+    rules = [
+        {"name": "abs", "column": "lock_error", "transform": "abs", "op": ">", "threshold": 5, "window": 100, "fraction": 0.3},
+        {"name": "step", "column": "lock_error", "transform": "abs_diff", "op": ">=", "threshold": 0.6, "window": 20, "fraction": 0.2},
+        {"name": "whole", "column": "lock_error", "op": "<", "threshold": -3, "fraction": 0.1},
+    ]
+    monitor, stats = QualityMonitor(rules), RunningStats()
+    for lo, hi in zip([0, 1, 40, 41, 700, 2999], [1, 40, 41, 700, 2999, 3000]):
+        monitor.update(df.iloc[lo:hi])
+        stats.update(x[lo:hi])
+        expected = evaluate_quality_rules(df.iloc[:hi], rules)
+        assert [a.as_dict() for a in monitor.alerts()] == [a.as_dict() for a in expected]
+    assert np.allclose(list(stats.as_dict().values()), list(basic_stats(df["lock_error"]).values()))
+
+
+def test_each_rule_alerts_over_its_own_window_and_long_windows_cover_the_log():
+    x = np.zeros(1000)
+    x[:300] = 5.0
+    df = pd.DataFrame({"timestamp": pd.date_range("2024-01-01", periods=x.size, freq="s"), "lock_error": x})
+    rules = [
+        {"name": "whole", "column": "lock_error", "op": ">", "threshold": 1, "fraction": 0.25},
+        {"name": "long", "column": "lock_error", "op": ">", "threshold": 1, "window": 5000, "fraction": 0.25},
+        {"name": "short", "column": "lock_error", "op": ">", "threshold": 1, "window": 10, "fraction": 0.5},
+    ]
+    alerts = evaluate_quality_rules(df, rules, block_size=64)
+    # The 5000-sample window is longer than the log, so it alerts like the whole-log rule
+    assert [(a.rule, a.start_index, a.end_index) for a in alerts] == [("long", 0, 999), ("short", 0, 303), ("whole", 0, 999)]
+    assert alerts[0].peak_fraction == 0.3
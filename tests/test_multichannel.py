@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from ion_lab_tools.analysis.allan import stability_deviations
+from ion_lab_tools.analysis.forecast import ar1_forecast
+from ion_lab_tools.analysis.multichannel import analyze_channels
+from ion_lab_tools.processing.metrics import compute_psd
+
+
+def test_analyze_channels_matches_single_channel_pipeline():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"a": rng.normal(size=600), "b": 1e5 + np.cumsum(rng.normal(size=600))})
+    result = analyze_channels(df, ["a", "b"], sample_period=0.5, segment_length=128, steps_ahead=20)
+    for i, ch in enumerate(["a", "b"]):
+        _, psd = compute_psd(df[ch].to_numpy(), 2.0, segment_length=128)
+        assert np.allclose(result.psd[i], psd)
+        assert np.allclose(result.stability.adev[i], stability_deviations(df[ch].to_numpy(), 0.5).adev)
+        single = ar1_forecast(df[ch], 0.5, 20, 1e9)
+        assert np.allclose(result.forecast[i], single.forecast)
+        assert np.isclose(result.forecast_mae[i], single.mae)
+    assert "b_psd_noise_floor" in result.as_dict()
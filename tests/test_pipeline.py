@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from ion_lab_tools.pipeline import Pipeline, Stage, select_config
+
+
+def _stages(calls):
+    def record(name, value):
+        def func(config, **deps):
+            calls.append(name)
+            return value(config, deps)
+        return func
+
+    return [
+        Stage("raw", record("raw", lambda c, d: c["inputs"]["n"]), config_keys=("inputs.n",), cache=False),
+        Stage("double", record("double", lambda c, d: 2 * d["raw"]), deps=("raw",)),
+        Stage("scaled", record("scaled", lambda c, d: d["raw"] * c["analysis"]["scale"]), deps=("raw",), config_keys=("analysis.scale",)),
+        Stage("total", record("total", lambda c, d: d["double"] + d["scaled"]), deps=("double", "scaled")),
+    ]
+
+
+def test_pipeline_recomputes_only_invalidated_stages(tmp_path):
+    config = {"inputs": {"n": 3}, "analysis": {"scale": 10, "unused": 1}}
+    calls = []
+    first = Pipeline(_stages(calls), config, cache_dir=str(tmp_path)).run(["total"])
+    assert first == {"total": 36} and sorted(calls) == ["double", "raw", "scaled", "total"]
+
+    calls.clear()
+    config["analysis"]["unused"] = 2
+    assert Pipeline(_stages(calls), config, cache_dir=str(tmp_path), max_workers=1).run(["total"]) == {"total": 36}
+    assert calls == []
+
+    config["analysis"]["scale"] = 100
+    assert Pipeline(_stages(calls), config, cache_dir=str(tmp_path)).run(["total"]) == {"total": 306}
+    assert sorted(calls) == ["raw", "scaled", "total"]
+
+
+def test_pipeline_rejects_cycles_and_prunes_config():
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", lambda c, b: b, deps=("b",)), Stage("b", lambda c, a: a, deps=("a",))], {})
+    assert select_config({"a": {"b": 1, "c": 2}, "d": 3}, ["a.b", "x.y"]) == {"a": {"b": 1}}
+
+
+def test_configs_sharing_a_cache_dir_keep_each_others_results(tmp_path):
+    calls = []
+    for n in (3, 4, 3, 4):
+        Pipeline(_stages(calls), {"inputs": {"n": n}, "analysis": {"scale": 1}}, cache_dir=str(tmp_path)).run(["total"])
+    assert calls.count("total") == 2
+
+    stale = sorted(tmp_path.glob("total-*.pkl"))[0]
+    os.utime(stale, (0, 0))
+    Pipeline(_stages(calls), {"inputs": {"n": 5}, "analysis": {"scale": 1}}, cache_dir=str(tmp_path)).run(["total"])
+    assert not stale.exists() and len(list(tmp_path.glob("total-*.pkl"))) == 2
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from ion_lab_tools.analysis.rb import bootstrap_rb_ci, fit_rb_batch, fit_rb_decay
+
+
+def test_fit_rb_batch_matches_single_fits():
+    rng = np.random.default_rng(0)
+    lengths = np.array([0, 2, 4, 8, 16, 32, 64, 128, 256, 512], dtype=float)
+    frames = []
+    for qubit, p in enumerate([0.97, 0.99, 0.995]):
+        fid = 0.45 * p**lengths + 0.52 + rng.normal(scale=0.002, size=lengths.size)
+        frames.append(pd.DataFrame({"qubit": qubit, "sequence_length": lengths, "fidelity": fid}))
+    frames.append(pd.DataFrame({"qubit": 9, "sequence_length": [1.0, 2.0], "fidelity": [0.9, 0.8]}))
+    data = pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=1)
+
+    table = fit_rb_batch(data, "qubit")
+    assert list(table["qubit"]) == [0, 1, 2, 9]
+    for qubit in range(3):
+        _, _, ref = fit_rb_decay(data[data["qubit"] == qubit])
+        row = table.iloc[qubit]
+        assert np.isclose(row["rb_p"], ref.p, atol=1e-6)
+        assert np.isclose(row["rb_ci_half_width"], ref.ci_half_width, rtol=1e-3)
+    assert table.iloc[3]["rb_fit"] is None and table.iloc[3]["error"]
+
+
+def test_bootstrap_rb_ci_brackets_fit():
+    rng = np.random.default_rng(4)
+    lengths = np.array([0, 2, 4, 8, 16, 32, 64, 128, 256], dtype=float)
+    data = pd.DataFrame({"sequence_length": lengths, "fidelity": 0.45 * 0.98**lengths + 0.52 + rng.normal(scale=0.003, size=lengths.size)})
+    _, _, fit = fit_rb_decay(data)
+    result = bootstrap_rb_ci(data, n_boot=500, seed=1)
+    assert result.p_samples.shape == (500,)
+    assert result.p_ci[0] < fit.p < result.p_ci[1]
+    assert np.isclose(result.gate_error, 0.5 * (1 - fit.p))
+    assert result.gate_error_ci[0] < result.gate_error < result.gate_error_ci[1]
+
+
+def test_fit_rb_batch_skips_rows_without_group_key():
+    lengths = np.array([0, 2, 4, 8, 16, 32, 64, 128], dtype=float)
+    data = pd.concat(
+        [pd.DataFrame({"qubit": q, "sequence_length": lengths, "fidelity": 0.45 * 0.98**lengths + 0.52}) for q in ["a", "b", None]],
+        ignore_index=True,
+    )
+    for method in ("vectorized", "process"):
+        table = fit_rb_batch(data, "qubit", method=method)
+        assert list(table["qubit"]) == ["a", "b"] and list(table["n_points"]) == [8, 8]
+        assert np.allclose(table["rb_p"], 0.98) and (table["error"] == "").all()
+        empty = fit_rb_batch(data[data["qubit"].isna()], "qubit", method=method)
+        assert empty.empty and list(empty.columns) == list(table.columns)
@@ -0,0 +1,98 @@
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ion_lab_tools.reporting.make_plots import allan_plot, minmax_indices, psd_plot
+from ion_lab_tools.reporting import report as reporting_report
+from ion_lab_tools.reporting.report import render_report
+
+
+def test_render_report_png_only_in_process_pool(tmp_path):
+    freqs = np.linspace(0.0, 0.5, 65)
+    jobs = {
+        "psd": (psd_plot, (freqs, 1.0 + freqs), {"path": str(tmp_path / "psd.png")}),
+        "allan": (allan_plot, (np.array([1.0, 2.0, 4.0]), np.array([3.0, 2.0, 1.5])), {"path": str(tmp_path / "allan.png")}),
+    }
+    render_report(jobs, workers=2)
+    assert os.path.getsize(tmp_path / "psd.png") > 0
+    assert os.path.getsize(tmp_path / "allan.png") > 0
+
+
+def test_minmax_indices_keeps_extremes_within_budget():
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=100_003))
+    y[31_337] = 1e6
+    idx = minmax_indices(y, max_points=500)
+    assert idx.size <= 502 and idx[0] == 0 and idx[-1] == y.size - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 31_337 in idx and y[idx].min() == y.min()
+    assert np.array_equal(minmax_indices(y[:100], max_points=500), np.arange(100))
+
+
+def test_render_report_writes_vector_pages_without_pngs(tmp_path):
+    freqs = np.linspace(0.0, 0.5, 65)
+    jobs = {
+        "psd": (psd_plot, (freqs, 1.0 + freqs), {"path": None}),
+        "allan": (allan_plot, (np.array([1.0, 2.0]), np.array([2.0, 1.0])), {"path": str(tmp_path / "allan.png")}),
+    }
+    render_report(jobs, ["psd"], str(tmp_path / "report.pdf"))
+    data = (tmp_path / "report.pdf").read_bytes()
+    assert data.count(b"/Type /Page\n") + data.count(b"/Type /Page ") == 1
+    assert b"/Subtype /Image" not in data
+    assert sorted(os.listdir(tmp_path)) == ["allan.png", "report.pdf"]
+
+
+def test_render_report_draws_pages_in_process_pool(tmp_path, monkeypatch):
+    submitted = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args[3])
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(reporting_report, "ProcessPoolExecutor", RecordingPool)
+    freqs = np.linspace(0.0, 0.5, 65)
+    jobs = {
+        "psd": (psd_plot, (freqs, 1.0 + freqs), {"path": str(tmp_path / "psd.png")}),
+        "allan": (allan_plot, (np.array([1.0, 2.0]), np.array([2.0, 1.0])), {"path": None}),
+    }
+    pages = tmp_path / "pages"
+    render_report(jobs, ["allan", "psd"], str(tmp_path / "report.pdf"), workers=2, page_dir=str(pages))
+    assert sorted(submitted) == [str(pages / "allan.pdf"), str(pages / "psd.pdf")]
+    assert os.path.getsize(tmp_path / "psd.png") > 0
+
+    # The joined file is a valid two-page PDF: every xref offset starts its object
+    data = (tmp_path / "report.pdf").read_bytes()
+    start = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    rows = data[start:].split(b"\n")
+    count = int(rows[1].split()[1])
+    assert all(data[int(row[:10]):].startswith(b"%d 0 obj" % num) for num, row in enumerate(rows[3:2 + count], start=1))
+    assert b"/Kids [ " in data and b"/Count 2 >>" in data
+
+    # Pages that are not jobs are reused from page_dir rather than redrawn
+    submitted.clear()
+    render_report({}, ["psd", "allan"], str(tmp_path / "again.pdf"), workers=2, page_dir=str(pages))
+    assert submitted == [] and b"/Count 2 >>" in (tmp_path / "again.pdf").read_bytes()
+
+
+def test_metrics_only_report_never_imports_plotting(tmp_path):
+    data = os.path.join(os.path.dirname(__file__), "..", "data", "sample")
+    config = {
+        "output_dir": str(tmp_path / "out"),
+        "inputs": {name: os.path.join(data, f"sample_{name}.csv") for name in ("log", "rb", "bo")},
+        "analysis": {"robustness": {"trials": 5, "noise_levels": [0.0, 50.0], "downsample_factors": [1, 2]}, "forecast": {"backtest_origins": 50}},
+    }
+    script = (
+        "import json, sys\n"
+        "from ion_lab_tools.report import generate_from_config\n"
+        "assert not {'matplotlib', 'scipy', 'yaml'} & set(sys.modules)\n"
+        f"paths = generate_from_config(json.loads({json.dumps(json.dumps(config))}), metrics_only=True)\n"
+        "assert 'matplotlib' not in sys.modules and 'pdf' not in paths\n"
+    )
+    root = os.path.join(os.path.dirname(__file__), "..")
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=root, env={**os.environ, "PYTHONPATH": root})
+    assert sorted(os.listdir(tmp_path / "out")) == [".stage_cache", "metrics.json", "summary.txt"]
@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 
 from ion_lab_tools.analysis.robustness import (
+    decimation_robustness,
     evaluate_downsample_robustness,
     evaluate_noise_robustness,
+    noise_robustness_sweep,
     summarize_robustness,
 )
 
@@ -14,3 +17,33 @@ def test_robustness_summary():
     summary = summarize_robustness(noise_levels, noise_ratio, factors, drifts)
     assert summary.noise_slope >= 0
     assert summary.downsample_slope >= 0
+
+
+def test_noise_robustness_sweep_draws_independent_trials():
+    rng = np.random.default_rng(0)
+    series = pd.Series(np.cumsum(rng.normal(size=300)))
+    full = noise_robustness_sweep(series, [0.0, 1.0, 5.0], n_trials=40, steps_ahead=10)
+    chunked = noise_robustness_sweep(series, [0.0, 1.0, 5.0], n_trials=40, steps_ahead=10, max_elements=2000)
+    assert full.std_ratio.shape == (3, 40)
+    assert np.allclose(full.std_ratio[0], 1.0, atol=1e-6)
+    assert np.ptp(full.std_ratio[2]) > 0  # trials are distinct realisations
+    med, lo, hi = full.band("adev")
+    assert np.all(lo <= med) and np.all(med <= hi) and med[2] > med[1] > med[0]
+    assert np.allclose(np.median(chunked.adev, axis=1), med, rtol=0.1)
+    summary = full.as_dict()
+    assert summary["robustness_noise_forecast_mae_lo"] <= summary["robustness_noise_forecast_mae_median"] <= summary["robustness_noise_forecast_mae_hi"]
+    assert summary["robustness_noise_adev_median"] == med[-1]
+
+
+def test_decimation_robustness_matches_per_phase_slices():
+    rng = np.random.default_rng(5)
+    series = pd.Series(rng.normal(size=1003) + 50.0)
+    result = decimation_robustness(series, [1, 3, 7])
+    _, legacy = evaluate_downsample_robustness(series, [1, 3, 7])
+    assert np.allclose(result.mean_drift, legacy)
+    y = series.to_numpy()
+    phases = [y[p::7] for p in range(7)]
+    assert np.isclose(result.mean_drift_max[2], max(abs(p.mean() - y.mean()) for p in phases))
+    assert np.isclose(result.variance_ratio[2], np.mean([p.var(ddof=1) for p in phases]) / y.var(ddof=1))
+    # White noise: point-sampled ADEV is ~sqrt(f) above the averaged full-rate ADEV
+    assert np.isclose(result.adev_ratio[0], 1.0) and 2.0 < result.adev_ratio[2] < 3.3